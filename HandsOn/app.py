@@ -56,6 +56,10 @@ if st.button("Extract Information"):
     try:
         parsed = json.loads(res.text)
         st.json(parsed)
+        if res.headers.get("X-Cache") == "hit":
+            st.caption("Served from cache")
+        elif res.headers.get("X-Repaired") == "true":
+            st.caption("Model output was repaired locally")
     except Exception:
         st.code(res.text)
 
@@ -85,6 +89,8 @@ if st.button("Extract Image Information") and uploaded_file is not None:
     if res.status_code == 200:
         try:
             st.json(res.json())
+            if res.headers.get("X-Cache") in ("hit", "near"):
+                st.caption("Served from cache (same or near-identical image)")
         except Exception:
             st.code(res.text)
     else:
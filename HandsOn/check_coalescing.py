@@ -0,0 +1,98 @@
+"""
+Reproducible check of request coalescing on the sentiment endpoints.
+
+Runs the FastAPI app in process against a local mock of the Groq chat
+completions API (via GROQ_BASE_URL) that answers after a fixed latency,
+fires concurrent identical requests, and counts the upstream calls.
+
+    python check_coalescing.py [--requests 100] [--distinct 5] [--latency 0.2]
+
+Exits non-zero when more upstream calls were made than distinct payloads.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class GroqMock(BaseHTTPRequestHandler):
+    """Answers every chat completion with "Positive" after `latency` seconds."""
+
+    latency = 0.2
+    calls = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.lock:
+            GroqMock.calls += 1
+        time.sleep(self.latency)
+        body = json.dumps({
+            "id": "mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "llama-3.1-8b-instant",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "Positive"},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def load(app, requests: int, distinct: int) -> dict:
+    import httpx
+
+    payloads = [{"feedback": f"The app works, release {i % distinct} is fine."} for i in range(requests)]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://app", timeout=60) as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.post("/sentiment/zero-shot", json=payload) for payload in payloads))
+        seconds = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "distinct_payloads": distinct,
+        "ok_responses": sum(response.status_code == 200 for response in responses),
+        "seconds": round(seconds, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count upstream LLM calls for concurrent identical requests.")
+    parser.add_argument("--requests", type=int, default=100, help="Concurrent requests")
+    parser.add_argument("--distinct", type=int, default=5, help="Distinct payloads among them")
+    parser.add_argument("--latency", type=float, default=0.2, help="Mock completion latency in seconds")
+    args = parser.parse_args()
+
+    GroqMock.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GroqMock)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["GROQ_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ.setdefault("GROQ_API_KEY", "mock")
+    import classifier
+
+    result = asyncio.run(load(classifier.app, args.requests, args.distinct))
+    server.shutdown()
+    result["upstream_calls"] = GroqMock.calls
+    print(json.dumps(result, indent=2))
+    if result["ok_responses"] != args.requests or GroqMock.calls > args.distinct:
+        print("coalescing check failed", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
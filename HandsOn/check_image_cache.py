@@ -0,0 +1,135 @@
+"""
+Reproducible check of the /extract-image-info result cache.
+
+Runs the FastAPI app in process against a local stand-in for the Gemini
+API (via GEMINI_BASE_URL) and uploads synthetic invoices: the same file
+again, re-encoded / re-scaled copies, and invoices from the same template
+with a different customer or total. Every stand-in call returns its own
+id, so a cached answer can be traced to the upload that produced it.
+
+    python check_image_cache.py [--max-distance 12]
+
+Exits non-zero when a check fails.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image, ImageDraw
+
+
+class GeminiStandIn(BaseHTTPRequestHandler):
+    """Answers generateContent with a numbered JSON document and counts the calls."""
+
+    calls = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.lock:
+            GeminiStandIn.calls += 1
+            call = GeminiStandIn.calls
+        body = json.dumps({
+            "candidates": [{
+                "content": {"role": "model", "parts": [{"text": json.dumps({"call": call})}]},
+                "finishReason": "STOP"
+            }]
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def invoice(customer: str, total: str) -> Image.Image:
+    """A plain invoice: fixed template, variable customer and total."""
+    image = Image.new("RGB", (1200, 1600), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((60, 60, 1140, 220), outline="black", width=4)
+    draw.text((90, 100), "ACME SUPPLIES LTD - TAX INVOICE", fill="black", font_size=48)
+    draw.text((90, 300), f"Bill to: {customer}", fill="black", font_size=40)
+    for row in range(8):
+        y = 420 + row * 90
+        draw.line((60, y, 1140, y), fill="gray", width=2)
+        draw.text((90, y + 20), f"Item {row + 1}    qty {row + 2}    unit 12.50", fill="black", font_size=32)
+    draw.text((90, 1250), f"TOTAL DUE: {total}", fill="black", font_size=56)
+    return image
+
+
+def encode(image: Image.Image, format: str, **options) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=format, **options)
+    return buffer.getvalue()
+
+
+async def upload(client, name: str, data: bytes):
+    response = await client.post("/extract-image-info", files={"file": (name, data, "application/octet-stream")})
+    response.raise_for_status()
+    return response.headers["X-Cache"], response.json()["call"]
+
+
+async def scenario(classifier, max_distance: int) -> list:
+    """Upload sequence; returns (upload, expected X-Cache, actual X-Cache, ok) rows."""
+    import httpx
+
+    classifier._image_cache = classifier.ImageResultCache(max_distance=max_distance)
+    near = "near" if max_distance >= 0 else "miss"
+    original = invoice("Jane Smith", "1,234.50")
+    uploads = [
+        ("original.png", encode(original, "PNG"), "miss", "original"),
+        ("same bytes", encode(original, "PNG"), "hit", "original"),
+        ("jpeg q85", encode(original, "JPEG", quality=85), near, "original"),
+        ("90% scale", encode(original.resize((1080, 1440)), "PNG"), near, "original"),
+        ("other customer", encode(invoice("John Smyth", "1,234.50"), "PNG"), "miss", None),
+        ("other total", encode(invoice("Jane Smith", "1,284.50"), "PNG"), "miss", None),
+    ]
+    rows, calls = [], {}
+    transport = httpx.ASGITransport(app=classifier.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://app") as client:
+        for name, data, expected, same_as in uploads:
+            match, call = await upload(client, name, data)
+            # A near hit must carry the result of the document it duplicates, never another one
+            ok = match == expected and (
+                call == calls[same_as] if match in ("hit", "near") else call not in calls.values()
+            )
+            calls.setdefault(name if same_as is None else same_as, call)
+            rows.append({"upload": name, "expected": expected, "x_cache": match, "call": call, "ok": ok})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check exact and near-duplicate image cache hits against a Gemini stand-in.")
+    parser.add_argument("--max-distance", type=int, default=12, help="IMAGE_HASH_MAX_DISTANCE for the near-duplicate run")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GeminiStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["GEMINI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ.setdefault("GEMINI_API_KEY", "stand-in")
+    os.environ.setdefault("GROQ_API_KEY", "stand-in")
+    import classifier
+
+    results = {}
+    for label, max_distance in (("default", classifier.IMAGE_HASH_MAX_DISTANCE), ("near", args.max_distance)):
+        results[label] = asyncio.run(scenario(classifier, max_distance))
+        classifier._vision = None
+    server.shutdown()
+
+    print(json.dumps({"model_calls": GeminiStandIn.calls, **results}, indent=2))
+    if not all(row["ok"] for rows in results.values() for row in rows):
+        print("image cache check failed", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
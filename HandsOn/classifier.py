@@ -1,28 +1,97 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
-from groq import Groq
-
-
-
-client = Groq(api_key="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")
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import io
+import os
+import re
+import threading
+
+from fastapi import FastAPI, File, HTTPException, Response, UploadFile
+from PIL import Image, UnidentifiedImageError
+from pydantic import BaseModel, Field
+from groq import AsyncGroq
+
+from extraction import ContentCache, ExtractedInfo, loads_lenient, repair_json
+from image_cache import ImageResultCache, ImageSignature, image_signature
+from preprocess import shrink_image
+
+
+
+# GROQ_BASE_URL points the service at another endpoint, e.g. a local mock server for load tests.
+# Rate limits (honouring Retry-After), timeouts and 5xx are retried with backoff by the SDK.
+# The SDK refuses to start without GROQ_API_KEY.
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+client = AsyncGroq(
+    api_key=GROQ_API_KEY,
+    base_url=os.getenv("GROQ_BASE_URL"),
+    max_retries=int(os.getenv("LLM_MAX_RETRIES", "2"))
+)
 
 app = FastAPI(title="LLM Hands-on API")
 
+SENTIMENT_LABELS = ("Positive", "Neutral", "Negative")
+
+# Batch classification: items packed per completion, by estimated prompt tokens (~4 chars/token)
+BATCH_MAX_PROMPT_TOKENS = 6000
+BATCH_MAX_ITEMS = 100
+
+# Upstream completions in flight at once, across all requests
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+_llm_slots = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+_in_flight: Dict[tuple, asyncio.Task] = {}
+
+# Local embedding classifier: answers when its label margin reaches this, else the LLM does
+LOCAL_SENTIMENT_MARGIN = float(os.getenv("LOCAL_SENTIMENT_MARGIN", "0.05"))
+# Optional JSON list of {"text": ..., "label": ...} replacing the built-in example bank
+SENTIMENT_EXAMPLES_PATH = os.getenv("SENTIMENT_EXAMPLES_PATH")
+_local_lock = threading.Lock()
+_local = None
+
+# /extract-info results by text hash; bump the version whenever the extraction prompt changes
+EXTRACTION_PROMPT_VERSION = "1"
+_extraction_cache = ContentCache(max_entries=int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "1024")))
+
+# /extract-image-info: Gemini vision model; GEMINI_BASE_URL points it at a local stand-in, e.g. for tests
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL")
+VISION_MODEL = os.getenv("VISION_MODEL", "models/gemini-2.5-flash-image")
+VISION_MAX_CONCURRENCY = int(os.getenv("VISION_MAX_CONCURRENCY", "8"))
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Results are shared by identical uploads only. Set to 0 or more to also serve near-duplicates
+# (re-compressed, re-scaled copies) whose 256-bit perceptual hashes differ in at most this many
+# bits and whose thumbnails match; see image_cache.py for why this is off by default
+IMAGE_HASH_MAX_DISTANCE = int(os.getenv("IMAGE_HASH_MAX_DISTANCE", "-1"))
+# Crop, downscale and re-encode uploads before the model call (see preprocess.py)
+PREPROCESS_IMAGES = os.getenv("PREPROCESS_IMAGES", "true").lower() == "true"
+IMAGE_PROMPT = "Extract all text and convert invoice to structured JSON with meaningful tags."
+_vision_slots = asyncio.Semaphore(VISION_MAX_CONCURRENCY)
+_vision_lock = threading.Lock()
+_vision = None
+_image_cache = ImageResultCache(
+    max_entries=int(os.getenv("IMAGE_CACHE_MAX_ENTRIES", "512")),
+    max_distance=IMAGE_HASH_MAX_DISTANCE
+)
+
 
 
 
 class FeedbackRequest(BaseModel):
     feedback: str
 
+class BatchFeedbackRequest(BaseModel):
+    feedback: List[str] = Field(..., min_length=1)
+    few_shot: bool = False
+    local_first: bool = False
+
 class InfoExtractionRequest(BaseModel):
     text: str
 
 
 
 
-@app.post("/sentiment/zero-shot")
-def zero_shot_sentiment(req: FeedbackRequest):
-    prompt = f"""
+def _zero_shot_prompt(feedback: str) -> str:
+    return f"""
 You are an expert customer sentiment classification system.
 
 Classify the customer feedback into exactly ONE of the following categories:
@@ -35,25 +104,27 @@ Respond with only ONE word
 Do not explain your reasoning
 
 Customer Feedback:
-"{req.feedback}"
+"{feedback}"
 
 Answer:
 """
 
-    response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0
-    )
 
-    return {"sentiment": response.choices[0].message.content.strip()}
+FEW_SHOT_EXAMPLES = """
+Examples:
+Customer Feedback: "The app is amazing and very easy to use."
+Answer: Positive
 
+Customer Feedback: "The app crashes frequently and is unusable."
+Answer: Negative
 
+Customer Feedback: "The app works as expected, nothing special."
+Answer: Neutral
+"""
 
 
-@app.post("/sentiment/few-shot")
-def few_shot_sentiment(req: FeedbackRequest):
-    prompt = f"""
+def _few_shot_prompt(feedback: str) -> str:
+    return f"""
 You are an expert customer sentiment classification system.
 
 Classify the customer feedback into exactly ONE of the following categories:
@@ -64,36 +135,225 @@ Negative
 
 Respond with only ONE word
 Do not explain your reasoning
+{FEW_SHOT_EXAMPLES}
+Customer Feedback:
+"{feedback}"
 
-Examples:
-Customer Feedback: "The app is amazing and very easy to use."
-Answer: Positive
+Answer:
+"""
 
-Customer Feedback: "The app crashes frequently and is unusable."
-Answer: Negative
 
-Customer Feedback: "The app works as expected, nothing special."
-Answer: Neutral
+async def _coalesce(key: tuple, call: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run call() once per key at a time: identical requests arriving while it
+    is in flight await the same task instead of calling upstream again.
+    """
+    task = _in_flight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(call())
+        _in_flight[key] = task
+        task.add_done_callback(lambda _: _in_flight.pop(key, None))
+    # A cancelled waiter must not cancel the call the others are waiting on
+    return await asyncio.shield(task)
 
-Customer Feedback:
-"{req.feedback}"
 
-Answer:
-"""
+async def _complete(prompt: str, max_tokens: int = None) -> str:
+    async def call() -> str:
+        async with _llm_slots:
+            response = await client.chat.completions.create(
+                model="llama-3.1-8b-instant",
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0,
+                max_tokens=max_tokens
+            )
+        return (response.choices[0].message.content or "").strip()
+
+    # The prompt is fully determined by the endpoint and its payload
+    return await _coalesce((prompt, max_tokens), call)
 
-    response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0
-    )
 
-    return {"sentiment": response.choices[0].message.content.strip()}
+@app.post("/sentiment/zero-shot")
+async def zero_shot_sentiment(req: FeedbackRequest):
+    return {"sentiment": await _complete(_zero_shot_prompt(req.feedback))}
+
 
 
 
+@app.post("/sentiment/few-shot")
+async def few_shot_sentiment(req: FeedbackRequest):
+    return {"sentiment": await _complete(_few_shot_prompt(req.feedback))}
+
+
+
+
+_BATCH_LINE = re.compile(r"^\s*(\d+)\s*[.):-]\s*(positive|neutral|negative)\s*\.?\s*$", re.IGNORECASE)
+
+
+def _batch_prompt(items: List[str], few_shot: bool) -> str:
+    numbered = "\n".join(f'{i}. "{text}"' for i, text in enumerate(items, 1))
+    return f"""
+You are an expert customer sentiment classification system.
+
+Classify each numbered customer feedback into exactly ONE of the following categories:
+Positive
+Neutral
+Negative
+{FEW_SHOT_EXAMPLES if few_shot else ""}
+Respond with exactly {len(items)} lines, one per feedback, in the format:
+<number>. <category>
+Do not explain your reasoning
+
+Customer Feedback:
+{numbered}
+
+Answer:
+"""
+
+
+def _pack(items: List[str]) -> List[List[int]]:
+    """Group item indexes into batches that fit the prompt token budget."""
+    batches, batch, used = [], [], 0
+    for index, text in enumerate(items):
+        # Item text plus its number, quotes and its output line
+        cost = len(text) // 4 + 8
+        if batch and (used + cost > BATCH_MAX_PROMPT_TOKENS or len(batch) >= BATCH_MAX_ITEMS):
+            batches.append(batch)
+            batch, used = [], 0
+        batch.append(index)
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _parse_batch(output: str, size: int) -> Dict[int, str]:
+    """
+    Strictly parse "<number>. <label>" lines. Numbers outside 1..size, or
+    given more than once, are dropped, so their items are retried alone.
+    """
+    labels: Dict[int, str] = {}
+    repeated = set()
+    for line in output.splitlines():
+        match = _BATCH_LINE.match(line)
+        if not match:
+            continue
+        number = int(match.group(1))
+        if not 1 <= number <= size:
+            continue
+        if number in labels:
+            repeated.add(number)
+        labels[number] = match.group(2).capitalize()
+    return {number - 1: label for number, label in labels.items() if number not in repeated}
+
+
+async def _classify_batch(items: List[str], few_shot: bool) -> Dict[int, str]:
+    """
+    Labels parsed from one batch completion. Upstream errors (after the
+    client's own retries) propagate: answering them with one call per item
+    would multiply the load on an endpoint that is already failing.
+    """
+    # A generous output budget: "<number>. <label>" is a handful of tokens
+    output = await _complete(_batch_prompt(items, few_shot), max_tokens=8 * len(items) + 32)
+    return _parse_batch(output, len(items))
+
+
+async def _classify_single(text: str, few_shot: bool) -> str:
+    answer = await _complete(_few_shot_prompt(text) if few_shot else _zero_shot_prompt(text))
+    label = answer.strip().strip(".").capitalize()
+    return label if label in SENTIMENT_LABELS else answer
+
+
+@app.post("/sentiment/batch")
+async def batch_sentiment(req: BatchFeedbackRequest):
+    """
+    Classify many feedback items with as few completions as possible.
+
+    Items are packed into numbered prompts up to the token budget and the
+    batches run concurrently. Items whose line is missing or malformed in
+    the batch output are classified again with one call each; a failed
+    batch completion fails the request instead. With
+    local_first, items the embedding classifier is confident about never
+    reach the LLM.
+    """
+    # Keep each item on its own numbered line
+    items = [" ".join(text.split()) for text in req.feedback]
+    sentiments: List[str] = [None] * len(items)
+    paths: List[str] = ["llm"] * len(items)
+
+    if req.local_first:
+        predictions = await asyncio.to_thread(_classify_locally, items)
+        for i, prediction in enumerate(predictions):
+            if prediction.margin >= LOCAL_SENTIMENT_MARGIN:
+                sentiments[i] = prediction.label
+                paths[i] = "local"
+
+    pending = [i for i, sentiment in enumerate(sentiments) if sentiment is None]
+    batches = [[pending[i] for i in batch] for batch in _pack([items[i] for i in pending])]
+
+    outputs = await asyncio.gather(
+        *(_classify_batch([items[i] for i in batch], req.few_shot) for batch in batches)
+    )
+    for batch, labels in zip(batches, outputs):
+        for position, label in labels.items():
+            sentiments[batch[position]] = label
+
+    retry = [i for i, sentiment in enumerate(sentiments) if sentiment is None]
+    retried = await asyncio.gather(*(_classify_single(items[i], req.few_shot) for i in retry))
+    for i, sentiment in zip(retry, retried):
+        sentiments[i] = sentiment
+
+    return {
+        "sentiments": sentiments,
+        "paths": paths,
+        "completions": len(batches) + len(retry),
+        "fallbacks": len(retry)
+    }
+
+
+
+
+def _classify_locally(texts: List[str]) -> list:
+    """Embedding classifier predictions; the model is loaded on first use."""
+    global _local
+    with _local_lock:
+        if _local is None:
+            # Imported lazily so the LLM endpoints run without sentence-transformers
+            from local_sentiment import LocalSentimentClassifier
+            if SENTIMENT_EXAMPLES_PATH:
+                _local = LocalSentimentClassifier.from_json(SENTIMENT_EXAMPLES_PATH)
+            else:
+                _local = LocalSentimentClassifier()
+    return _local.classify(texts)
+
+
+@app.post("/sentiment/local")
+async def local_sentiment(req: FeedbackRequest):
+    """
+    Classify with the local embedding classifier, escalating to the few-shot
+    LLM prompt when its margin is below LOCAL_SENTIMENT_MARGIN.
+    """
+    prediction = (await asyncio.to_thread(_classify_locally, [req.feedback]))[0]
+    if prediction.margin >= LOCAL_SENTIMENT_MARGIN:
+        return {"sentiment": prediction.label, "path": "local", "margin": round(prediction.margin, 4)}
+    sentiment = await _classify_single(req.feedback, few_shot=True)
+    return {"sentiment": sentiment, "path": "llm", "margin": round(prediction.margin, 4)}
+
+
+
+
+@app.post("/extract-info", response_model=ExtractedInfo)
+async def extract_info(req: InfoExtractionRequest, response: Response):
+    """
+    Extract the five fields as validated JSON. Malformed model output is
+    repaired locally instead of being re-requested, and results are cached
+    by text hash (X-Cache header: hit or miss; X-Repaired: true or false).
+    """
+    key = ContentCache.key(EXTRACTION_PROMPT_VERSION, req.text)
+    cached = _extraction_cache.get(key)
+    if cached is not None:
+        response.headers["X-Cache"] = "hit"
+        return cached
 
-@app.post("/extract-info")
-def extract_info(req: InfoExtractionRequest):
     prompt = f"""
 Extract information from the text below.
 
@@ -113,15 +373,98 @@ Text:
 JSON:
 """
 
-    response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0
-    )
-
-    return response.choices[0].message.content.strip()
+    info, repaired = repair_json(await _complete(prompt))
+    # An empty result is more likely a bad completion than an empty text; let it be retried
+    if not info.is_empty():
+        _extraction_cache.put(key, info)
+    response.headers["X-Cache"] = "miss"
+    response.headers["X-Repaired"] = str(repaired).lower()
+    return info
+
+
+def _vision_client():
+    """Gemini client, created on first use."""
+    global _vision
+    with _vision_lock:
+        if _vision is None:
+            # Imported lazily so the text endpoints run without google-genai
+            from google import genai
+            from google.genai import types
+            http_options = types.HttpOptions(base_url=GEMINI_BASE_URL) if GEMINI_BASE_URL else None
+            _vision = genai.Client(api_key=GEMINI_API_KEY, http_options=http_options)
+    return _vision
+
+
+def _hash_upload(upload) -> str:
+    """SHA-256 of a spooled upload, read in chunks; uploads over MAX_IMAGE_BYTES are rejected."""
+    digest = hashlib.sha256()
+    size = 0
+    upload.seek(0)
+    while chunk := upload.read(UPLOAD_CHUNK_BYTES):
+        size += len(chunk)
+        if size > MAX_IMAGE_BYTES:
+            raise HTTPException(status_code=413, detail="Image too large")
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _prepare_image(upload) -> Tuple[bytes, str, Optional[ImageSignature]]:
+    """
+    Decode a spooled upload once for everything the request needs: the bytes
+    and MIME type sent to the model (preprocessed when that is smaller) and
+    the near-duplicate signature (None while that tier is off).
+    """
+    size = upload.seek(0, io.SEEK_END)
+    upload.seek(0)
+    with Image.open(upload) as image:
+        signature = image_signature(image) if _image_cache.near_enabled else None
+        mime_type = Image.MIME.get(image.format, "application/octet-stream")
+        if PREPROCESS_IMAGES:
+            data, _ = shrink_image(image)
+            if len(data) < size:
+                return data, "image/jpeg", signature
+    upload.seek(0)
+    return upload.read(), mime_type, signature
+
+
+async def _extract_image(data: bytes, mime_type: str) -> dict:
+    from google.genai import types
+    async with _vision_slots:
+        result = await _vision_client().aio.models.generate_content(
+            model=VISION_MODEL,
+            contents=[IMAGE_PROMPT, types.Part.from_bytes(data=data, mime_type=mime_type)]
+        )
+    text = result.text or ""
+    parsed = loads_lenient(text)
+    return parsed if parsed is not None else {"text": text}
+
+
+@app.post("/extract-image-info")
+async def extract_image_info(response: Response, file: UploadFile = File(...)):
+    """
+    Extract structured JSON from an invoice or receipt image.
+
+    The upload, already spooled by Starlette, is hashed in chunks straight
+    from its temporary file and decoded at most once. Results are cached
+    by content hash, so the same image is answered without a new
+    model call (X-Cache header: hit or miss). With IMAGE_HASH_MAX_DISTANCE
+    set, confirmed near-duplicates are served too (X-Cache: near).
+    """
+    content_hash = await asyncio.to_thread(_hash_upload, file.file)
+    result, match = _image_cache.get(content_hash), "hit"
+    if result is None:
+        try:
+            data, mime_type, signature = await asyncio.to_thread(_prepare_image, file.file)
+        except (UnidentifiedImageError, OSError):
+            raise HTTPException(status_code=400, detail="Not a readable image")
+        result, match = _image_cache.get_similar(signature), "near"
+        if result is None:
+            result, match = await _coalesce(("image", content_hash), lambda: _extract_image(data, mime_type)), "miss"
+        _image_cache.put(content_hash, result, signature)
+    response.headers["X-Cache"] = match
+    return result
 
 
 @app.get("/")
-def health():
+async def health():
     return {"status": "API running"}
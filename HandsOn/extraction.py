@@ -0,0 +1,143 @@
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+import ast
+import hashlib
+import json
+import re
+import threading
+
+from pydantic import BaseModel
+
+
+EXTRACTION_KEYS = ("name", "company", "role", "start_date", "location")
+
+_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)\s*(?:```|$)", re.DOTALL)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_KEY_VALUE = re.compile(
+    r"""["']?(name|company|role|start[ _-]?date|location)["']?\s*:\s*(?:"([^"]*)"|'([^']*)'|(null|None))""",
+    re.IGNORECASE
+)
+_EMPTY = {"", "null", "none", "n/a", "na", "unknown", "not mentioned", "not specified"}
+
+
+class ExtractedInfo(BaseModel):
+    name: Optional[str] = None
+    company: Optional[str] = None
+    role: Optional[str] = None
+    start_date: Optional[str] = None
+    location: Optional[str] = None
+
+    def is_empty(self) -> bool:
+        return all(value is None for value in self.model_dump().values())
+
+
+def _normalize_key(key: str) -> str:
+    key = re.sub(r"[\s-]+", "_", key.strip().lower())
+    return "start_date" if key == "startdate" else key
+
+
+def _normalize_value(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        value = ", ".join(str(item) for item in value if item is not None)
+    value = str(value).strip()
+    return None if value.lower() in _EMPTY else value
+
+
+def _loads(text: str) -> Optional[dict]:
+    """json.loads, then Python-literal syntax (single quotes, None/True/False)."""
+    try:
+        value = json.loads(text)
+    except ValueError:
+        literal = re.sub(r"\bnull\b", "None", re.sub(r"\btrue\b", "True", re.sub(r"\bfalse\b", "False", text)))
+        try:
+            value = ast.literal_eval(literal)
+        except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+            return None
+    return value if isinstance(value, dict) else None
+
+
+def loads_lenient(text: str) -> Optional[dict]:
+    """
+    Parse a JSON object out of model output: tolerates code fences,
+    surrounding prose, trailing commas, a missing closing brace and
+    Python-style quoting. Returns None when no object can be recovered.
+    """
+    text = text.strip()
+    fence = _FENCE.search(text)
+    if fence:
+        text = fence.group(1)
+    start = text.find("{")
+    if start != -1:
+        end = text.rfind("}")
+        text = text[start:end + 1] if end > start else text[start:] + "}"
+    return _loads(_TRAILING_COMMA.sub(r"\1", text))
+
+
+def repair_json(output: str) -> Tuple[ExtractedInfo, bool]:
+    """
+    Turn raw model output into the five-key schema without another completion.
+
+    Strips code fences and surrounding prose, removes trailing commas,
+    accepts Python-style quoting, and as a last resort pulls "key": "value"
+    pairs out with a regex. Unknown keys are dropped and missing ones set
+    to None.
+
+    Returns:
+        The validated fields, and whether any repair was needed.
+    """
+    text = output.strip()
+    data = _loads(text)
+    repaired = data is None
+    if data is None:
+        data = loads_lenient(text)
+
+    if data is None:
+        data = {}
+        for match in _KEY_VALUE.finditer(text):
+            value = next((group for group in match.groups()[1:3] if group is not None), None)
+            data.setdefault(match.group(1), value)
+
+    fields = {}
+    for key, value in data.items():
+        key = _normalize_key(str(key))
+        if key in EXTRACTION_KEYS:
+            fields[key] = _normalize_value(value)
+    if set(fields) != set(EXTRACTION_KEYS) or set(data) != set(fields):
+        repaired = True
+    return ExtractedInfo(**fields), repaired
+
+
+class ContentCache:
+    """Thread-safe LRU cache keyed by a hash of whitespace-normalized text."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(" ".join(part.split()).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+import threading
+
+import numpy as np
+from PIL import Image
+
+
+HASH_SIZE = 16
+THUMBNAIL_SIZE = 128
+
+
+@dataclass
+class ImageSignature:
+    """Near-duplicate fingerprint of a decoded image."""
+    hash_bits: np.ndarray
+    thumbnail: np.ndarray
+
+
+def dhash(image: Image.Image, size: int = HASH_SIZE) -> np.ndarray:
+    """
+    Difference hash of size * size bits, packed: compares each pixel of a
+    (size + 1) x size grayscale thumbnail with its right neighbour.
+    Re-encoding or resizing the same picture flips only a few bits.
+    """
+    thumbnail = image.convert("L").resize((size + 1, size), Image.Resampling.LANCZOS)
+    pixels = np.asarray(thumbnail, dtype=np.int16)
+    return np.packbits((pixels[:, 1:] > pixels[:, :-1]).flatten())
+
+
+def image_signature(image: Image.Image) -> ImageSignature:
+    thumbnail = image.convert("L").resize((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.Resampling.BOX)
+    return ImageSignature(hash_bits=dhash(image), thumbnail=np.asarray(thumbnail, dtype=np.uint8))
+
+
+class ImageResultCache:
+    """
+    LRU cache of extraction results keyed by image content.
+
+    `get` matches the exact content hash only. The near-duplicate tier
+    (`get_similar`) is off unless `max_distance` is 0 or more: perceptual
+    hashes of two invoices printed from the same template are close or even
+    identical although their text differs, so a hash match alone is never
+    trusted. A candidate within `max_distance` bits of the 256-bit hash is
+    returned only if no pixel of the two 128x128 grayscale thumbnails differs
+    by more than `confirm_tolerance`, which re-compressed or re-scaled copies
+    pass and a changed name or amount does not.
+    """
+
+    def __init__(self, max_entries: int = 512, max_distance: int = -1, confirm_tolerance: int = 24):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.confirm_tolerance = confirm_tolerance
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Optional[ImageSignature], Any]]" = OrderedDict()
+
+    @property
+    def near_enabled(self) -> bool:
+        return self.max_distance >= 0
+
+    def get(self, digest: str) -> Optional[Any]:
+        """Result cached for exactly this content hash, or None."""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            self._entries.move_to_end(digest)
+            return entry[1]
+
+    def get_similar(self, signature: ImageSignature) -> Optional[Any]:
+        """Result of a confirmed near-duplicate image, or None (always None while disabled)."""
+        if not self.near_enabled:
+            return None
+        with self._lock:
+            candidates = [(d, entry) for d, entry in self._entries.items() if entry[0] is not None]
+            if not candidates:
+                return None
+            hashes = np.stack([entry[0].hash_bits for _, entry in candidates])
+            distances = np.unpackbits(np.bitwise_xor(hashes, signature.hash_bits), axis=1).sum(axis=1)
+            for position in np.argsort(distances, kind="stable"):
+                if distances[position] > self.max_distance:
+                    break
+                digest, (cached, result) = candidates[position]
+                difference = np.abs(cached.thumbnail.astype(np.int16) - signature.thumbnail.astype(np.int16))
+                if difference.max() <= self.confirm_tolerance:
+                    self._entries.move_to_end(digest)
+                    return result
+            return None
+
+    def put(self, digest: str, result: Any, signature: Optional[ImageSignature] = None):
+        """Cache a result; the signature is only kept while the near tier is enabled."""
+        with self._lock:
+            self._entries[digest] = (signature if self.near_enabled else None, result)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
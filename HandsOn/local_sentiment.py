@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+import json
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+
+LABELS = ("Positive", "Neutral", "Negative")
+
+# Labeled example bank; extend it (or pass a JSON file) with real feedback to cover more of the traffic locally
+EXAMPLES: List[Tuple[str, str]] = [
+    ("The app is amazing and very easy to use.", "Positive"),
+    ("I love the new update, everything is faster.", "Positive"),
+    ("Great customer support, my issue was solved in minutes.", "Positive"),
+    ("Excellent quality, exactly what I was looking for.", "Positive"),
+    ("Very happy with the purchase, would recommend to friends.", "Positive"),
+    ("The delivery was quick and the packaging was perfect.", "Positive"),
+    ("Fantastic experience, the team went above and beyond.", "Positive"),
+    ("Really intuitive interface, it just works.", "Positive"),
+    ("The app works as expected, nothing special.", "Neutral"),
+    ("It is okay, does what it says.", "Neutral"),
+    ("Average product for the price.", "Neutral"),
+    ("The order arrived on the scheduled date.", "Neutral"),
+    ("I have not used it enough to form an opinion yet.", "Neutral"),
+    ("Some features are useful, others I never use.", "Neutral"),
+    ("It is similar to the previous version.", "Neutral"),
+    ("Neither good nor bad, just fine.", "Neutral"),
+    ("The app crashes frequently and is unusable.", "Negative"),
+    ("Terrible support, nobody answered my emails.", "Negative"),
+    ("The product broke after two days.", "Negative"),
+    ("Very disappointed, it is a waste of money.", "Negative"),
+    ("The delivery was late and the box was damaged.", "Negative"),
+    ("Slow, buggy and confusing to use.", "Negative"),
+    ("I was charged twice and still have no refund.", "Negative"),
+    ("Worst experience I have had with any service.", "Negative"),
+]
+
+
+@dataclass
+class Prediction:
+    label: str
+    score: float
+    margin: float
+
+
+class LocalSentimentClassifier:
+    """
+    Sentiment by embedding similarity to a labeled example bank.
+
+    The bank is embedded once with MiniLM. A text is scored per label either
+    by the mean similarity of its `k` nearest examples of that label ("knn")
+    or by its similarity to the label centroid ("centroid"); the margin
+    between the best and second-best label tells how confident the call is.
+    """
+
+    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+                 examples: Optional[Sequence[Tuple[str, str]]] = None,
+                 method: str = "knn", k: int = 3):
+        """
+        Args:
+            model_name (str): Sentence-transformers model used for the bank and the queries.
+            examples: (text, label) pairs; defaults to EXAMPLES.
+            method (str): "knn" or "centroid".
+            k (int): Neighbours per label averaged by the knn method.
+        """
+        if method not in ("knn", "centroid"):
+            raise ValueError(f"Unsupported method: {method}")
+        examples = list(examples or EXAMPLES)
+        self.method = method
+        self.model = SentenceTransformer(model_name)
+
+        texts = [text for text, _ in examples]
+        label_ids = np.array([LABELS.index(label) for _, label in examples])
+        bank = self.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+        # One row per label, padded so every label has the same number of examples
+        self.k = max(1, min(k, min(int((label_ids == i).sum()) for i in range(len(LABELS)))))
+        per_label = max(int((label_ids == i).sum()) for i in range(len(LABELS)))
+        self._bank = np.zeros((len(LABELS), per_label, bank.shape[1]), dtype=np.float32)
+        self._mask = np.zeros((len(LABELS), per_label), dtype=bool)
+        for i in range(len(LABELS)):
+            rows = bank[label_ids == i]
+            self._bank[i, :len(rows)] = rows
+            self._mask[i, :len(rows)] = True
+        centroids = np.stack([bank[label_ids == i].mean(axis=0) for i in range(len(LABELS))])
+        self._centroids = centroids / np.linalg.norm(centroids, axis=1, keepdims=True)
+
+    @classmethod
+    def from_json(cls, path, **kwargs) -> "LocalSentimentClassifier":
+        """Load the example bank from a JSON list of {"text": ..., "label": ...}."""
+        with open(path, encoding="utf-8") as f:
+            examples = [(item["text"], item["label"]) for item in json.load(f)]
+        return cls(examples=examples, **kwargs)
+
+    def classify(self, texts: List[str]) -> List[Prediction]:
+        """Classify all texts with one encode call and one matrix product per label."""
+        if not texts:
+            return []
+        queries = self.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+        if self.method == "centroid":
+            scores = queries @ self._centroids.T
+        else:
+            # (texts, labels, examples) similarities; padding rows can never be neighbours
+            similarities = np.einsum("td,led->tle", queries, self._bank)
+            similarities[:, ~self._mask] = -np.inf
+            nearest = -np.partition(-similarities, self.k - 1, axis=2)[:, :, :self.k]
+            scores = nearest.mean(axis=2)
+
+        order = np.argsort(-scores, axis=1)
+        best = scores[np.arange(len(texts)), order[:, 0]]
+        second = scores[np.arange(len(texts)), order[:, 1]]
+        return [
+            Prediction(LABELS[label], float(score), float(score - runner_up))
+            for label, score, runner_up in zip(order[:, 0], best, second)
+        ]
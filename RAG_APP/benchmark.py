@@ -0,0 +1,258 @@
+"""Offline performance benchmark of the RAG_APP pipeline"""
+
+import argparse
+import hashlib
+import json
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+# Add src directory to Python path
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from config_Module import config
+from document_ingestion_Module.chunker import OffsetChunker
+from document_ingestion_Module.pdfParser import ParallelPDFParser
+from vectorStore_Module.localIndex import LocalVectorStore
+from Retrival_Module.lexicalIndex import BM25Index
+from Retrival_Module.queryCache import QueryCache
+from Retrival_Module.retrieval import Retrieval
+from llm_call.contextPacker import ContextPacker
+from llm_call.llm import LLMMOdel
+
+
+DEFAULT_PDFS = [
+    Path(__file__).resolve().parent / "data" / "Attention.pdf",
+    Path(__file__).resolve().parent.parent / "knowledge Assistant" / "data" / "budget_speech.pdf",
+]
+
+# QUESTIONS and HashingEmbeddings match knowledge Assistant/benchmark.py, so the two apps' results are
+# comparable; change both together.
+QUESTIONS = [
+    "What is multi-head attention?",
+    "How are positional encodings computed?",
+    "Why does self-attention scale better than recurrent layers?",
+    "Which optimizer and learning rate schedule were used for training?",
+    "What BLEU score does the big transformer reach on English-German?",
+    "What is the fiscal deficit target for the next year?",
+    "How much is allocated to capital expenditure?",
+    "What changes were announced to personal income tax slabs?",
+    "Which schemes support agriculture and farmers?",
+    "section 80C deduction",
+]
+
+_TOKEN = re.compile(r"\w+")
+
+
+class HashingEmbeddings:
+    """
+    Deterministic bag-of-words feature hashing; stands in for the
+    sentence-transformers model when benchmarking without it.
+    """
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+
+    def embed_documents(self, texts):
+        return np.stack([self._embed(text) for text in texts]) if texts else np.empty((0, self.dimension), np.float32)
+
+    def embed_query(self, text):
+        return self._embed(text).tolist()
+
+    def _embed(self, text):
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for token in _TOKEN.findall(text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dimension
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+
+class PrecomputedEmbeddings:
+    """Serves already computed chunk vectors so index build time excludes embedding."""
+
+    def __init__(self, model, texts, vectors):
+        self.model = model
+        self.vectors = dict(zip(texts, vectors))
+
+    def embed_documents(self, texts):
+        return np.stack([self.vectors[text] for text in texts])
+
+    def embed_query(self, text):
+        return self.model.embed_query(text)
+
+
+def _percentiles(seconds) -> dict:
+    milliseconds = 1000 * np.asarray(seconds)
+    return {
+        "count": len(milliseconds),
+        "p50_ms": round(float(np.percentile(milliseconds, 50)), 3),
+        "p95_ms": round(float(np.percentile(milliseconds, 95)), 3),
+        "p99_ms": round(float(np.percentile(milliseconds, 99)), 3),
+        "mean_ms": round(float(milliseconds.mean()), 3),
+    }
+
+
+def _rate(count, seconds) -> float:
+    return round(count / seconds, 2) if seconds > 0 else float("inf")
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=Path(__file__).parent, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(pdf_paths, fake_embeddings: bool, repeat: int, workers: int, index_type: str, storage: str,
+        mode: str, query_cache: bool) -> dict:
+    parser = ParallelPDFParser(max_workers=workers, pages_per_task=config.PDF_PAGES_PER_TASK)
+    chunker = OffsetChunker(config.CHUNK_SIZE, config.CHUNK_OVERLAP)
+
+    # Ingestion: parse and chunk, timed separately
+    start = time.perf_counter()
+    pages = [page for pdf_path in pdf_paths for page in parser.parse(pdf_path)]
+    parse_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    chunks = chunker.split_documents(pages)
+    chunk_seconds = time.perf_counter() - start
+
+    # Embedding, without the persistent cache so every run does the work
+    if fake_embeddings:
+        model = HashingEmbeddings()
+    else:
+        from embeddings_Module.embeddings import Embeddings
+        model = Embeddings(
+            model_name=config.EMBEDDING_MODEL,
+            batch_size=config.EMBEDDING_BATCH_SIZE,
+            backend=config.EMBEDDING_BACKEND,
+            quantize=config.EMBEDDING_QUANTIZE,
+            num_threads=config.EMBEDDING_THREADS or None
+        )
+    texts = [chunk.page_content for chunk in chunks]
+    start = time.perf_counter()
+    vectors = model.embed_documents(texts)
+    embed_seconds = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        start = time.perf_counter()
+        store = LocalVectorStore(
+            index_dir,
+            PrecomputedEmbeddings(model, texts, vectors),
+            index_type=index_type,
+            storage=storage
+        )
+        ids = [f"chunk-{i}" for i in range(len(chunks))]
+        store.add_documents(chunks, ids=ids)
+        # In memory, like the app's index apart from persistence
+        lexical_index = BM25Index() if mode == "hybrid" else None
+        if lexical_index is not None:
+            lexical_index.add_documents(chunks, ids)
+        index_seconds = time.perf_counter() - start
+
+        cache = QueryCache(
+            max_entries=config.QUERY_CACHE_MAX_ENTRIES,
+            ttl_seconds=config.QUERY_CACHE_TTL_SECONDS,
+            similarity_threshold=config.QUERY_CACHE_SIMILARITY
+        ) if query_cache else None
+        retriever = Retrieval(
+            vector_store=store,
+            top_k=3,
+            cache=cache,
+            lexical_index=lexical_index,
+            mode=mode,
+            candidates=config.HYBRID_CANDIDATES,
+            rrf_k=config.RRF_K
+        )
+        llm_model = LLMMOdel(
+            api_key="benchmark",
+            model_name="fake",
+            packer=ContextPacker(max_tokens=config.CONTEXT_MAX_TOKENS),
+            chat_model=FakeListChatModel(responses=["A fixed answer from the benchmark model."])
+        )
+        questions = QUESTIONS * repeat
+
+        retrieval_seconds = []
+        for question in questions:
+            start = time.perf_counter()
+            retriever.search(question)
+            retrieval_seconds.append(time.perf_counter() - start)
+
+        answer_seconds = []
+        for question in questions:
+            start = time.perf_counter()
+            llm_model.generate_answer(question, retriever.search(question))
+            answer_seconds.append(time.perf_counter() - start)
+        retriever.close()
+
+    return {
+        "ingestion": {
+            "pdfs": [Path(pdf_path).name for pdf_path in pdf_paths],
+            "pages": len(pages),
+            "parse_seconds": round(parse_seconds, 4),
+            "pages_per_second": _rate(len(pages), parse_seconds),
+            "chunks": len(chunks),
+            "chunk_seconds": round(chunk_seconds, 4),
+            "chunks_per_second": _rate(len(chunks), chunk_seconds),
+        },
+        "embedding": {
+            "model": "hashing" if fake_embeddings else config.EMBEDDING_MODEL,
+            "texts": len(texts),
+            "seconds": round(embed_seconds, 4),
+            "texts_per_second": _rate(len(texts), embed_seconds),
+        },
+        "index": {
+            "type": index_type,
+            "storage": storage,
+            "build_seconds": round(index_seconds, 4),
+        },
+        "retrieval": {
+            "mode": mode,
+            "query_cache": query_cache,
+            "query_cache_hits": cache.hits if cache is not None else 0,
+            **_percentiles(retrieval_seconds),
+        },
+        "end_to_end": _percentiles(answer_seconds),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of ingestion, retrieval and answering.")
+    parser.add_argument("pdfs", nargs="*", default=DEFAULT_PDFS, help="PDFs to ingest")
+    parser.add_argument("--out", default="benchmark_results.json", help="JSON file the results are written to")
+    parser.add_argument("--fake-embeddings", action="store_true", help="Deterministic hashing embeddings instead of the model")
+    parser.add_argument("--repeat", type=int, default=5, help="Times the question set is asked")
+    parser.add_argument("--workers", type=int, default=config.PDF_PARSE_WORKERS, help="PDF parse workers")
+    parser.add_argument("--index-type", default="flat", choices=["flat", "ivf"])
+    parser.add_argument("--storage", default="float32", choices=["float32", "int8", "binary"])
+    parser.add_argument("--mode", default=config.RETRIEVAL_MODE, choices=["dense", "hybrid"],
+                        help="Retrieval mode; defaults to RETRIEVAL_MODE")
+    parser.add_argument("--query-cache", action="store_true", help="Serve repeated questions from a QueryCache")
+    args = parser.parse_args()
+
+    results = {
+        "app": "RAG_APP",
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        **run(args.pdfs, args.fake_embeddings, args.repeat, args.workers, args.index_type, args.storage,
+            args.mode, args.query_cache),
+    }
+    Path(args.out).write_text(json.dumps(results, indent=2))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Reproducible check of the BM25 index log after an interrupted write.
+
+Builds an index on disk, leaves a torn final line (a partial record, or a
+complete record whose newline was never written), reopens it and keeps
+writing. Every document added after the reopen must survive the next load
+and be found by search.
+
+    python check_lexical_index.py
+
+Exits non-zero when a check fails.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src directory to Python path
+src_path = Path(__file__).parent / "src"
+sys.path.insert(0, str(src_path))
+
+from langchain_core.documents import Document
+
+from Retrival_Module.lexicalIndex import BM25Index
+
+
+def document(doc_id: str) -> Document:
+    return Document(page_content=f"chunk {doc_id} mentions keyword{doc_id}", metadata={"id": doc_id})
+
+
+def scenario(path: Path, torn_tail: str) -> dict:
+    """Add "a", append `torn_tail` to the log, reopen, add "c" and "d", reopen again."""
+    index = BM25Index.load(path)
+    index.add_documents([document("a")], ["a"])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(torn_tail)
+
+    index = BM25Index.load(path)
+    index.add_documents([document("c"), document("d")], ["c", "d"])
+    index = BM25Index.load(path)
+    found = {doc_id: bool(index.search(f"keyword{doc_id}", k=1)) for doc_id in ("a", "c", "d")}
+    return {
+        "documents": sorted(index._documents),
+        "found_by_search": found,
+        "ends_with_newline": path.read_bytes().endswith(b"\n"),
+        "ok": all(found.values()) and {"a", "c", "d"} <= set(index._documents),
+    }
+
+
+def main():
+    partial = json.dumps({"id": "b", "page_content": "chunk b", "metadata": {}})[:20]
+    unterminated = json.dumps({"id": "b", "page_content": "chunk b mentions keywordb", "metadata": {}})
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, tail in (("partial record", partial), ("record without newline", unterminated)):
+            results[name] = scenario(Path(directory) / f"{name.replace(' ', '_')}.jsonl", tail)
+
+    print(json.dumps(results, indent=2))
+    if not all(result["ok"] for result in results.values()):
+        print("lexical index check failed", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,15 +8,24 @@ import time
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
+import httpx
 import streamlit as st
 
 try:
     from config_Module import config
     from document_ingestion_Module import docIngestion
+    from document_ingestion_Module import manifest
+    from document_ingestion_Module import pdfParser
     from embeddings_Module import embeddings
     from vectorStore_Module import vectorStore
     from Retrival_Module import retrieval
+    from Retrival_Module import queryCache
+    from Retrival_Module import lexicalIndex
     from llm_call import llm
+    from llm_call import answerCache
+    from llm_call import contextPacker
+    from registry_Module import componentRegistry
+    from telemetry_Module import tracing
     
     GROQ_API_KEY = config.GROQ_API_KEY
     PINECONE_API_KEY = config.PINECONE_API_KEY
@@ -24,12 +33,61 @@ try:
     LLM_MODEL = config.LLM_MODEL
     CHUNK_SIZE = config.CHUNK_SIZE
     CHUNK_OVERLAP = config.CHUNK_OVERLAP
+    EMBEDDING_BATCH_SIZE = config.EMBEDDING_BATCH_SIZE
+    EMBEDDING_NUM_WORKERS = config.EMBEDDING_NUM_WORKERS
+    EMBEDDING_BACKEND = config.EMBEDDING_BACKEND
+    EMBEDDING_QUANTIZE = config.EMBEDDING_QUANTIZE
+    EMBEDDING_THREADS = config.EMBEDDING_THREADS
+    EMBEDDING_CACHE_DIR = config.EMBEDDING_CACHE_DIR
+    EMBEDDING_CACHE_MAX_ENTRIES = config.EMBEDDING_CACHE_MAX_ENTRIES
+    VECTOR_BACKEND = config.VECTOR_BACKEND
+    INDEX_NAME = config.INDEX_NAME
+    LOCAL_INDEX_DIR = config.LOCAL_INDEX_DIR
+    LOCAL_INDEX_TYPE = config.LOCAL_INDEX_TYPE
+    LOCAL_INDEX_STORAGE = config.LOCAL_INDEX_STORAGE
+    LOCAL_RESCORE_FACTOR = config.LOCAL_RESCORE_FACTOR
+    INGEST_MANIFEST_PATH = config.INGEST_MANIFEST_PATH
+    PDF_PARSE_WORKERS = config.PDF_PARSE_WORKERS
+    PDF_PAGES_PER_TASK = config.PDF_PAGES_PER_TASK
+    PAGE_CACHE_DIR = config.PAGE_CACHE_DIR
+    QUERY_CACHE_MAX_ENTRIES = config.QUERY_CACHE_MAX_ENTRIES
+    QUERY_CACHE_TTL_SECONDS = config.QUERY_CACHE_TTL_SECONDS
+    QUERY_CACHE_SIMILARITY = config.QUERY_CACHE_SIMILARITY
+    RETRIEVAL_MODE = config.RETRIEVAL_MODE
+    LEXICAL_INDEX_PATH = config.LEXICAL_INDEX_PATH
+    HYBRID_CANDIDATES = config.HYBRID_CANDIDATES
+    RRF_K = config.RRF_K
+    CONTEXT_MAX_TOKENS = config.CONTEXT_MAX_TOKENS
+    CONTEXT_SCORE_GAP = config.CONTEXT_SCORE_GAP
+    CONTEXT_DUPLICATE_THRESHOLD = config.CONTEXT_DUPLICATE_THRESHOLD
+    ANSWER_CACHE_PATH = config.ANSWER_CACHE_PATH
+    ANSWER_CACHE_MAX_ENTRIES = config.ANSWER_CACHE_MAX_ENTRIES
+    ANSWER_CACHE_TTL_SECONDS = config.ANSWER_CACHE_TTL_SECONDS
+    ANSWER_CACHE_SEMANTIC = config.ANSWER_CACHE_SEMANTIC
+    ANSWER_CACHE_SIMILARITY = config.ANSWER_CACHE_SIMILARITY
+    LLM_HTTP_MAX_CONNECTIONS = config.LLM_HTTP_MAX_CONNECTIONS
+    LLM_HTTP_KEEPALIVE_SECONDS = config.LLM_HTTP_KEEPALIVE_SECONDS
+    LLM_HTTP_TIMEOUT_SECONDS = config.LLM_HTTP_TIMEOUT_SECONDS
+    LLM_HEALTH_CHECK_TIMEOUT_SECONDS = config.LLM_HEALTH_CHECK_TIMEOUT_SECONDS
+    HEALTH_CHECK_INTERVAL_SECONDS = config.HEALTH_CHECK_INTERVAL_SECONDS
+    TELEMETRY_ENABLED = config.TELEMETRY_ENABLED
+    TELEMETRY_TRACE_PATH = config.TELEMETRY_TRACE_PATH
+    METRICS_PORT = config.METRICS_PORT
     DEFAULT_DATA_DIR = config.DEFAULT_DATA_DIR
     DocumentIngestion = docIngestion.DocumentIngestion
+    IngestionManifest = manifest.IngestionManifest
+    IncrementalIngestor = manifest.IncrementalIngestor
+    ParallelPDFParser = pdfParser.ParallelPDFParser
     EmbeddingModel = embeddings.Embeddings
     VectorDatabase = vectorStore.VectorDatabase
     Retrieval = retrieval.Retrieval
+    QueryCache = queryCache.QueryCache
+    BM25Index = lexicalIndex.BM25Index
     LLMModel = llm.LLMMOdel
+    AnswerCache = answerCache.AnswerCache
+    ContextPacker = contextPacker.ContextPacker
+    ComponentRegistry = componentRegistry.ComponentRegistry
+    telemetry = tracing.telemetry
 
 except ModuleNotFoundError as e:
     st.error(f"Module import error: {e}")
@@ -66,46 +124,126 @@ st.markdown("""
 
 def init_session_state():
     """Initialize session state variables"""
-    if 'vector_store' not in st.session_state:
-        st.session_state.vector_store = None
     if 'initialized' not in st.session_state:
         st.session_state.initialized = False
     if 'history' not in st.session_state:
         st.session_state.history = []
 
-@st.cache_resource
-def load_vector_store():
-    """Auto-connect to existing Pinecone index"""
-    try:
-        st.write("🔗 Connecting to Pinecone index...")
-        embedder = EmbeddingModel(model_name=EMBEDDING_MODEL)
-        vector_db = VectorDatabase(
-            index_name="ragapp",
-            embeddding_model=embedder
+def _connect_vector_db(registry):
+    """Load the vector index; writes to it invalidate the query and answer caches"""
+    vector_db = VectorDatabase(
+        index_name=INDEX_NAME,
+        embeddding_model=registry.get("embedder"),
+        backend=VECTOR_BACKEND,
+        index_dir=LOCAL_INDEX_DIR,
+        index_type=LOCAL_INDEX_TYPE,
+        storage=LOCAL_INDEX_STORAGE,
+        rescore_factor=LOCAL_RESCORE_FACTOR,
+        lexical_index=registry.get("lexical_index") if RETRIEVAL_MODE == "hybrid" else None
+    )
+    vector_db.add_change_listener(lambda: registry.get("query_cache").clear())
+    vector_db.add_delete_listener(lambda ids: registry.get("answer_cache").invalidate_chunks(ids))
+    vector_db.load_existing_index()
+    return vector_db
+
+def _connect_llm(registry):
+    """Groq client over one keep-alive connection pool"""
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_HTTP_MAX_CONNECTIONS,
+            keepalive_expiry=LLM_HTTP_KEEPALIVE_SECONDS
+        ),
+        timeout=LLM_HTTP_TIMEOUT_SECONDS
+    )
+    return LLMModel(
+        api_key=GROQ_API_KEY,
+        model_name=LLM_MODEL,
+        cache=registry.get("answer_cache"),
+        http_client=http_client,
+        health_check_timeout=LLM_HEALTH_CHECK_TIMEOUT_SECONDS,
+        packer=ContextPacker(
+            max_tokens=CONTEXT_MAX_TOKENS,
+            score_gap=CONTEXT_SCORE_GAP,
+            duplicate_threshold=CONTEXT_DUPLICATE_THRESHOLD
         )
-        # Load existing index
-        vector_store = vector_db.load_existing_index()
-        st.write("✅ Connected to Pinecone!")
-        return vector_store, embedder
-    except Exception as e:
-        st.warning(f"⚠️ Could not connect to Pinecone: {str(e)}")
-        return None, None
+    )
+
+@st.cache_resource
+def get_registry():
+    """Process-wide components shared by all queries and sessions"""
+    registry = ComponentRegistry(health_check_interval=HEALTH_CHECK_INTERVAL_SECONDS)
+    registry.register("embedder", lambda r: EmbeddingModel(
+        model_name=EMBEDDING_MODEL,
+        batch_size=EMBEDDING_BATCH_SIZE,
+        num_workers=EMBEDDING_NUM_WORKERS,
+        cache_dir=EMBEDDING_CACHE_DIR,
+        cache_max_entries=EMBEDDING_CACHE_MAX_ENTRIES,
+        backend=EMBEDDING_BACKEND,
+        quantize=EMBEDDING_QUANTIZE,
+        num_threads=EMBEDDING_THREADS or None
+    ))
+    registry.register("query_cache", lambda r: QueryCache(
+        max_entries=QUERY_CACHE_MAX_ENTRIES,
+        ttl_seconds=QUERY_CACHE_TTL_SECONDS,
+        similarity_threshold=QUERY_CACHE_SIMILARITY
+    ))
+    registry.register("answer_cache", lambda r: AnswerCache(
+        ANSWER_CACHE_PATH,
+        max_entries=ANSWER_CACHE_MAX_ENTRIES,
+        ttl_seconds=ANSWER_CACHE_TTL_SECONDS,
+        embed_fn=r.get("embedder").embed_query if ANSWER_CACHE_SEMANTIC else None,
+        similarity_threshold=ANSWER_CACHE_SIMILARITY
+    ), depends_on=["embedder"])
+    registry.register("lexical_index", lambda r: BM25Index.load(LEXICAL_INDEX_PATH))
+    registry.register(
+        "vector_db",
+        _connect_vector_db,
+        health_check=lambda vector_db: vector_db.is_healthy(),
+        depends_on=["embedder", "lexical_index"]
+    )
+    registry.register("retriever", lambda r: Retrieval(
+        vector_store=r.get("vector_db").vector_store,
+        top_k=3,
+        cache=r.get("query_cache"),
+        lexical_index=r.get("vector_db").lexical_index,
+        mode=RETRIEVAL_MODE,
+        candidates=HYBRID_CANDIDATES,
+        rrf_k=RRF_K
+    ), depends_on=["vector_db", "query_cache"])
+    registry.register(
+        "llm",
+        _connect_llm,
+        health_check=lambda llm_model: llm_model.is_healthy(),
+        depends_on=["answer_cache"]
+    )
+    return registry
+
+@st.cache_resource
+def start_telemetry():
+    """Enable tracing and serve /metrics once per process"""
+    telemetry.configure(TELEMETRY_ENABLED, TELEMETRY_TRACE_PATH)
+    if TELEMETRY_ENABLED and METRICS_PORT:
+        telemetry.serve(METRICS_PORT)
+    return telemetry
 
 def main():
     """Main application"""
     init_session_state()
+    start_telemetry()
     
     # Title
     st.title("🔍 RAG Document Search System")
     st.markdown("Ask questions about your documents powered by Groq LLM")
     
-    # Load vector store on startup
-    if st.session_state.vector_store is None:
+    # Connect to the vector store on startup (once per process, shared by sessions)
+    if not st.session_state.initialized:
         with st.spinner("⏳ Connecting to vector store..."):
-            vector_store, embedder = load_vector_store()
-            if vector_store is not None:
-                st.session_state.vector_store = vector_store
+            try:
+                get_registry().get("vector_db")
                 st.session_state.initialized = True
+            except Exception as e:
+                st.warning(f"⚠️ Could not connect to {VECTOR_BACKEND} index: {str(e)}")
     
     # Sidebar for document management
     with st.sidebar:
@@ -125,20 +263,27 @@ def main():
                     try:
                         ingestion = DocumentIngestion(
                             chunk_size=CHUNK_SIZE,
-                            chunk_overlap=CHUNK_OVERLAP
+                            chunk_overlap=CHUNK_OVERLAP,
+                            pdf_parser=ParallelPDFParser(
+                                max_workers=PDF_PARSE_WORKERS,
+                                pages_per_task=PDF_PAGES_PER_TASK,
+                                cache_dir=PAGE_CACHE_DIR
+                            )
                         )
                         pdf_path = DEFAULT_DATA_DIR / selected_pdf
-                        documents = ingestion.extract_text_from_pdf(str(pdf_path))
                         
-                        embedder = EmbeddingModel(model_name=EMBEDDING_MODEL)
-                        vector_db = VectorDatabase(
-                            index_name="ragapp",
-                            embeddding_model=embedder
+                        # Shared handle: searches see the new chunks without reconnecting
+                        ingestor = IncrementalIngestor(
+                            ingestion,
+                            get_registry().get("vector_db"),
+                            IngestionManifest(INGEST_MANIFEST_PATH)
                         )
-                        st.session_state.vector_store = vector_db.add_documents(documents)
-                        st.cache_resource.clear()
+                        stats = ingestor.ingest(pdf_path)
                         
-                        st.sidebar.success(f"✅ Processed {len(documents)} chunks!")
+                        st.sidebar.success(
+                            f"✅ {stats['added']} chunks added, {stats['deleted']} removed, "
+                            f"{stats['unchanged']} unchanged"
+                        )
                         st.session_state.initialized = True
                         st.rerun()
                         
@@ -162,41 +307,48 @@ def main():
     
     # Process search
     if (search_button or question) and question:
-        if st.session_state.vector_store is None:
+        if not st.session_state.initialized:
             st.error("❌ No vector store loaded. Please process a PDF first.")
         else:
             with st.spinner("🔎 Searching and generating answer..."):
                 try:
                     start_time = time.time()
+                    with telemetry.span("query"):
                     
-                    # Retrieve documents
-                    retriever = Retrieval(
-                        vector_store=st.session_state.vector_store,
-                        top_k=3
-                    )
-                    relevant_docs = retriever.search(question)
+                        # Retrieve documents
+                        registry = get_registry()
+                        relevant_docs = registry.get("retriever").search(question)
                     
-                    # Generate answer
-                    llm_model = LLMModel(api_key=GROQ_API_KEY, model_name=LLM_MODEL)
-                    answer = llm_model.generate_answer(question, relevant_docs)
+                        # Generate answer
+                        llm_model = registry.get("llm")
+                    
+                        # Display answer as it streams in
+                        st.markdown("### 💡 Answer")
+                        answer_box = st.empty()
+                        answer = ""
+                        first_token_time = None
+                        for token in llm_model.stream_answer(question, relevant_docs):
+                            if first_token_time is None:
+                                first_token_time = time.time() - start_time
+                            answer += token
+                            answer_box.markdown(f"""
+                            <div class="answer-box">
+                            {answer}
+                            </div>
+                            """, unsafe_allow_html=True)
                     
                     elapsed_time = time.time() - start_time
+                    if first_token_time is None:
+                        first_token_time = elapsed_time
                     
                     # Add to history
                     st.session_state.history.append({
                         'question': question,
                         'answer': answer,
+                        'first_token_time': first_token_time,
                         'time': elapsed_time
                     })
                     
-                    # Display answer
-                    st.markdown("### 💡 Answer")
-                    st.markdown(f"""
-                    <div class="answer-box">
-                    {answer}
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
                     # Show source documents
                     with st.expander("📚 Source Documents"):
                         for i, doc in enumerate(relevant_docs, 1):
@@ -210,9 +362,14 @@ def main():
                             )
                             st.divider()
                     
-                    st.caption(f"⏱️ Response time: {elapsed_time:.2f} seconds")
+                    st.caption(
+                        f"⏱️ First token: {first_token_time:.2f} seconds · "
+                        f"Total: {elapsed_time:.2f} seconds"
+                    )
                     
                 except Exception as e:
+                    # Reconnect whatever failed its health check on the next query
+                    get_registry().check()
                     st.error(f"❌ Error: {str(e)}")
     
     # Show search history
@@ -224,7 +381,7 @@ def main():
             with st.container():
                 st.markdown(f"**Q {i}:** {item['question']}")
                 st.markdown(f"**A {i}:** {item['answer'][:150]}...")
-                st.caption(f"⏱️ {item['time']:.2f}s")
+                st.caption(f"⏱️ first token {item['first_token_time']:.2f}s · total {item['time']:.2f}s")
                 st.markdown("")
 
 if __name__ == "__main__":
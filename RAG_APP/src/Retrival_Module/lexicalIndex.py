@@ -0,0 +1,202 @@
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+import heapq
+import json
+import math
+import os
+import re
+import threading
+
+from langchain_core.documents import Document
+
+
+# Words, and numbers with their decimal / section parts kept together ("7.5", "80c", "2024-25")
+_TOKEN = re.compile(r"[a-z0-9]+(?:[.\-/][0-9]+)*")
+# Amounts, years and section / clause codes: "2024-25", "80C", "7.5%", "s.10(23)"
+_CODE = re.compile(r"^\W*[a-z]{0,3}\.?\d[\w.\-/()%]*\W*$", re.IGNORECASE)
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were "
+    "will with what which who whom how why when where does do did".split()
+)
+_QUESTION_WORDS = ("what", "how", "why", "who", "when", "where", "which", "explain", "describe",
+                   "summarize", "summarise", "compare", "tell", "can", "should", "is", "are", "does", "do")
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+def is_keyword_query(query: str) -> bool:
+    """
+    Heuristic for lookups better served by exact terms than by meaning:
+    quoted phrases, or short non-questions naming a number or section code.
+    Other short queries ("tax relief") still need the dense search, so they
+    take the hybrid path.
+    """
+    if re.search(r'"[^"]+"', query):
+        return True
+    words = query.strip().rstrip("?").split()
+    if not words:
+        return False
+    if words[0].lower() in _QUESTION_WORDS or query.strip().endswith("?"):
+        return False
+    return len(words) <= 6 and any(_CODE.match(word) for word in words)
+
+
+def _record(doc_id: str, document: Document) -> dict:
+    return {
+        "id": doc_id,
+        "page_content": document.page_content,
+        "metadata": document.metadata
+    }
+
+
+class BM25Index:
+    """
+    Incremental BM25 inverted index over chunks, persisted as JSON lines.
+
+    Documents are upserted and deleted by id alongside the vector index.
+    Every write appends records to the file: an upsert stores the chunk text
+    and metadata, a delete stores a tombstone. Load replays the log and
+    rebuilds the postings in memory; once the log holds `compact_factor`
+    times more records than live documents it is rewritten in one pass.
+    """
+
+    def __init__(self, path=None, k1: float = 1.5, b: float = 0.75, compact_factor: float = 2.0):
+        """ Initialize the lexical index
+
+        Args:
+            path (optional): JSON lines file the index is persisted to; in-memory only when None.
+            k1 (float): BM25 term-frequency saturation.
+            b (float): BM25 document-length normalization.
+            compact_factor (float): Log records per live document that trigger a compaction.
+        """
+        self.path = Path(path) if path is not None else None
+        self.k1 = k1
+        self.b = b
+        self.compact_factor = compact_factor
+        self._records = 0
+        self._lock = threading.RLock()
+        self._documents: Dict[str, Document] = {}
+        self._lengths: Dict[str, int] = {}
+        self._terms: Dict[str, Counter] = {}
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._total_length = 0
+
+    @classmethod
+    def load(cls, path, **kwargs) -> "BM25Index":
+        """Open a persisted index, or an empty one if the file does not exist yet."""
+        index = cls(path, **kwargs)
+        if index.path.exists():
+            torn = False
+            with open(index.path, encoding="utf-8") as f:
+                for line in f:
+                    # A write interrupted mid-record leaves an undecodable or unterminated line
+                    torn = torn or not line.endswith("\n")
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        torn = True
+                        continue
+                    index._records += 1
+                    index._remove(record["id"])
+                    if not record.get("deleted"):
+                        index._add(record["id"], Document(
+                            page_content=record["page_content"],
+                            metadata=record["metadata"]
+                        ))
+            if torn:
+                # Rewrite the log now, or the next append would continue the torn line
+                index.save()
+        return index
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._documents
+
+    def add_documents(self, documents: List[Document], ids: List[str]):
+        """Index documents; an existing id is replaced."""
+        with self._lock:
+            records = []
+            for doc_id, document in zip(ids, documents):
+                self._remove(doc_id)
+                self._add(doc_id, document)
+                records.append(_record(doc_id, document))
+            self._append(records)
+
+    def delete(self, ids: List[str]):
+        """Remove documents by id; unknown ids are ignored."""
+        with self._lock:
+            records = []
+            for doc_id in ids:
+                if doc_id in self._documents:
+                    self._remove(doc_id)
+                    records.append({"id": doc_id, "deleted": True})
+            self._append(records)
+
+    def search(self, query: str, k: int = 4) -> List[Tuple[Document, float]]:
+        """Return the k best BM25 matches with their scores."""
+        terms = set(tokenize(query))
+        with self._lock:
+            count = len(self._documents)
+            if not terms or not count:
+                return []
+            average_length = self._total_length / count
+            scores: Dict[str, float] = defaultdict(float)
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                    scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+            best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [(self._documents[doc_id], score) for doc_id, score in best]
+
+    def save(self):
+        """Rewrite the file with one record per live document (compaction)."""
+        if self.path is None:
+            return
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for doc_id, document in self._documents.items():
+                    f.write(json.dumps(_record(doc_id, document)) + "\n")
+            os.replace(tmp_path, self.path)
+            self._records = len(self._documents)
+
+    def _append(self, records: List[dict]):
+        if self.path is None or not records:
+            return
+        if self._records + len(records) > max(self.compact_factor * len(self._documents), 1024):
+            self.save()
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(record) + "\n" for record in records))
+        self._records += len(records)
+
+    def _add(self, doc_id: str, document: Document):
+        terms = Counter(tokenize(document.page_content))
+        self._documents[doc_id] = document
+        self._terms[doc_id] = terms
+        self._lengths[doc_id] = sum(terms.values())
+        self._total_length += self._lengths[doc_id]
+        for term, frequency in terms.items():
+            self._postings[term][doc_id] = frequency
+
+    def _remove(self, doc_id: str):
+        if doc_id not in self._documents:
+            return
+        for term in self._terms.pop(doc_id):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(doc_id)
+        del self._documents[doc_id]
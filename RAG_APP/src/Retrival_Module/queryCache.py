@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from typing import List, Optional
+import threading
+import time
+
+import numpy as np
+from langchain_core.documents import Document
+
+
+class QueryCache:
+    """
+    Retrieval cache keyed by query text and query embedding.
+
+    An exact repeat of a query is answered without embedding it. Otherwise
+    the query embedding is compared (cosine) against every cached query and
+    the stored results of the closest one are reused when the similarity
+    reaches `similarity_threshold`. Entries expire after `ttl_seconds` and
+    the least recently used entry is evicted once `max_entries` is reached.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600,
+                 similarity_threshold: float = 0.95):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, dict]" = OrderedDict()
+        self._vectors = None
+        self._slot_keys: List[Optional[tuple]] = [None] * max_entries
+
+    def get(self, query: str, k: int) -> Optional[List[Document]]:
+        """Results cached for exactly this query, if any."""
+        with self._lock:
+            entry = self._live_entry((self._normalize(query), k))
+            if entry is None:
+                return None
+            self.hits += 1
+            return list(entry["results"])
+
+    def get_similar(self, vector, k: int) -> Optional[List[Document]]:
+        """Results of the most similar cached query, if it is similar enough."""
+        with self._lock:
+            if self._vectors is None or not self._entries:
+                self.misses += 1
+                return None
+            scores = self._vectors @ self._unit(vector)
+            for slot in np.argsort(-scores):
+                if scores[slot] < self.similarity_threshold:
+                    break
+                key = self._slot_keys[slot]
+                if key is None or key[1] != k:
+                    continue
+                entry = self._live_entry(key)
+                if entry is not None:
+                    self.hits += 1
+                    return list(entry["results"])
+            self.misses += 1
+            return None
+
+    def put(self, query: str, vector, k: int, results: List[Document]):
+        """Cache the results of a query together with its embedding."""
+        vector = self._unit(vector)
+        key = (self._normalize(query), k)
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_entries:
+                    self._evict(next(iter(self._entries)))
+                slot = self._slot_keys.index(None)
+                entry = self._entries[key] = {"slot": slot}
+                self._slot_keys[slot] = key
+            self._entries.move_to_end(key)
+            entry["results"] = list(results)
+            entry["created"] = time.monotonic()
+            self._vectors[entry["slot"]] = vector
+
+    def clear(self):
+        """Drop every entry, e.g. after the index changed."""
+        with self._lock:
+            self._entries.clear()
+            self._slot_keys = [None] * self.max_entries
+            if self._vectors is not None:
+                self._vectors[:] = 0
+
+    def _live_entry(self, key: tuple) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry["created"] > self.ttl_seconds:
+            self._evict(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _evict(self, key: tuple):
+        entry = self._entries.pop(key)
+        self._slot_keys[entry["slot"]] = None
+        self._vectors[entry["slot"]] = 0
+
+    @staticmethod
+    def _normalize(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    @staticmethod
+    def _unit(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
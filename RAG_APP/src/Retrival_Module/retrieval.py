@@ -1,28 +1,145 @@
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Dict, List, Tuple
+import hashlib
+
 from langchain_core.documents import Document
 
+from telemetry_Module.tracing import telemetry
+
+from .lexicalIndex import is_keyword_query
+
+
+def _fusion_key(doc: Document) -> str:
+    chunk_id = doc.metadata.get("chunk_id")
+    if chunk_id is not None:
+        return str(chunk_id)
+    return hashlib.sha256(doc.page_content.encode("utf-8")).hexdigest()
+
+
+def _scored(results: List[Tuple[Document, float]]) -> List[Document]:
+    """Copies of the documents with their retrieval score in the metadata, for context packing."""
+    return [
+        Document(page_content=doc.page_content, metadata={**doc.metadata, "score": float(score)})
+        for doc, score in results
+    ]
+
+
+def reciprocal_rank_fusion(rankings: List[List[Document]], k: int = 60) -> List[Tuple[Document, float]]:
+    """Merge ranked lists by summing 1 / (k + rank) for every list a document appears in."""
+    scores: Dict[str, float] = {}
+    documents: Dict[str, Document] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, 1):
+            key = _fusion_key(doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            documents.setdefault(key, doc)
+    return [(documents[key], scores[key]) for key in sorted(scores, key=scores.get, reverse=True)]
+
 
 class Retrieval :
 
 
 
-    def __init__ (self , vector_store , top_k :int =3) :
+    def __init__ (self , vector_store , top_k :int =3 , cache = None ,
+                  lexical_index = None , mode : str = "dense" , candidates : int = 20 , rrf_k : int = 60) :
 
+        """ Initialize the retrieval module
+
+        Args:
+            vector_store: Dense vector store.
+            top_k (int): Number of documents returned.
+            cache (QueryCache, optional): Cache of dense search results.
+            lexical_index (BM25Index, optional): Keyword index; required by the hybrid mode.
+            mode (str): "dense", or "hybrid" for dense + BM25 fused by reciprocal rank.
+            candidates (int): Results taken from each ranking before fusion.
+            rrf_k (int): Reciprocal rank fusion constant.
+        """
+        if mode not in ("dense", "hybrid"):
+            raise ValueError(f"Unsupported retrieval mode: {mode}")
         self.vector_store = vector_store
         self.top_k = top_k
+        self.cache = cache
+        self.lexical_index = lexical_index
+        self.mode = mode if lexical_index is not None else "dense"
+        self.candidates = max(candidates, top_k)
+        self.rrf_k = rrf_k
+        self._pool = ThreadPoolExecutor(max_workers=1) if self.mode == "hybrid" else None
 
     def search (self , query : str) -> List[Document] :
 
         """
         Searches the vector store for relevant documents based on the query.
 
+        With a QueryCache, exact repeats are answered without embedding the
+        query and near-duplicate queries reuse the cached results. In hybrid
+        mode, keyword lookups are answered from the BM25 index alone; other
+        queries run BM25 and dense search concurrently and fuse the rankings.
+
         Args:
             query (str): The search query. """
         
 
 
-        results = self.vector_store.similarity_search(
-            query,
-            k=self.top_k
-        )
-        return results
\ No newline at end of file
+        with telemetry.span("retrieval.search", mode=self.mode) as span:
+            results = self._search(query, span)
+            telemetry.observe("documents_retrieved", len(results), mode=self.mode)
+            return results
+
+    def _search(self, query: str, span) -> List[Document]:
+
+        if self.mode == "dense":
+            return self._dense(query, self.top_k)
+
+        if is_keyword_query(query):
+            lexical = self._lexical(query, self.top_k)
+            if lexical:
+                span.set("path", "lexical")
+                return _scored(lexical)
+
+        # BM25 runs on the worker thread while the query is embedded and searched here;
+        # the copied context keeps its span in this trace
+        span.set("path", "fused")
+        lexical = self._pool.submit(copy_context().run, self._lexical, query, self.candidates)
+        dense = self._dense(query, self.candidates)
+        rankings = [dense, [doc for doc, _ in lexical.result()]]
+        with telemetry.span("retrieval.fusion"):
+            return _scored(reciprocal_rank_fusion(rankings, k=self.rrf_k)[:self.top_k])
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
+    def _lexical(self, query: str, k: int):
+        with telemetry.span("retrieval.lexical_search"):
+            return self.lexical_index.search(query, k=k)
+
+    def _dense(self, query: str, k: int) -> List[Document]:
+
+        if self.cache is None:
+            with telemetry.span("retrieval.vector_search"):
+                return _scored(self.vector_store.similarity_search_with_score(
+                    query,
+                    k=k
+                ))
+
+        results = self.cache.get(query, k)
+        if results is not None:
+            telemetry.count("cache_requests", cache="query", result="hit")
+            return results
+
+        with telemetry.span("retrieval.embed_query"):
+            query_vector = self.vector_store.embeddings.embed_query(query)
+        results = self.cache.get_similar(query_vector, k)
+        if results is not None:
+            telemetry.count("cache_requests", cache="query", result="near")
+            return results
+        telemetry.count("cache_requests", cache="query", result="miss")
+
+        with telemetry.span("retrieval.vector_search"):
+            results = _scored(self.vector_store.similarity_search_by_vector_with_score(
+                query_vector,
+                k=k
+            ))
+        self.cache.put(query, query_vector, k, results)
+        return results
@@ -27,4 +27,72 @@ LLM_MODEL = "llama-3.1-8b-instant"
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 200
 
+# Embedding throughput
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+EMBEDDING_NUM_WORKERS = int(os.getenv("EMBEDDING_NUM_WORKERS", "0"))
 
+# Embedding runtime: "torch", or "onnx" (ONNX Runtime, needs sentence-transformers[onnx]),
+# optionally int8 quantized; 0 threads = library default
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_QUANTIZE = os.getenv("EMBEDDING_QUANTIZE", "false").lower() == "true"
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0"))
+
+# Persistent embedding cache (same location and format as the knowledge Assistant app)
+EMBEDDING_CACHE_DIR = Path(
+    os.getenv("EMBEDDING_CACHE_DIR", Path.home() / ".cache" / "gen_ai_handson" / "embeddings")
+)
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+
+# Vector store backend: "pinecone" or "local"
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "pinecone")
+INDEX_NAME = "ragapp"
+# Local backend: "flat" (exact) or "ivf" (approximate, for large corpora)
+LOCAL_INDEX_DIR = Path(os.getenv("LOCAL_INDEX_DIR", Path(__file__).resolve().parents[2] / "index_data"))
+LOCAL_INDEX_TYPE = os.getenv("LOCAL_INDEX_TYPE", "flat")
+# In-memory vectors: "float32", or "int8" / "binary" codes rescored against the memory-mapped float32 file
+LOCAL_INDEX_STORAGE = os.getenv("LOCAL_INDEX_STORAGE", "float32")
+LOCAL_RESCORE_FACTOR = 10
+
+# Parallel PDF parsing (1 parses in-process) and extracted page-text cache
+PDF_PARSE_WORKERS = int(os.getenv("PDF_PARSE_WORKERS", str(os.cpu_count() or 1)))
+PDF_PAGES_PER_TASK = 8
+PAGE_CACHE_DIR = Path(os.getenv("PAGE_CACHE_DIR", Path.home() / ".cache" / "gen_ai_handson" / "pages"))
+
+# Ingestion manifest (file and chunk hashes) used for incremental re-ingestion
+INGEST_MANIFEST_PATH = Path(__file__).resolve().parents[2] / "manifests" / f"{VECTOR_BACKEND}_{INDEX_NAME}.json"
+
+# Retrieval cache: exact repeats and near-duplicate queries (cosine >= threshold)
+QUERY_CACHE_MAX_ENTRIES = 1024
+QUERY_CACHE_TTL_SECONDS = float(os.getenv("QUERY_CACHE_TTL_SECONDS", "3600"))
+QUERY_CACHE_SIMILARITY = float(os.getenv("QUERY_CACHE_SIMILARITY", "0.95"))
+
+# Retrieval mode: "dense", or "hybrid" (dense + BM25 keyword index, fused by reciprocal rank)
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "hybrid")
+LEXICAL_INDEX_PATH = Path(__file__).resolve().parents[2] / "lexical" / f"{VECTOR_BACKEND}_{INDEX_NAME}.jsonl"
+HYBRID_CANDIDATES = 20
+RRF_K = 60
+
+# Context packing: overlapping chunks merged, near-duplicates dropped, fitted to a token budget
+CONTEXT_MAX_TOKENS = int(os.getenv("CONTEXT_MAX_TOKENS", "3000"))
+CONTEXT_SCORE_GAP = 0.25
+CONTEXT_DUPLICATE_THRESHOLD = 0.9
+
+# Answer cache (SQLite): exact prompt repeats, plus similar questions over the same chunks
+ANSWER_CACHE_PATH = Path(os.getenv("ANSWER_CACHE_PATH", Path.home() / ".cache" / "gen_ai_handson" / "answers.sqlite3"))
+ANSWER_CACHE_MAX_ENTRIES = 5000
+ANSWER_CACHE_TTL_SECONDS = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+ANSWER_CACHE_SEMANTIC = os.getenv("ANSWER_CACHE_SEMANTIC", "true").lower() == "true"
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.97"))
+
+# Long-lived LLM client: keep-alive connection pool shared across queries
+LLM_HTTP_MAX_CONNECTIONS = 10
+LLM_HTTP_KEEPALIVE_SECONDS = 120.0
+LLM_HTTP_TIMEOUT_SECONDS = float(os.getenv("LLM_HTTP_TIMEOUT_SECONDS", "60"))
+LLM_HEALTH_CHECK_TIMEOUT_SECONDS = float(os.getenv("LLM_HEALTH_CHECK_TIMEOUT_SECONDS", "2"))
+# Shared components are health-checked at most this often, and rebuilt when unhealthy
+HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv("HEALTH_CHECK_INTERVAL_SECONDS", "60"))
+
+# Tracing and metrics: per-stage spans appended to a JSON trace log, Prometheus text on :METRICS_PORT/metrics (0 disables)
+TELEMETRY_ENABLED = os.getenv("TELEMETRY_ENABLED", "false").lower() == "true"
+TELEMETRY_TRACE_PATH = os.getenv("TELEMETRY_TRACE_PATH", str(Path(__file__).resolve().parents[2] / "traces" / "rag_app.jsonl"))
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
@@ -1,11 +1,12 @@
 from langchain_community.document_loaders import PyPDFLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from typing import List
 import tempfile
 import os
 from pathlib import Path
 
+from .chunker import OffsetChunker
+
 
 
 class DocumentIngestion:
@@ -14,12 +15,13 @@ class DocumentIngestion:
 
 
 
-    def __init__(self , chunk_size: int, chunk_overlap: int ):
+    def __init__(self , chunk_size: int, chunk_overlap: int , pdf_parser = None):
 
         """ Initialize the doc ingestion module
         
         Args: chunk_size : size of each text chunk
                 chunk_overlap : overlap between text chunks
+                pdf_parser : optional ParallelPDFParser; PyPDFLoader is used when None
         
         
         
@@ -27,11 +29,10 @@ class DocumentIngestion:
 
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-        self.text_splitter = RecursiveCharacterTextSplitter(
+        self.pdf_parser = pdf_parser
+        self.text_splitter = OffsetChunker(
             chunk_size = self.chunk_size,
-            chunk_overlap = self.chunk_overlap,
-            length_function = len
-
+            chunk_overlap = self.chunk_overlap
         )
 
 
@@ -45,8 +46,11 @@ class DocumentIngestion:
             pdf_file_path (str): Path to the PDF file. """
         
 
-        loader = PyPDFLoader(pdf_path)
-        documents = loader.load()
+        if self.pdf_parser is not None:
+            documents = self.pdf_parser.parse(pdf_path)
+        else:
+            loader = PyPDFLoader(pdf_path)
+            documents = loader.load()
 
         chunks  = self.text_splitter.split_documents(documents)
         return chunks
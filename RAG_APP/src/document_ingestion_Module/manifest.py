@@ -0,0 +1,128 @@
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+import hashlib
+import json
+import os
+
+from langchain_core.documents import Document
+
+
+def file_sha256(path) -> str:
+    """Content hash of a file, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def assign_chunk_ids(source: str, chunks: List[Document]) -> List[str]:
+    """
+    Gives every chunk a stable id derived from its source and content.
+
+    The same text in the same source always gets the same id, so unchanged
+    chunks keep their vectors across re-ingestion. Repeated text within a
+    source is told apart by its occurrence number. The id is also stored in
+    the chunk metadata under "chunk_id".
+    """
+    seen = Counter()
+    ids = []
+    for chunk in chunks:
+        occurrence = seen[chunk.page_content]
+        seen[chunk.page_content] += 1
+        digest = hashlib.sha256(
+            f"{source}\0{occurrence}\0{chunk.page_content}".encode("utf-8")
+        ).hexdigest()[:32]
+        chunk.metadata["chunk_id"] = digest
+        ids.append(digest)
+    return ids
+
+
+class IngestionManifest:
+    """
+    Tracks, per ingested file, its content hash and the ids of its chunks.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.files: Dict[str, dict] = {}
+        if self.path.exists():
+            self.files = json.loads(self.path.read_text(encoding="utf-8")).get("files", {})
+
+    def is_unchanged(self, source: str, file_hash: str) -> bool:
+        entry = self.files.get(source)
+        return entry is not None and entry["sha256"] == file_hash
+
+    def chunk_ids(self, source: str) -> List[str]:
+        return list(self.files.get(source, {}).get("chunks", []))
+
+    def record(self, source: str, file_hash: str, chunk_ids: List[str]):
+        self.files[source] = {"sha256": file_hash, "chunks": list(chunk_ids)}
+
+    def remove(self, source: str):
+        self.files.pop(source, None)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"files": self.files}), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+class IncrementalIngestor:
+    """
+    Re-ingests PDFs doing only the work that changed.
+
+    Unchanged files are skipped before parsing. For changed files only
+    chunks with new ids are embedded and upserted, and vectors of chunks
+    that disappeared are deleted.
+    """
+
+    def __init__(self, ingestion, vector_db, manifest: IngestionManifest):
+        self.ingestion = ingestion
+        self.vector_db = vector_db
+        self.manifest = manifest
+
+    def ingest(self, pdf_path) -> dict:
+        """
+        Brings the vector store in line with the current content of a PDF.
+
+        Args:
+            pdf_path: Path to the PDF file.
+
+        Returns:
+            dict: Number of chunks added, deleted and left unchanged.
+        """
+        source = Path(pdf_path).name
+        file_hash = file_sha256(pdf_path)
+        if self.manifest.is_unchanged(source, file_hash):
+            old_ids = self.manifest.chunk_ids(source)
+            lexical_index = getattr(self.vector_db, "lexical_index", None)
+            if lexical_index is not None and any(chunk_id not in lexical_index for chunk_id in old_ids):
+                # Vectors are current, only the keyword index is missing this file
+                chunks = self.ingestion.extract_text_from_pdf(str(pdf_path))
+                self.vector_db.index_lexical(chunks, assign_chunk_ids(source, chunks))
+            return {"added": 0, "deleted": 0, "unchanged": len(old_ids)}
+
+        chunks = self.ingestion.extract_text_from_pdf(str(pdf_path))
+        ids = assign_chunk_ids(source, chunks)
+        old_ids = set(self.manifest.chunk_ids(source))
+
+        new_chunks = [(chunk, chunk_id) for chunk, chunk_id in zip(chunks, ids) if chunk_id not in old_ids]
+        stale_ids = sorted(old_ids - set(ids))
+
+        if new_chunks:
+            self.vector_db.upsert_documents(
+                [chunk for chunk, _ in new_chunks],
+                ids=[chunk_id for _, chunk_id in new_chunks]
+            )
+        self.vector_db.delete(stale_ids)
+
+        self.manifest.record(source, file_hash, ids)
+        self.manifest.save()
+        return {
+            "added": len(new_chunks),
+            "deleted": len(stale_ids),
+            "unchanged": len(ids) - len(new_chunks)
+        }
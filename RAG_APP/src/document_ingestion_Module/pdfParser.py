@@ -0,0 +1,144 @@
+# knowledge Assistant/src/document_ingestion/pdf_parser.py streams pages instead of returning
+# lists, but shares the page Documents' metadata and the {"pages": [...]} cache file; keep those in step.
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+import json
+import os
+
+from pypdf import PdfReader
+from langchain_core.documents import Document
+
+from .manifest import file_sha256
+
+
+def _extract_pages(pdf_path: str, start: int, end: int) -> List[str]:
+    """Worker: extract the text of pages [start, end) of a PDF."""
+    reader = PdfReader(pdf_path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def _capture(func, *args):
+    """Call func, returning its exception instead of raising it."""
+    try:
+        return func(*args)
+    except Exception as e:
+        return e
+
+
+class ParallelPDFParser:
+    """
+    Extracts PDF text page by page across a process pool.
+
+    Each file is split into page ranges that are parsed in parallel and
+    merged back in page order, producing the same Documents (one per page,
+    with "source" and "page" metadata) as PyPDFLoader. Extracted page text
+    is cached on disk by file hash, so unchanged PDFs are never re-parsed.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, pages_per_task: int = 8, cache_dir=None):
+        """ Initialize the parser
+
+        Args:
+            max_workers (int, optional): Worker processes; defaults to the CPU count.
+            pages_per_task (int): Pages handed to a worker at a time.
+            cache_dir (optional): Directory of the page-text cache; disabled when None.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pages_per_task = pages_per_task
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+
+    def parse(self, pdf_path) -> List[Document]:
+        """Parse a single PDF into one Document per page."""
+        return self.parse_many([pdf_path])[0]
+
+    def parse_many(self, pdf_paths, return_exceptions: bool = False) -> list:
+        """
+        Parse several PDFs, sharing one worker pool across all of their pages.
+
+        Args:
+            pdf_paths: Paths of the PDF files.
+            return_exceptions (bool): Put a file's exception in its result slot
+                instead of raising it.
+
+        Returns:
+            list: Per input path, its page Documents (or the exception raised).
+        """
+        pdf_paths = [str(path) for path in pdf_paths]
+        results = [None] * len(pdf_paths)
+        pending = {}
+
+        for i, pdf_path in enumerate(pdf_paths):
+            try:
+                file_hash = file_sha256(pdf_path)
+                pages = self._read_cache(file_hash)
+                if pages is None:
+                    pending[i] = (file_hash, len(PdfReader(pdf_path).pages))
+                else:
+                    results[i] = self._to_documents(pdf_path, pages)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results[i] = e
+
+        tasks = [
+            (i, start, min(start + self.pages_per_task, total))
+            for i, (_, total) in pending.items()
+            for start in range(0, total, self.pages_per_task)
+        ]
+        if len(tasks) > 1 and self.max_workers > 1:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(tasks))) as pool:
+                futures = [
+                    (i, pool.submit(_extract_pages, pdf_paths[i], start, end))
+                    for i, start, end in tasks
+                ]
+                parts = [(i, _capture(future.result)) for i, future in futures]
+        else:
+            parts = [
+                (i, _capture(_extract_pages, pdf_paths[i], start, end))
+                for i, start, end in tasks
+            ]
+
+        # Tasks were created in page order, so concatenating the parts keeps it
+        parts_by_file = {i: [] for i in pending}
+        for i, part in parts:
+            parts_by_file[i].append(part)
+
+        for i, file_parts in parts_by_file.items():
+            error = next((part for part in file_parts if isinstance(part, Exception)), None)
+            if error is not None:
+                if not return_exceptions:
+                    raise error
+                results[i] = error
+                continue
+            pages = [text for part in file_parts for text in part]
+            self._write_cache(pending[i][0], pages)
+            results[i] = self._to_documents(pdf_paths[i], pages)
+        return results
+
+    @staticmethod
+    def _to_documents(pdf_path: str, pages: List[str]) -> List[Document]:
+        return [
+            Document(
+                page_content=text,
+                metadata={"source": pdf_path, "page": page, "total_pages": len(pages)}
+            )
+            for page, text in enumerate(pages)
+        ]
+
+    def _read_cache(self, file_hash: str) -> Optional[List[str]]:
+        if self.cache_dir is None:
+            return None
+        path = self.cache_dir / f"{file_hash}.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))["pages"]
+
+    def _write_cache(self, file_hash: str, pages: List[str]):
+        if self.cache_dir is None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_dir / f"{file_hash}.tmp"
+        tmp_path.write_text(json.dumps({"pages": pages}), encoding="utf-8")
+        os.replace(tmp_path, self.cache_dir / f"{file_hash}.json")
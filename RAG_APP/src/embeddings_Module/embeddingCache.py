@@ -0,0 +1,237 @@
+# Same cache as knowledge Assistant/src/vectorstore/embedding_cache.py, which also has the
+# LangChain CachedEmbeddings wrapper. Both read and write one directory format: change them together.
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Tuple
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+
+import numpy as np
+
+
+_WHITESPACE = re.compile(r"\s+")
+_INDEX_DTYPE = np.dtype([("key", "V16"), ("slot", "<i4")])
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock_file(f):
+        f.seek(0)
+        # Retries for about ten seconds before raising OSError
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class EmbeddingCache:
+    """
+    On-disk, content-addressed embedding cache.
+
+    Vectors live in a memory-mapped float32 file (one row per slot) and the
+    key index is one small array of (16-byte key, slot) records in
+    least-recently-used order. The on-disk format is shared with the
+    knowledge Assistant app, so both apps can point at the same directory.
+
+    Several processes may use one directory at once: every lookup, store and
+    clear holds an exclusive lock on the directory's lock file and first
+    re-reads the index if another process wrote it since (tracked by a
+    generation number in meta.json). Recency from lookups is persisted with
+    the next store, so eviction order across processes is approximate.
+    """
+
+    def __init__(self, cache_dir, model_name: str, dimension: int, max_entries: int = 200_000):
+        """ Initialize the embedding cache
+
+        Args:
+            cache_dir: Root cache directory; each model gets its own sub-directory.
+            model_name (str): Embedding model the cached vectors belong to.
+            dimension (int): Embedding dimension of the model.
+            max_entries (int): Maximum number of cached vectors before LRU eviction.
+        """
+        self.model_name = model_name
+        self.dimension = dimension
+        self.max_entries = max_entries
+        self.directory = Path(cache_dir) / re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._vectors_path = self.directory / "vectors.f32"
+        self._index_path = self.directory / "index.npy"
+        self._meta_path = self.directory / "meta.json"
+        self._lock_path = self.directory / "lock"
+
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[bytes, int]" = OrderedDict()
+        self._free_slots: List[int] = []
+        self._next_slot = 0
+        self._rows = 0
+        self._vectors = None
+        self._generation = None
+        with self._locked():
+            pass
+
+    def key(self, text: str) -> bytes:
+        """Content key for a chunk: hash of the model name and the normalized text."""
+        normalized = _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.model_name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(normalized.encode("utf-8"))
+        return digest.digest()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def lookup(self, texts: List[str]) -> Tuple[np.ndarray, List[int]]:
+        """
+        Fetch cached vectors for the given texts.
+
+        Returns:
+            Tuple[np.ndarray, List[int]]: A (len(texts), dimension) matrix with
+            cached rows filled in, and the positions of texts that missed.
+        """
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        missing = []
+        keys = [self.key(text) for text in texts]
+        with self._locked():
+            for i, key in enumerate(keys):
+                slot = self._index.get(key)
+                if slot is None:
+                    missing.append(i)
+                    continue
+                self._index.move_to_end(key)
+                matrix[i] = self._vectors[slot]
+        return matrix, missing
+
+    def store(self, texts: List[str], vectors: np.ndarray):
+        """Insert vectors for the given texts, evicting least-recently-used entries when full."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        keys = [self.key(text) for text in texts]
+        with self._locked():
+            for key, vector in zip(keys, vectors):
+                slot = self._index.get(key)
+                if slot is None:
+                    slot = self._allocate_slot()
+                    self._index[key] = slot
+                else:
+                    self._index.move_to_end(key)
+                self._vectors[slot] = vector
+            self._flush()
+
+    def clear(self):
+        """Drop every cached vector."""
+        with self._locked():
+            self._index.clear()
+            self._free_slots = []
+            self._next_slot = 0
+            self._flush()
+
+    @contextmanager
+    def _locked(self):
+        """Hold the thread lock and the inter-process file lock, with the index up to date."""
+        with self._lock, open(self._lock_path, "a+b") as lock_file:
+            _lock_file(lock_file)
+            try:
+                self._refresh()
+                yield
+            finally:
+                _unlock_file(lock_file)
+
+    def _allocate_slot(self) -> int:
+        if self._free_slots:
+            return self._free_slots.pop()
+        if len(self._index) >= self.max_entries:
+            _, slot = self._index.popitem(last=False)
+            return slot
+        if self._next_slot >= self._rows:
+            self._grow(min(self.max_entries, max(1024, self._rows * 2)))
+        slot = self._next_slot
+        self._next_slot += 1
+        return slot
+
+    def _grow(self, rows: int):
+        """Extend the backing file to hold at least `rows` vectors and re-map it."""
+        size = rows * self.dimension * 4
+        with open(self._vectors_path, "ab") as f:
+            # Never shrink: another process may already have grown the file further
+            if f.tell() < size:
+                f.truncate(size)
+        self._map(rows)
+
+    def _map(self, rows: int):
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        self._rows = rows
+        self._vectors = np.memmap(
+            self._vectors_path, dtype=np.float32, mode="r+", shape=(rows, self.dimension)
+        )
+
+    def _refresh(self):
+        """Re-read the index if it changed on disk since this instance last read or wrote it."""
+        meta = json.loads(self._meta_path.read_text()) if self._meta_path.exists() else None
+        if meta is not None and (meta.get("dimension") != self.dimension or meta.get("model_name") != self.model_name):
+            raise ValueError(
+                f"Embedding cache at {self.directory} was built for "
+                f"{meta.get('model_name')} ({meta.get('dimension')} dims)"
+            )
+        generation = meta.get("generation", 0) if meta is not None else 0
+        if self._vectors is not None and generation == self._generation:
+            return
+
+        rows = self._vectors_path.stat().st_size // (self.dimension * 4) if self._vectors_path.exists() else 0
+        records = np.load(self._index_path) if self._index_path.exists() and rows else None
+        if records is None:
+            self._index = OrderedDict()
+            self._next_slot = 0
+            self._free_slots = []
+            self._grow(max(rows, 1024))
+        else:
+            if rows != self._rows or self._vectors is None:
+                self._map(rows)
+            self._index = OrderedDict(
+                (key.tobytes(), int(slot)) for key, slot in zip(records["key"], records["slot"]) if slot < rows
+            )
+            used = set(self._index.values())
+            self._next_slot = max(used) + 1 if used else 0
+            self._free_slots = [slot for slot in range(self._next_slot) if slot not in used]
+        self._generation = generation
+        if meta is None:
+            self._write_meta()
+
+    def _flush(self):
+        """Persist the vectors and the LRU-ordered key index, then publish a new generation."""
+        self._vectors.flush()
+        records = np.empty(len(self._index), dtype=_INDEX_DTYPE)
+        records["key"] = np.frombuffer(b"".join(self._index.keys()), dtype="V16")
+        records["slot"] = np.fromiter(self._index.values(), dtype=np.int32, count=len(self._index))
+        temporary = self._index_path.with_suffix(".tmp")
+        with open(temporary, "wb") as f:
+            np.save(f, records)
+        os.replace(temporary, self._index_path)
+        self._generation = (self._generation or 0) + 1
+        self._write_meta()
+
+    def _write_meta(self):
+        temporary = self._meta_path.with_suffix(".tmp")
+        temporary.write_text(json.dumps({
+            "model_name": self.model_name,
+            "dimension": self.dimension,
+            "generation": self._generation or 0,
+        }))
+        os.replace(temporary, self._meta_path)
@@ -1,5 +1,8 @@
-from sentence_transformers import SentenceTransformer
-from typing import List
+from typing import List, Optional
+import numpy as np
+
+from .embeddingCache import EmbeddingCache
+from .runtime import load_model, model_id
 
 
 
@@ -7,24 +10,111 @@ from typing import List
 class Embeddings:
     """ Handles text embeddings using sentence-transformers. """
 
-    def __init__ (self , model_name :str = "sentence-transformers/all-MiniLM-L6-v2") :
+    def __init__ (self , model_name :str = "sentence-transformers/all-MiniLM-L6-v2",
+                  batch_size: int = 64,
+                  num_workers: int = 0,
+                  multiprocess_threshold: int = 2048,
+                  cache_dir: Optional[str] = None,
+                  cache_max_entries: int = 200_000,
+                  backend: str = "torch",
+                  quantize: bool = False,
+                  num_threads: Optional[int] = None) :
         """ Initialize the embeddings module
-        
+
         Args:
             model_name (str): Name of the embedding model to use.
+            batch_size (int): Number of texts encoded per forward pass.
+            num_workers (int): CPU worker processes for large ingests (0 or 1 disables the pool).
+            multiprocess_threshold (int): Minimum number of texts before the process pool is used.
+            cache_dir (str, optional): Directory of the persistent embedding cache; disabled when None.
+            cache_max_entries (int): Maximum number of vectors kept in the cache.
+            backend (str): "torch", or "onnx" to run the exported ONNX model with ONNX Runtime.
+            quantize (bool): Use the int8 dynamically quantized ONNX model (onnx backend only).
+            num_threads (int, optional): Intra-op CPU threads; library default when None.
         """
-        self.model = SentenceTransformer(model_name)
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.num_workers = num_workers
+        self.multiprocess_threshold = multiprocess_threshold
+        self.model = load_model(model_name, backend, quantize, num_threads)
+        self.dimension = self.model.get_sentence_embedding_dimension()
+        self._pool = None
+        self.cache = None
+        if cache_dir is not None:
+            self.cache = EmbeddingCache(
+                cache_dir,
+                # Quantized vectors are cached apart from the float32 ones
+                model_name=model_id(model_name, backend, quantize),
+                dimension=self.dimension,
+                max_entries=cache_max_entries
+            )
 
 
     def embed_text(self , text : str ):
 
         embedding = self.model.encode(text)
         return embedding.tolist()
-    
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        """Embed search docs."""
-        return [self.embed_text(text) for text in texts]
-    
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        """Embed search docs.
+
+        Texts already in the embedding cache are served from disk; the rest
+        are encoded longest-first so every batch holds similarly sized inputs,
+        then scattered back to input order.
+
+        Returns:
+            np.ndarray: Contiguous float32 matrix of shape (len(texts), dimension).
+        """
+        if self.cache is None:
+            return self._encode(texts)
+
+        matrix, missing = self.cache.lookup(texts)
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            vectors = self._encode(missing_texts)
+            self.cache.store(missing_texts, vectors)
+            matrix[missing] = vectors
+        return matrix
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Run the model over texts in length-sorted batches."""
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        sorted_texts = [texts[i] for i in order]
+
+        if self.num_workers > 1 and len(texts) >= self.multiprocess_threshold:
+            vectors = self.model.encode_multi_process(
+                sorted_texts,
+                self._get_pool(),
+                batch_size=self.batch_size
+            )
+        else:
+            vectors = self.model.encode(
+                sorted_texts,
+                batch_size=self.batch_size,
+                convert_to_numpy=True
+            )
+
+        matrix = np.empty((len(texts), self.dimension), dtype=np.float32)
+        matrix[order] = vectors
+        return matrix
+
     def embed_query(self, text: str) -> List[float]:
         """Embed query text."""
-        return self.embed_text(text)
\ No newline at end of file
+        return self.embed_text(text)
+
+    def close(self):
+        """Stop the worker pool if one was started."""
+        if self._pool is not None:
+            self.model.stop_multi_process_pool(self._pool)
+            self._pool = None
+
+    def _get_pool(self):
+        """Start the CPU worker pool on first use and reuse it afterwards."""
+        if self._pool is None:
+            self._pool = self.model.start_multi_process_pool(
+                target_devices=["cpu"] * self.num_workers
+            )
+        return self._pool
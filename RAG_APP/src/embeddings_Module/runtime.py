@@ -0,0 +1,181 @@
+# Identical to knowledge Assistant/src/vectorstore/runtime.py; change both copies together.
+
+from pathlib import Path
+from typing import List, Optional
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import time
+
+import numpy as np
+
+
+BACKENDS = ("torch", "onnx")
+
+# Dynamic int8 quantization presets of sentence-transformers and the files they produce
+_QUANTIZED_FILES = {
+    "arm64": "onnx/model_qint8_arm64.onnx",
+    "avx512_vnni": "onnx/model_qint8_avx512_vnni.onnx",
+    "avx512": "onnx/model_qint8_avx512.onnx",
+    "avx2": "onnx/model_quint8_avx2.onnx",
+}
+
+
+def quantization_preset() -> str:
+    """Best int8 kernel set for this CPU."""
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "arm64"
+    flags = ""
+    if Path("/proc/cpuinfo").exists():
+        flags = Path("/proc/cpuinfo").read_text(errors="ignore")
+    if "avx512_vnni" in flags:
+        return "avx512_vnni"
+    if "avx512f" in flags:
+        return "avx512"
+    return "avx2"
+
+
+def model_id(model_name: str, backend: str = "torch", quantize: bool = False) -> str:
+    """
+    Identity of the vectors a configuration produces, e.g. for cache keys.
+    Float32 ONNX matches PyTorch; quantized vectors differ slightly and are
+    kept apart.
+    """
+    return f"{model_name}@onnx-int8" if backend == "onnx" and quantize else model_name
+
+
+def model_kwargs(backend: str = "torch", quantize: bool = False, num_threads: Optional[int] = None,
+                 file_name: Optional[str] = None) -> dict:
+    """Keyword arguments for SentenceTransformer selecting the runtime."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unsupported embedding backend: {backend}")
+    if backend == "torch":
+        return {}
+
+    import onnxruntime
+
+    session_options = onnxruntime.SessionOptions()
+    if num_threads:
+        session_options.intra_op_num_threads = num_threads
+        session_options.inter_op_num_threads = 1
+    kwargs = {"provider": "CPUExecutionProvider", "session_options": session_options}
+    if quantize:
+        kwargs["file_name"] = file_name or _QUANTIZED_FILES[quantization_preset()]
+    return {"backend": "onnx", "model_kwargs": kwargs}
+
+
+def load_model(model_name: str, backend: str = "torch", quantize: bool = False,
+               num_threads: Optional[int] = None, export_dir=None):
+    """
+    Load a SentenceTransformer on the chosen CPU runtime.
+
+    PyTorch threads are set process-wide; ONNX Runtime threads per session.
+    When the model repository has no int8 file for this CPU, the float32
+    ONNX model is quantized once into `export_dir` and loaded from there.
+
+    Args:
+        model_name (str): Hugging Face model id or local path.
+        backend (str): "torch" or "onnx".
+        quantize (bool): Use the int8 dynamically quantized ONNX model.
+        num_threads (int, optional): Intra-op threads; library default when None.
+        export_dir (optional): Where exported quantized models are kept.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        if num_threads:
+            import torch
+            torch.set_num_threads(num_threads)
+        return SentenceTransformer(model_name)
+
+    try:
+        return SentenceTransformer(model_name, **model_kwargs(backend, quantize, num_threads))
+    except Exception:
+        if not quantize:
+            raise
+
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    preset = quantization_preset()
+    export_dir = Path(export_dir or Path.home() / ".cache" / "gen_ai_handson" / "onnx")
+    local_dir = export_dir / re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+    file_name = _QUANTIZED_FILES[preset]
+    if not (local_dir / file_name).exists():
+        base = SentenceTransformer(model_name, **model_kwargs(backend, False, num_threads))
+        base.save(str(local_dir))
+        export_dynamic_quantized_onnx_model(base, preset, str(local_dir))
+    return SentenceTransformer(str(local_dir), **model_kwargs(backend, True, num_threads, file_name))
+
+
+def compare(reference, candidate, texts: List[str], batch_size: int = 64) -> dict:
+    """Cosine similarity and largest component difference between two models' embeddings."""
+    expected = reference.encode(texts, batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True)
+    actual = candidate.encode(texts, batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True)
+    cosine = np.sum(expected * actual, axis=1)
+    return {
+        "min_cosine": float(cosine.min()),
+        "mean_cosine": float(cosine.mean()),
+        "max_abs_diff": float(np.abs(expected - actual).max()),
+    }
+
+
+def _timings(model, texts: List[str], queries: List[str], batch_size: int) -> dict:
+    model.encode(texts[:batch_size], batch_size=batch_size)
+    start = time.perf_counter()
+    model.encode(texts, batch_size=batch_size)
+    ingest_seconds = time.perf_counter() - start
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        model.encode(query)
+        latencies.append(time.perf_counter() - start)
+    return {
+        "texts_per_second": round(len(texts) / ingest_seconds, 1),
+        "query_p50_ms": round(1000 * float(np.percentile(latencies, 50)), 2),
+        "query_p95_ms": round(1000 * float(np.percentile(latencies, 95)), 2),
+    }
+
+
+def _pdf_texts(pdf_path, chunk_size: int = 1000) -> List[str]:
+    from pypdf import PdfReader
+
+    text = "\n".join(page.extract_text() or "" for page in PdfReader(pdf_path).pages)
+    return [text[i:i + chunk_size] for i in range(0, len(text), chunk_size) if text[i:i + chunk_size].strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare an embedding runtime against PyTorch.")
+    parser.add_argument("pdf", help="PDF whose text is embedded")
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--backend", default="onnx", choices=BACKENDS)
+    parser.add_argument("--quantize", action="store_true", help="Use the int8 ONNX model")
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--min-cosine", type=float, help="Default 0.9999, or 0.98 with --quantize")
+    args = parser.parse_args()
+
+    texts = _pdf_texts(args.pdf)
+    queries = [text[:120] for text in texts[:50]]
+    reference = load_model(args.model, "torch", num_threads=args.threads)
+    candidate = load_model(args.model, args.backend, args.quantize, args.threads)
+    min_cosine = args.min_cosine or (0.98 if args.quantize else 0.9999)
+
+    result = {
+        "texts": len(texts),
+        "threads": args.threads,
+        "equivalence": compare(reference, candidate, texts),
+        "torch": _timings(reference, texts, queries, args.batch_size),
+        f"{args.backend}-int8" if args.quantize else args.backend: _timings(candidate, texts, queries, args.batch_size),
+    }
+    print(json.dumps(result, indent=2))
+    if result["equivalence"]["min_cosine"] < min_cosine:
+        print(f"min cosine below {min_cosine}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
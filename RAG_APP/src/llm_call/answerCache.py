@@ -0,0 +1,195 @@
+# Same code as knowledge Assistant/src/nodes/answer_cache.py; change both copies together.
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+import hashlib
+import sqlite3
+import threading
+import time
+
+import numpy as np
+from langchain_core.documents import Document
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    key TEXT PRIMARY KEY,
+    context_key TEXT NOT NULL,
+    question TEXT NOT NULL,
+    question_vector BLOB,
+    answer TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS answers_context ON answers (context_key);
+CREATE INDEX IF NOT EXISTS answers_last_used ON answers (last_used);
+CREATE TABLE IF NOT EXISTS answer_chunks (
+    key TEXT NOT NULL REFERENCES answers (key) ON DELETE CASCADE,
+    chunk_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS answer_chunks_chunk ON answer_chunks (chunk_id);
+CREATE INDEX IF NOT EXISTS answer_chunks_key ON answer_chunks (key);
+"""
+
+
+def chunk_ids(context_docs: Iterable[Document]) -> List[str]:
+    """Ids of the context chunks: metadata["chunk_id"], or a hash of the text when absent."""
+    ids = []
+    for doc in context_docs:
+        chunk_id = doc.metadata.get("chunk_id")
+        if chunk_id is None:
+            chunk_id = hashlib.sha256(doc.page_content.encode("utf-8")).hexdigest()[:32]
+        ids.append(str(chunk_id))
+    return ids
+
+
+class AnswerCache:
+    """
+    Persistent (SQLite) cache of generated answers.
+
+    An answer is keyed by the model, the prompt template version, the
+    normalized question and the ids of the retrieved chunks, in order, so it
+    is only reused for exactly the prompt that produced it. With `embed_fn`
+    a second, semantic tier reuses the answer to a differently worded
+    question whose embedding is at least `similarity_threshold` similar,
+    provided it was answered from the same chunks. Entries expire after
+    `ttl_seconds`, the least recently used are evicted beyond `max_entries`,
+    and `invalidate_chunks` drops every answer built on a changed chunk.
+    """
+
+    def __init__(self, path, max_entries: int = 5000, ttl_seconds: float = 7 * 24 * 3600,
+                 embed_fn: Optional[Callable[[str], List[float]]] = None,
+                 similarity_threshold: float = 0.97):
+        """ Initialize the answer cache
+
+        Args:
+            path: SQLite database file.
+            max_entries (int): Answers kept before the least recently used are evicted.
+            ttl_seconds (float): Age after which an answer is no longer served.
+            embed_fn (callable, optional): Question -> embedding; enables the semantic tier.
+            similarity_threshold (float): Minimum cosine similarity for a semantic hit.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+
+        self._embed = None
+        if embed_fn is not None:
+            # get() and the put() that follows a miss embed the same question
+            @lru_cache(maxsize=256)
+            def embed(question: str) -> bytes:
+                vector = np.asarray(embed_fn(question), dtype=np.float32)
+                return (vector / max(float(np.linalg.norm(vector)), 1e-12)).tobytes()
+            self._embed = embed
+
+    def get(self, model: str, prompt_version: str, question: str,
+            context_docs: List[Document]) -> Optional[str]:
+        """Cached answer for this prompt, or for a similar question over the same chunks."""
+        context_key = self._context_key(model, prompt_version, context_docs)
+        key = self._key(context_key, question)
+        now = time.time()
+        oldest = now - self.ttl_seconds
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT answer FROM answers WHERE key = ? AND created >= ?", (key, oldest)
+            ).fetchone()
+            if row is None and self._embed is not None:
+                candidates = self._conn.execute(
+                    "SELECT key, answer, question_vector FROM answers "
+                    "WHERE context_key = ? AND created >= ? AND question_vector IS NOT NULL",
+                    (context_key, oldest)
+                ).fetchall()
+                if candidates:
+                    vectors = np.stack([np.frombuffer(blob, dtype=np.float32) for _, _, blob in candidates])
+                    scores = vectors @ np.frombuffer(self._embed(self._normalize(question)), dtype=np.float32)
+                    best = int(np.argmax(scores))
+                    if scores[best] >= self.similarity_threshold:
+                        key, answer, _ = candidates[best]
+                        row = (answer,)
+            if row is None:
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE answers SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, model: str, prompt_version: str, question: str,
+            context_docs: List[Document], answer: str):
+        """Store the answer generated for this prompt."""
+        context_key = self._context_key(model, prompt_version, context_docs)
+        key = self._key(context_key, question)
+        vector = self._embed(self._normalize(question)) if self._embed is not None else None
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM answers WHERE key = ?", (key,))
+            self._conn.execute(
+                "INSERT INTO answers (key, context_key, question, question_vector, answer, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, context_key, question, vector, answer, now, now)
+            )
+            self._conn.executemany(
+                "INSERT INTO answer_chunks (key, chunk_id) VALUES (?, ?)",
+                [(key, chunk_id) for chunk_id in set(chunk_ids(context_docs))]
+            )
+            self._evict(now)
+
+    def invalidate_chunks(self, ids: Iterable[str]) -> int:
+        """
+        Drop every answer generated from any of the given chunks.
+
+        Returns:
+            int: Number of answers removed.
+        """
+        ids = list(ids)
+        removed = 0
+        with self._lock, self._conn:
+            # Stay below SQLite's limit on bound parameters
+            for start in range(0, len(ids), 500):
+                batch = ids[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                removed += self._conn.execute(
+                    "DELETE FROM answers WHERE key IN "
+                    f"(SELECT key FROM answer_chunks WHERE chunk_id IN ({placeholders}))",
+                    batch
+                ).rowcount
+        return removed
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM answers")
+
+    def close(self):
+        self._conn.close()
+
+    def _evict(self, now: float):
+        self._conn.execute("DELETE FROM answers WHERE created < ?", (now - self.ttl_seconds,))
+        self._conn.execute(
+            "DELETE FROM answers WHERE key IN "
+            "(SELECT key FROM answers ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    @staticmethod
+    def _context_key(model: str, prompt_version: str, context_docs: List[Document]) -> str:
+        parts = [model, prompt_version, *chunk_ids(context_docs)]
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _key(cls, context_key: str, question: str) -> str:
+        return hashlib.sha256(f"{context_key}\0{cls._normalize(question)}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _normalize(question: str) -> str:
+        return " ".join(question.lower().split())
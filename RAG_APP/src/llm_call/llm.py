@@ -1,18 +1,79 @@
 from langchain_groq import ChatGroq
-from typing import List
+from typing import AsyncIterator, Iterator, List
+import os
+import time
 from langchain_core.documents import Document
 
+from telemetry_Module.tracing import telemetry
+
+
+# Part of the answer cache key; bump whenever the prompt below changes
+PROMPT_TEMPLATE_VERSION = "2"
+
 
 class LLMMOdel:
 
 
-    def __init__ (self , api_key : str , model_name : str = "llama-3.1-8b-instant") :
+    def __init__ (self , api_key : str , model_name : str = "llama-3.1-8b-instant" , cache = None ,
+                  http_client = None , http_async_client = None , packer = None , chat_model = None ,
+                  health_check_timeout : float = 2.0) :
+
+        """ Initialize the LLM module
 
-        self.llm = ChatGroq (
+        Args:
+            api_key (str): Groq API key.
+            model_name (str): Groq model name.
+            cache (AnswerCache, optional): Answers are served from and stored in it.
+            http_client (httpx.Client, optional): Pooled keep-alive client for sync calls.
+            http_async_client (httpx.AsyncClient, optional): Pooled keep-alive client for async calls.
+            packer (ContextPacker, optional): Merges, dedupes and budgets the context before prompting.
+            chat_model (optional): LangChain chat model used instead of ChatGroq, e.g. a fake one for benchmarks.
+            health_check_timeout (float): Seconds the health probe may take.
+        """
+        self.api_key = api_key
+        self.model_name = model_name
+        self.health_check_timeout = health_check_timeout
+        self.cache = cache
+        self.http_client = http_client
+        self.http_async_client = http_async_client
+        self.packer = packer
+        self.llm = chat_model if chat_model is not None else ChatGroq (
             api_key=api_key,
             model_name=model_name,
-            temperature=0.7
+            temperature=0.7,
+            http_client=http_client,
+            http_async_client=http_async_client
+        )
+
+
+    def is_healthy(self) -> bool:
+
+        """
+        Whether the pooled HTTP client still reaches the API: a short GET of
+        this model's entry in the Groq models list. A rate-limited reply
+        counts as healthy; a transport error raises and marks the client for
+        rebuilding.
+        """
+
+        if self.http_client is None:
+            return True
+        if self.http_client.is_closed:
+            return False
+        base_url = getattr(self.llm, "groq_api_base", None) or os.getenv("GROQ_BASE_URL") or "https://api.groq.com"
+        response = self.http_client.get(
+            f"{base_url.rstrip('/')}/openai/v1/models/{self.model_name}",
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=self.health_check_timeout
         )
+        return response.is_success or response.status_code == 429
+
+
+    def close(self):
+
+        """ Close the pooled HTTP clients. """
+
+        if self.http_client is not None:
+            self.http_client.close()
         
 
 
@@ -25,10 +86,126 @@ class LLMMOdel:
             prompt (str): The input prompt for the LLM.
             """
         
-        context = "\n\n".join([doc.page_content for doc in context_docs])
+        with telemetry.span("llm.generate_answer", model=self.model_name, documents=len(context_docs)):
+            answer = self._cached_answer(query, context_docs)
+            if answer is not None:
+                return answer
+
+            prompt = self._build_prompt(query, context_docs)
+            # Generate response
+            with telemetry.span("llm.invoke", model=self.model_name):
+                response = self.llm.invoke(prompt)
+            self._record_usage(getattr(response, "usage_metadata", None))
+            if self.cache is not None:
+                with telemetry.span("llm.answer_cache_put"):
+                    self.cache.put(self.model_name, PROMPT_TEMPLATE_VERSION, query, context_docs, response.content)
+            return response.content
+
+
+    def stream_answer(self, query: str, context_docs: List[Document]) -> Iterator[str]:
+
+        """
+        Yields the answer piece by piece as the LLM generates it.
+
+        A cached answer is yielded whole. A streamed answer is cached once
+        it has been fully consumed.
+
+        Args:
+            query (str): The user question.
+            context_docs (List[Document]): Retrieved context.
+            """
+
+        with telemetry.span("llm.stream_answer", model=self.model_name, documents=len(context_docs)):
+            answer = self._cached_answer(query, context_docs)
+            if answer is not None:
+                yield answer
+                return
+
+            prompt = self._build_prompt(query, context_docs)
+            parts = []
+            usage = None
+            start = time.perf_counter()
+            with telemetry.span("llm.invoke", model=self.model_name, stream=True):
+                for chunk in self.llm.stream(prompt):
+                    # Groq reports token usage on the final chunk
+                    usage = getattr(chunk, "usage_metadata", None) or usage
+                    if chunk.content:
+                        if not parts:
+                            telemetry.observe("llm_first_token_seconds", time.perf_counter() - start, model=self.model_name)
+                        parts.append(chunk.content)
+                        yield chunk.content
+            telemetry.observe("llm_stream_seconds", time.perf_counter() - start, model=self.model_name)
+            self._record_usage(usage)
+            if self.cache is not None:
+                with telemetry.span("llm.answer_cache_put"):
+                    self.cache.put(self.model_name, PROMPT_TEMPLATE_VERSION, query, context_docs, "".join(parts))
+
+
+    async def astream_answer(self, query: str, context_docs: List[Document]) -> AsyncIterator[str]:
+
+        """
+        Async counterpart of `stream_answer`.
+
+        Args:
+            query (str): The user question.
+            context_docs (List[Document]): Retrieved context.
+            """
+
+        with telemetry.span("llm.stream_answer", model=self.model_name, documents=len(context_docs)):
+            answer = self._cached_answer(query, context_docs)
+            if answer is not None:
+                yield answer
+                return
+
+            prompt = self._build_prompt(query, context_docs)
+            parts = []
+            usage = None
+            start = time.perf_counter()
+            with telemetry.span("llm.invoke", model=self.model_name, stream=True):
+                async for chunk in self.llm.astream(prompt):
+                    usage = getattr(chunk, "usage_metadata", None) or usage
+                    if chunk.content:
+                        if not parts:
+                            telemetry.observe("llm_first_token_seconds", time.perf_counter() - start, model=self.model_name)
+                        parts.append(chunk.content)
+                        yield chunk.content
+            telemetry.observe("llm_stream_seconds", time.perf_counter() - start, model=self.model_name)
+            self._record_usage(usage)
+            if self.cache is not None:
+                with telemetry.span("llm.answer_cache_put"):
+                    self.cache.put(self.model_name, PROMPT_TEMPLATE_VERSION, query, context_docs, "".join(parts))
+
+
+    def _cached_answer(self, query: str, context_docs: List[Document]):
+
+        if self.cache is None:
+            return None
+        with telemetry.span("llm.answer_cache_get"):
+            answer = self.cache.get(self.model_name, PROMPT_TEMPLATE_VERSION, query, context_docs)
+        telemetry.count("cache_requests", cache="answer", result="miss" if answer is None else "hit")
+        return answer
+
+
+    def _record_usage(self, usage):
+
+        usage = usage or {}
+        if "input_tokens" in usage:
+            telemetry.observe("llm_prompt_tokens", usage["input_tokens"], model=self.model_name)
+        if "output_tokens" in usage:
+            telemetry.observe("llm_completion_tokens", usage["output_tokens"], model=self.model_name)
+
+
+    def _build_prompt(self, query: str, context_docs: List[Document]) -> str:
+
+        with telemetry.span("llm.build_prompt", documents=len(context_docs)) as span:
+            if self.packer is not None:
+                context_docs = self.packer.pack(context_docs)
+                span.set("packed_documents", len(context_docs))
+            context = "\n\n".join([doc.page_content for doc in context_docs])
+            telemetry.observe("context_characters", len(context))
         
         # Create prompt
-        prompt = f"""Based on the following context, answer the question.
+        return f"""Based on the following context, answer the question.
         
                 Context:
                 {context}
@@ -36,11 +213,3 @@ class LLMMOdel:
                 Question: {query}
 
                 Answer:"""
-        
-        # Generate response
-        response = self.llm.invoke(prompt)
-        return response.content
-
-
-        
-
@@ -0,0 +1,117 @@
+from typing import Callable, Dict, Iterable, Optional
+import threading
+import time
+
+
+class ComponentRegistry:
+    """
+    Process-wide owner of long-lived components (embedding model, vector
+    store handle, LLM client, caches).
+
+    Each component is built once by its factory on first use and then
+    shared by every query and session. A component with a health check is
+    re-checked at most every `health_check_interval` seconds when it is
+    fetched; if the check fails it is closed and rebuilt, together with the
+    components that depend on it.
+    """
+
+    def __init__(self, health_check_interval: float = 60.0):
+        """ Initialize the component registry
+
+        Args:
+            health_check_interval (float): Minimum seconds between health checks of a component.
+        """
+        self.health_check_interval = health_check_interval
+        self._lock = threading.RLock()
+        self._factories: Dict[str, Callable[["ComponentRegistry"], object]] = {}
+        self._health_checks: Dict[str, Callable[[object], bool]] = {}
+        self._dependents: Dict[str, set] = {}
+        self._components: Dict[str, object] = {}
+        self._checked_at: Dict[str, float] = {}
+
+    def register(self, name: str, factory: Callable[["ComponentRegistry"], object],
+                 health_check: Optional[Callable[[object], bool]] = None,
+                 depends_on: Iterable[str] = ()):
+        """
+        Declares how to build a component.
+
+        Args:
+            name (str): Component name.
+            factory (callable): Receives the registry (to fetch dependencies) and returns the component.
+            health_check (callable, optional): Returns False (or raises) when the component must be rebuilt.
+            depends_on (Iterable[str]): Components this one is built from; rebuilding them rebuilds it.
+        """
+        with self._lock:
+            self._factories[name] = factory
+            if health_check is not None:
+                self._health_checks[name] = health_check
+            for dependency in depends_on:
+                self._dependents.setdefault(dependency, set()).add(name)
+
+    def get(self, name: str):
+        """The shared instance of a component, built or rebuilt as needed."""
+        with self._lock:
+            component = self._components.get(name)
+            if component is not None and self._due_for_check(name) and not self._is_healthy(name):
+                self.reset(name)
+                component = None
+            if component is None:
+                component = self._factories[name](self)
+                self._components[name] = component
+                self._checked_at[name] = time.monotonic()
+            return component
+
+    def check(self) -> Dict[str, bool]:
+        """
+        Health-check every built component now, resetting the unhealthy ones
+        so the next `get` reconnects.
+
+        Returns:
+            dict: Health of each checked component.
+        """
+        with self._lock:
+            health = {name: self._is_healthy(name) for name in list(self._components)}
+            for name, healthy in health.items():
+                if not healthy:
+                    self.reset(name)
+            return health
+
+    def reset(self, name: str):
+        """Close and forget a component and everything built from it."""
+        with self._lock:
+            for dependent in self._dependents.get(name, ()):
+                self.reset(dependent)
+            component = self._components.pop(name, None)
+            self._checked_at.pop(name, None)
+            if component is not None:
+                self._close(component)
+
+    def close(self):
+        """Close every built component."""
+        with self._lock:
+            for name in list(self._components):
+                self.reset(name)
+
+    def _due_for_check(self, name: str) -> bool:
+        return (
+            name in self._health_checks
+            and time.monotonic() - self._checked_at.get(name, 0.0) >= self.health_check_interval
+        )
+
+    def _is_healthy(self, name: str) -> bool:
+        self._checked_at[name] = time.monotonic()
+        if name not in self._health_checks or name not in self._components:
+            return True
+        try:
+            return bool(self._health_checks[name](self._components[name]))
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(component):
+        close = getattr(component, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
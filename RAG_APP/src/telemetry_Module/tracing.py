@@ -0,0 +1,233 @@
+# Same module as knowledge Assistant/src/telemetry/tracing.py except for the service name
+# given to Telemetry at the bottom. The apps do not share a package; change both copies together.
+
+from bisect import bisect_left
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+import json
+import os
+import threading
+import time
+import uuid
+
+
+# Upper bounds of histogram buckets: durations (names ending in "_seconds") and sizes / counts
+TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+def _labels(labels: dict) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+class _NullSpan:
+    """Returned while telemetry is disabled: entering, leaving and setting cost next to nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, key: str, value):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """A timed step; nested spans share the trace id of the outermost one."""
+
+    def __init__(self, telemetry: "Telemetry", name: str, attributes: dict):
+        self.telemetry = telemetry
+        self.name = name
+        self.attributes = attributes
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent = None
+        self.trace_id = None
+        self._token = None
+        self._start = 0.0
+
+    def set(self, key: str, value):
+        self.attributes[key] = value
+
+    def __enter__(self):
+        self.parent = _current_span.get()
+        self.trace_id = self.parent.trace_id if self.parent is not None else uuid.uuid4().hex
+        self._token = _current_span.set(self)
+        self._start = time.perf_counter()
+        self.wall_start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        duration = time.perf_counter() - self._start
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # A span held open across a generator's yields may be closed from another context
+            pass
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        self.telemetry._finish(self, duration)
+        return False
+
+
+class Telemetry:
+    """
+    In-process spans, counters and histograms.
+
+    Every finished span is observed in the "span_duration_seconds"
+    histogram and, when a trace path is set, appended to it as one JSON
+    line. Metrics are exposed in the Prometheus text format, optionally
+    over HTTP. While disabled, every call returns immediately.
+    """
+
+    def __init__(self, namespace: str, enabled: bool = False, trace_path=None):
+        """ Initialize the telemetry
+
+        Args:
+            namespace (str): Prefix of every exported metric name.
+            enabled (bool): Record anything at all.
+            trace_path (optional): JSON lines file finished spans are appended to.
+        """
+        self.namespace = namespace
+        self.enabled = enabled
+        self.trace_path = trace_path
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, tuple], float] = {}
+        self._histograms: Dict[Tuple[str, tuple], list] = {}
+        self._trace_file = None
+        self._server = None
+
+    def configure(self, enabled: bool, trace_path=None):
+        with self._lock:
+            if self._trace_file is not None:
+                self._trace_file.close()
+                self._trace_file = None
+            self.enabled = enabled
+            self.trace_path = trace_path
+
+    def span(self, name: str, **attributes):
+        """Context manager timing a step; yields an object whose `set` adds attributes."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, attributes)
+
+    def count(self, name: str, value: float = 1, **labels):
+        """Add to a counter; exported as `<namespace>_<name>_total`."""
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record a value in a histogram; names ending in "_seconds" get time buckets."""
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                bounds = TIME_BUCKETS if name.endswith("_seconds") else SIZE_BUCKETS
+                # [bounds, per-bucket counts (last one is +Inf), sum, count]
+                histogram = self._histograms[key] = [bounds, [0] * (len(bounds) + 1), 0.0, 0]
+            histogram[1][bisect_left(histogram[0], value)] += 1
+            histogram[2] += value
+            histogram[3] += 1
+
+    def prometheus_text(self) -> str:
+        """All counters and histograms in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, (bounds, list(buckets), total, count))
+                                for key, (bounds, buckets, total, count) in self._histograms.items())
+
+        typed = set()
+        for (name, labels), value in counters:
+            metric = f"{self.namespace}_{name}_total"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} counter")
+                typed.add(metric)
+            lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+
+        for (name, labels), (bounds, buckets, total, count) in histograms:
+            metric = f"{self.namespace}_{name}"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} histogram")
+                typed.add(metric)
+            cumulative = 0
+            for bound, bucket in zip(bounds + ("+Inf",), buckets):
+                cumulative += bucket
+                lines.append(f"{metric}_bucket{_format_labels(labels, (('le', str(bound)),))} {cumulative}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {total:g}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, host: str = "0.0.0.0"):
+        """Serve /metrics on a daemon thread; calling it again is a no-op."""
+        if self._server is not None:
+            return self._server
+        telemetry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = telemetry.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True).start()
+        return self._server
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self.configure(False)
+
+    def _finish(self, span: Span, duration: float):
+        self.observe("span_duration_seconds", duration, span=span.name)
+        if self.trace_path is None:
+            return
+        record = json.dumps({
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            "parent_id": span.parent.span_id if span.parent is not None else None,
+            "name": span.name,
+            "start": round(span.wall_start, 6),
+            "duration_ms": round(1000 * duration, 3),
+            "attributes": span.attributes,
+        }, default=str)
+        with self._lock:
+            if self._trace_file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.trace_path)), exist_ok=True)
+                self._trace_file = open(self.trace_path, "a", encoding="utf-8", buffering=1)
+            self._trace_file.write(record + "\n")
+
+
+# Shared by every module of the app; disabled until configured
+telemetry = Telemetry("rag_app")
@@ -0,0 +1,457 @@
+from pathlib import Path
+from typing import List, Optional, Tuple
+import io
+import json
+import os
+import uuid
+
+import numpy as np
+from langchain_core.documents import Document
+
+from .quantization import QuantizedCodes, rescored_search
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length so inner product equals cosine similarity."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k highest scores, best first."""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    top = np.argpartition(-scores, k)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def _npy_header(path: Path) -> Tuple[tuple, int]:
+    """Shape recorded in a .npy file and the offset its data starts at."""
+    with open(path, "rb") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, _, _ = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, _, _ = np.lib.format.read_array_header_2_0(f)
+        return shape, f.tell()
+
+
+def _append_npy(path: Path, rows: np.ndarray) -> bool:
+    """
+    Append float32 rows to a 2-D .npy file in place: the rows are written
+    after the existing data, then the header is rewritten with the new shape.
+    np.save pads the header so the row count can grow without moving the
+    data; returns False, leaving the file unchanged, if it would not fit.
+    """
+    shape, offset = _npy_header(path)
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(header, {
+        "descr": np.lib.format.dtype_to_descr(np.dtype("<f4")),
+        "fortran_order": False,
+        "shape": (shape[0] + len(rows), shape[1]),
+    })
+    if header.tell() != offset:
+        return False
+    with open(path, "r+b") as f:
+        f.seek(offset + shape[0] * shape[1] * 4)
+        f.write(np.ascontiguousarray(rows, dtype="<f4").tobytes())
+        f.seek(0)
+        f.write(header.getvalue())
+    return True
+
+
+def _write_npy(path: Path, parts: List[Tuple[np.ndarray, Optional[np.ndarray]]], dimension: int,
+               block: int = 65536):
+    """
+    Write the concatenation of (vectors, rows) parts to a new .npy file, block
+    by block, so memory-mapped sources are never loaded whole. `rows` selects
+    rows of its part; None takes all of them.
+    """
+    count = sum(len(vectors) if rows is None else len(rows) for vectors, rows in parts)
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(count, dimension))
+    position = 0
+    for vectors, rows in parts:
+        total = len(vectors) if rows is None else len(rows)
+        for i in range(0, total, block):
+            chunk = vectors[i:i + block] if rows is None else vectors[rows[i:i + block]]
+            out[position:position + len(chunk)] = chunk
+            position += len(chunk)
+    out.flush()
+    del out
+
+
+class FlatIndex:
+    """
+    Exact inner-product index: every query is scored against every vector.
+    """
+
+    kind = "flat"
+
+    def fit(self, vectors: np.ndarray):
+        pass
+
+    def add(self, vectors: np.ndarray, start: int):
+        pass
+
+    def refresh(self, vectors: np.ndarray):
+        pass
+
+    def candidates(self, query: np.ndarray) -> Optional[np.ndarray]:
+        """Rows to score for the query; None means all rows."""
+        return None
+
+    def save(self, directory: Path):
+        pass
+
+    def load(self, directory: Path):
+        pass
+
+
+class IVFIndex:
+    """
+    Inverted-file index for larger corpora.
+
+    Vectors are clustered with spherical k-means; a query is only scored
+    against the `nprobe` clusters whose centroids are closest to it. Below
+    `min_train_size` vectors the index behaves like a flat index.
+    """
+
+    kind = "ivf"
+
+    def __init__(self, nlist: Optional[int] = None, nprobe: int = 8, min_train_size: int = 4096):
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.centroids = None
+        self.assignments = np.empty(0, dtype=np.int32)
+        self.lists: List[np.ndarray] = []
+
+    def fit(self, vectors: np.ndarray):
+        """Train centroids (when there is enough data) and assign every vector."""
+        if len(vectors) < self.min_train_size:
+            self.centroids = None
+            self.assignments = np.empty(0, dtype=np.int32)
+            self.lists = []
+            return
+        nlist = self.nlist or max(1, int(np.sqrt(len(vectors))))
+        self.centroids = self._kmeans(vectors, nlist)
+        self._assign_all(vectors)
+
+    def add(self, vectors: np.ndarray, start: int):
+        """Assign rows vectors[start:] to their nearest cluster."""
+        if self.centroids is None:
+            if len(vectors) >= self.min_train_size:
+                self.fit(vectors)
+            return
+        new_assignments = self._assign(vectors[start:])
+        self.assignments = np.concatenate([self.assignments, new_assignments])
+        for cluster in np.unique(new_assignments):
+            rows = start + np.flatnonzero(new_assignments == cluster)
+            self.lists[cluster] = np.concatenate([self.lists[cluster], rows.astype(np.int64)])
+
+    def refresh(self, vectors: np.ndarray):
+        """Re-assign all rows after rows were removed, keeping the trained centroids."""
+        if self.centroids is None:
+            self.add(vectors, 0)
+        else:
+            self._assign_all(vectors)
+
+    def candidates(self, query: np.ndarray) -> Optional[np.ndarray]:
+        if self.centroids is None:
+            return None
+        probes = _top_k(self.centroids @ query, self.nprobe)
+        return np.concatenate([self.lists[cluster] for cluster in probes])
+
+    def save(self, directory: Path):
+        if self.centroids is None:
+            return
+        np.save(directory / "centroids.npy", self.centroids)
+        np.save(directory / "assignments.npy", self.assignments)
+
+    def load(self, directory: Path):
+        if not (directory / "centroids.npy").exists():
+            return
+        self.centroids = np.load(directory / "centroids.npy")
+        self.assignments = np.load(directory / "assignments.npy")
+        self._build_lists()
+
+    def _assign(self, vectors: np.ndarray, block: int = 65536) -> np.ndarray:
+        return np.concatenate([
+            np.argmax(vectors[i:i + block] @ self.centroids.T, axis=1).astype(np.int32)
+            for i in range(0, len(vectors), block)
+        ]) if len(vectors) else np.empty(0, dtype=np.int32)
+
+    def _assign_all(self, vectors: np.ndarray):
+        self.assignments = self._assign(vectors)
+        self._build_lists()
+
+    def _build_lists(self):
+        order = np.argsort(self.assignments, kind="stable")
+        bounds = np.searchsorted(self.assignments[order], np.arange(len(self.centroids) + 1))
+        self.lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self.centroids))]
+
+    @staticmethod
+    def _kmeans(vectors: np.ndarray, nlist: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+        rng = np.random.default_rng(seed)
+        sample_size = min(len(vectors), nlist * 256)
+        sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            empty = np.bincount(assignments, minlength=nlist) == 0
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+        return centroids
+
+
+INDEX_TYPES = {
+    "flat": FlatIndex,
+    "ivf": IVFIndex,
+}
+
+STORAGE_TYPES = ("float32",) + QuantizedCodes.kinds
+
+
+class LocalVectorStore:
+    """
+    In-process vector store persisted to a directory.
+
+    Exposes the same `add_documents` / `similarity_search` surface as the
+    LangChain stores used elsewhere in the app. Vectors are stored unit
+    normalized, so inner-product search ranks by cosine similarity.
+
+    With "int8" or "binary" storage only compact codes are held in memory;
+    the float32 vectors stay in a memory-mapped file and are read just for
+    the candidates being rescored. Added vectors are appended to that file
+    and only their rows are encoded; replaced rows are rewritten in place.
+    A delete compacts the file block by block.
+    """
+
+    def __init__(self, directory, embedding, index_type: str = "flat",
+                 storage: str = "float32", rescore_factor: int = 10):
+        """ Initialize the local vector store
+
+        Args:
+            directory: Directory the store is persisted to.
+            embedding: Embedding model with embed_documents / embed_query.
+            index_type (str): "flat" for exact search or "ivf" for approximate search.
+            storage (str): "float32", "int8" or "binary" vectors in memory.
+            rescore_factor (int): Candidates per requested result rescored at full precision.
+        """
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unsupported index type: {index_type}")
+        if storage not in STORAGE_TYPES:
+            raise ValueError(f"Unsupported storage: {storage}")
+        self.directory = Path(directory)
+        self.embeddings = embedding
+        self.index = INDEX_TYPES[index_type]()
+        self.storage = storage
+        self.rescore_factor = rescore_factor
+        self.codes = QuantizedCodes(storage) if storage != "float32" else None
+        self.vectors = None
+        self.ids: List[str] = []
+        self.documents: List[Document] = []
+        self._rows = {}
+        self._vectors_path = self.directory / "vectors.npy"
+
+    @classmethod
+    def load(cls, directory, embedding, index_type: str = "flat",
+             storage: str = "float32", rescore_factor: int = 10) -> "LocalVectorStore":
+        """Open a persisted store, or an empty one if the directory has no data yet."""
+        store = cls(directory, embedding, index_type, storage, rescore_factor)
+        vectors_path = store.directory / "vectors.npy"
+        if not vectors_path.exists():
+            return store
+
+        store.vectors = np.load(vectors_path, mmap_mode="r" if store.codes is not None else None)
+        with open(store.directory / "docs.jsonl", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                store.ids.append(record["id"])
+                store.documents.append(Document(
+                    page_content=record["page_content"],
+                    metadata=record["metadata"]
+                ))
+        store._rows = {doc_id: row for row, doc_id in enumerate(store.ids)}
+        # Rows appended by a write that stopped before docs.jsonl was replaced
+        store.vectors = store.vectors[:len(store.ids)]
+
+        meta = json.loads((store.directory / "meta.json").read_text())
+        if meta["index_type"] == index_type:
+            store.index.load(store.directory)
+        else:
+            store.index.fit(store.vectors)
+        if store.codes is not None:
+            store.codes.clip = meta.get("int8_clip")
+            store.codes.fit(store.vectors)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add_documents(self, documents: List[Document], ids: Optional[List[str]] = None) -> List[str]:
+        """
+        Embeds and adds documents; documents whose id already exists are replaced.
+
+        Args:
+            documents (List[Document]): Documents to add.
+            ids (List[str], optional): Stable ids for the documents.
+        """
+        if not documents:
+            return []
+        if ids is None:
+            ids = [uuid.uuid4().hex for _ in documents]
+        vectors = _normalize(self.embeddings.embed_documents([doc.page_content for doc in documents]))
+
+        replaced = {}
+        new_rows = []
+        for doc_id, doc, vector in zip(ids, documents, vectors):
+            row = self._rows.get(doc_id)
+            if row is None:
+                new_rows.append((doc_id, doc, vector))
+            else:
+                self.documents[row] = doc
+                replaced[row] = vector
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if replaced:
+            rows = np.fromiter(replaced, dtype=np.int64, count=len(replaced))
+            block = np.stack(list(replaced.values()))
+            self._write_rows(rows, block)
+            if self.codes is not None:
+                self.codes.update(rows, block)
+
+        if new_rows:
+            start = len(self.ids)
+            block = np.stack([vector for _, _, vector in new_rows])
+            for doc_id, doc, _ in new_rows:
+                self._rows[doc_id] = len(self.ids)
+                self.ids.append(doc_id)
+                self.documents.append(doc)
+            self._append_vectors(start, block)
+            if self.codes is not None:
+                self.codes.add(block)
+            self.index.add(self.vectors, start)
+
+        self._save_documents()
+        return ids
+
+    def delete(self, ids: List[str]):
+        """Removes the documents with the given ids; unknown ids are ignored."""
+        rows = [self._rows[doc_id] for doc_id in ids if doc_id in self._rows]
+        if not rows:
+            return
+        keep = np.ones(len(self.ids), dtype=bool)
+        keep[rows] = False
+        kept = np.flatnonzero(keep)
+        self.ids = [self.ids[row] for row in kept]
+        self.documents = [self.documents[row] for row in kept]
+        self._rows = {doc_id: row for row, doc_id in enumerate(self.ids)}
+
+        if self.codes is None:
+            self.vectors = self.vectors[kept]
+            self._save_vectors()
+        else:
+            # Compact the file from the memory map; the remaining codes are still valid
+            dimension = self.vectors.shape[1]
+            tmp_path = self.directory / "vectors.tmp.npy"
+            _write_npy(tmp_path, [(self.vectors, kept)], dimension)
+            self.vectors = None
+            os.replace(tmp_path, self._vectors_path)
+            self.vectors = np.load(self._vectors_path, mmap_mode="r")
+            self.codes.select(kept)
+        self.index.refresh(self.vectors)
+        self._save_documents()
+
+    def similarity_search(self, query: str, k: int = 4) -> List[Document]:
+        """Return the k documents most similar to the query."""
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4) -> List[Tuple[Document, float]]:
+        """Return the k most similar documents with their cosine similarity."""
+        return self.similarity_search_by_vector_with_score(self.embeddings.embed_query(query), k=k)
+
+    def similarity_search_by_vector(self, embedding, k: int = 4) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k=k)]
+
+    def similarity_search_by_vector_with_score(self, embedding, k: int = 4) -> List[Tuple[Document, float]]:
+        if not self.ids:
+            return []
+        query = _normalize(embedding)
+        rows = self.index.candidates(query)
+        if self.codes is not None:
+            found, scores = rescored_search(self.codes, self.vectors, query, k, self.rescore_factor, rows)
+            return [(self.documents[row], float(score)) for row, score in zip(found, scores)]
+        if rows is None:
+            scores = self.vectors @ query
+            top = _top_k(scores, k)
+            return [(self.documents[row], float(scores[row])) for row in top]
+        scores = self.vectors[rows] @ query
+        top = _top_k(scores, k)
+        return [(self.documents[rows[i]], float(scores[i])) for i in top]
+
+    def save(self):
+        """Persist vectors, documents and index state to the store directory."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._save_vectors()
+        self._save_documents()
+
+    def _append_vectors(self, start: int, block: np.ndarray):
+        """Add rows from `start` on to self.vectors and append them to vectors.npy."""
+        previous = self.vectors
+        if self.codes is None:
+            self.vectors = block if previous is None else np.concatenate([previous, block])
+        else:
+            # The mapping is reopened once the file has grown
+            self.vectors = None
+
+        on_disk = _npy_header(self._vectors_path)[0][0] if self._vectors_path.exists() else None
+        if not (start and on_disk == start and _append_npy(self._vectors_path, block)):
+            tmp_path = self.directory / "vectors.tmp.npy"
+            parts = [(previous, None), (block, None)] if start else [(block, None)]
+            _write_npy(tmp_path, parts, block.shape[1])
+            previous = None
+            os.replace(tmp_path, self._vectors_path)
+        if self.codes is not None:
+            self.vectors = np.load(self._vectors_path, mmap_mode="r")
+
+    def _write_rows(self, rows: np.ndarray, block: np.ndarray):
+        """Overwrite existing rows, in memory and in vectors.npy."""
+        if self.codes is None:
+            self.vectors[rows] = block
+        # With quantized storage self.vectors maps the same file and sees the change
+        on_disk = np.load(self._vectors_path, mmap_mode="r+")
+        on_disk[rows] = block
+        on_disk.flush()
+        del on_disk
+
+    def _save_vectors(self):
+        tmp_path = self.directory / "vectors.tmp.npy"
+        _write_npy(tmp_path, [(self.vectors, None)], self.vectors.shape[1])
+        if self.codes is not None:
+            self.vectors = None
+        os.replace(tmp_path, self._vectors_path)
+        if self.codes is not None:
+            self.vectors = np.load(self._vectors_path, mmap_mode="r")
+
+    def _save_documents(self):
+        """Persist documents, index state and metadata; vectors.npy is written separately."""
+        with open(self.directory / "docs.tmp.jsonl", "w", encoding="utf-8") as f:
+            for doc_id, doc in zip(self.ids, self.documents):
+                f.write(json.dumps({
+                    "id": doc_id,
+                    "page_content": doc.page_content,
+                    "metadata": doc.metadata
+                }, default=str) + "\n")
+        os.replace(self.directory / "docs.tmp.jsonl", self.directory / "docs.jsonl")
+        self.index.save(self.directory)
+        (self.directory / "meta.json").write_text(json.dumps({
+            "index_type": self.index.kind,
+            "dimension": int(self.vectors.shape[1]),
+            "count": len(self.ids),
+            "storage": self.storage,
+            "int8_clip": self.codes.clip if self.codes is not None else None
+        }))
@@ -0,0 +1,199 @@
+from pathlib import Path
+from typing import Optional
+import argparse
+import json
+import time
+
+import numpy as np
+
+
+# Number of set bits in every byte value, for Hamming distances on packed codes
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint16)
+
+
+def quantize_int8(vectors: np.ndarray, clip: float) -> np.ndarray:
+    """Symmetric scalar quantization of [-clip, clip] onto [-127, 127]."""
+    scaled = np.asarray(vectors, dtype=np.float32) * (127.0 / clip)
+    return np.clip(np.rint(scaled), -127, 127).astype(np.int8)
+
+
+def binarize(vectors: np.ndarray) -> np.ndarray:
+    """One sign bit per dimension, packed eight to a byte."""
+    return np.packbits(np.asarray(vectors) > 0, axis=-1)
+
+
+def hamming_distances(codes: np.ndarray, query_code: np.ndarray) -> np.ndarray:
+    """Hamming distance between every packed code row and one packed query code."""
+    differing = np.bitwise_xor(codes, query_code)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(differing).sum(axis=1, dtype=np.uint16)
+    return _POPCOUNT[differing].sum(axis=1, dtype=np.uint16)
+
+
+class QuantizedCodes:
+    """
+    Compact in-memory copy of a unit-normalized vector matrix, used to pick
+    candidates that are then rescored against the full-precision vectors.
+
+    "int8" keeps one byte per dimension (4x smaller than float32) and
+    approximates the inner product. "binary" keeps one bit per dimension
+    (32x smaller) and ranks by Hamming distance of the sign bits.
+    """
+
+    kinds = ("int8", "binary")
+
+    def __init__(self, kind: str, clip: Optional[float] = None, block_size: int = 16384):
+        """ Initialize the quantized codes
+
+        Args:
+            kind (str): "int8" or "binary".
+            clip (float, optional): int8 range; calibrated on the first vectors when None.
+            block_size (int): Rows converted at a time, bounding temporary memory.
+        """
+        if kind not in self.kinds:
+            raise ValueError(f"Unsupported quantization: {kind}")
+        self.kind = kind
+        self.clip = clip
+        self.block_size = block_size
+        self.codes = None
+        self._buffer = None
+
+    def __len__(self) -> int:
+        return 0 if self.codes is None else len(self.codes)
+
+    @property
+    def nbytes(self) -> int:
+        return 0 if self.codes is None else self.codes.nbytes
+
+    def fit(self, vectors: np.ndarray):
+        """(Re)build the codes of every row; vectors may be a memory-mapped array."""
+        self.codes = None
+        self._buffer = None
+        self.add(vectors)
+
+    def add(self, vectors: np.ndarray):
+        """
+        Encode rows and append them. The int8 clip is calibrated on the first
+        rows when unset and kept afterwards, so earlier codes stay valid.
+        """
+        if not len(vectors):
+            return
+        if self.kind == "int8" and self.clip is None:
+            sample = np.asarray(vectors[:self.block_size], dtype=np.float32)
+            # Outermost 0.1% of components are clipped rather than widening every step
+            self.clip = float(max(np.quantile(np.abs(sample), 0.999), 1e-6))
+        encoded = np.concatenate([
+            self._encode(vectors[i:i + self.block_size])
+            for i in range(0, len(vectors), self.block_size)
+        ])
+        count = len(self)
+        if self._buffer is None or count + len(encoded) > len(self._buffer):
+            # Grow geometrically so repeated small batches stay amortized O(batch)
+            buffer = np.empty((max(count + len(encoded), 2 * count), encoded.shape[1]), dtype=encoded.dtype)
+            if count:
+                buffer[:count] = self.codes
+            self._buffer = buffer
+        self._buffer[count:count + len(encoded)] = encoded
+        self.codes = self._buffer[:count + len(encoded)]
+
+    def update(self, rows: np.ndarray, vectors: np.ndarray):
+        """Re-encode the given rows in place."""
+        self.codes[rows] = self._encode(vectors)
+
+    def select(self, rows: np.ndarray):
+        """Keep only the given rows, in that order (codes do not depend on each other)."""
+        self.codes = self.codes[rows]
+        self._buffer = self.codes
+
+    def scores(self, query: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Approximate similarity of the query to every row (or the given rows);
+        higher is more similar.
+        """
+        codes = self.codes if rows is None else self.codes[rows]
+        if self.kind == "binary":
+            return -hamming_distances(codes, binarize(query)).astype(np.int32)
+        query = np.asarray(query, dtype=np.float32)
+        return np.concatenate([
+            codes[i:i + self.block_size].astype(np.float32) @ query
+            for i in range(0, len(codes), self.block_size)
+        ])
+
+    def _encode(self, vectors: np.ndarray) -> np.ndarray:
+        if self.kind == "binary":
+            return binarize(vectors)
+        return quantize_int8(vectors, self.clip)
+
+
+def rescored_search(codes: QuantizedCodes, vectors: np.ndarray, query: np.ndarray, k: int,
+                    rescore_factor: int = 10, rows: Optional[np.ndarray] = None):
+    """
+    Top k rows by exact inner product, scoring only the `k * rescore_factor`
+    best candidates by code against the full-precision vectors.
+
+    Returns:
+        Row positions best first, and their exact scores.
+    """
+    approx = codes.scores(query, rows)
+    count = min(len(approx), k * rescore_factor)
+    if count < len(approx):
+        top = np.argpartition(-approx, count - 1)[:count]
+    else:
+        top = np.arange(len(approx))
+    candidates = np.sort(top if rows is None else rows[top])
+    # Sorted rows keep the reads from a memory-mapped file sequential
+    exact = np.asarray(vectors[candidates], dtype=np.float32) @ query
+    best = np.argsort(-exact)[:k]
+    return candidates[best], exact[best]
+
+
+def report(vectors: np.ndarray, queries: np.ndarray, k: int = 10, rescore_factor: int = 10) -> dict:
+    """
+    Recall@k against exact float32 search, mean / p95 query latency and
+    resident memory of each storage option.
+    """
+    exact_top = [np.argsort(-(vectors @ query))[:k] for query in queries]
+    results = {}
+    for storage in ("float32",) + QuantizedCodes.kinds:
+        codes = None
+        if storage != "float32":
+            codes = QuantizedCodes(storage)
+            codes.fit(vectors)
+        latencies = []
+        hits = 0
+        for query, expected in zip(queries, exact_top):
+            start = time.perf_counter()
+            if codes is None:
+                scores = vectors @ query
+                found = np.argpartition(-scores, k)[:k]
+            else:
+                found, _ = rescored_search(codes, vectors, query, k, rescore_factor)
+            latencies.append(time.perf_counter() - start)
+            hits += len(np.intersect1d(found, expected))
+        results[storage] = {
+            "recall_at_k": round(hits / (k * len(queries)), 4),
+            "mean_ms": round(1000 * float(np.mean(latencies)), 3),
+            "p95_ms": round(1000 * float(np.percentile(latencies, 95)), 3),
+            "resident_bytes": int(vectors.nbytes if codes is None else codes.nbytes),
+        }
+    return {"vectors": len(vectors), "dimension": int(vectors.shape[1]), "k": k,
+            "rescore_factor": rescore_factor, "storage": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall / latency / memory of quantized vector storage.")
+    parser.add_argument("index_dir", help="Local index directory containing vectors.npy")
+    parser.add_argument("--queries", type=int, default=200, help="Stored vectors held out as queries")
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--rescore-factor", type=int, default=10)
+    args = parser.parse_args()
+
+    vectors = np.load(Path(args.index_dir) / "vectors.npy")
+    rng = np.random.default_rng(0)
+    held_out = np.zeros(len(vectors), dtype=bool)
+    held_out[rng.choice(len(vectors), min(args.queries, len(vectors) // 2), replace=False)] = True
+    print(json.dumps(report(vectors[~held_out], vectors[held_out], args.k, args.rescore_factor), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,164 @@
 from langchain_pinecone import PineconeVectorStore
 from typing import List
+import uuid
+from pathlib import Path
 from langchain_core.documents import Document
 
+from .localIndex import LocalVectorStore
+
 
 
 class VectorDatabase:
     """
-    Handles Pinecone vector database operations.
+    Handles vector database operations on Pinecone or a local on-disk index.
     """
 
-    def __init__(self, index_name: str, embeddding_model):
+    def __init__(self, index_name: str, embeddding_model, backend: str = "pinecone",
+                 index_dir=None, index_type: str = "flat", lexical_index=None,
+                 storage: str = "float32", rescore_factor: int = 10):
+        """
+        Args:
+            index_name (str): Name of the index.
+            embeddding_model: Embedding model used for documents and queries.
+            backend (str): "pinecone" or "local".
+            index_dir: Parent directory of local indexes (local backend only).
+            index_type (str): "flat" or "ivf" (local backend only).
+            lexical_index (BM25Index, optional): Keyword index kept in step with every write.
+            storage (str): "float32", "int8" or "binary" in-memory vectors (local backend only).
+            rescore_factor (int): Quantized candidates rescored per result (local backend only).
+        """
+        if backend not in ("pinecone", "local"):
+            raise ValueError(f"Unsupported vector backend: {backend}")
         self.index_name = index_name
         self.embedding_model = embeddding_model
+        self.backend = backend
+        self.index_dir = Path(index_dir) if index_dir is not None else Path("index_data")
+        self.index_type = index_type
+        self.storage = storage
+        self.rescore_factor = rescore_factor
+        self.lexical_index = lexical_index
         self.vector_store = None
+        self._change_listeners = []
+        self._delete_listeners = []
+
+    def add_change_listener(self, listener):
+        """
+        Registers a callable invoked after every write to the index,
+        e.g. to invalidate caches of search results.
+        """
+        self._change_listeners.append(listener)
+
+    def add_delete_listener(self, listener):
+        """
+        Registers a callable invoked with the ids of deleted vectors,
+        e.g. to invalidate answers generated from those chunks.
+        """
+        self._delete_listeners.append(listener)
+
+    def _notify_change(self):
+        for listener in self._change_listeners:
+            listener()
     
     def load_existing_index(self):
         """
-        Load an existing Pinecone index without adding documents.
+        Load an existing index without adding documents.
         """
         try:
-            self.vector_store = PineconeVectorStore(
-                index_name=self.index_name,
-                embedding=self.embedding_model
-            )
+            if self.backend == "local":
+                self.vector_store = LocalVectorStore.load(
+                    self.index_dir / self.index_name,
+                    self.embedding_model,
+                    index_type=self.index_type,
+                    storage=self.storage,
+                    rescore_factor=self.rescore_factor
+                )
+                # Indexes built before the lexical index existed are backfilled once
+                if self.lexical_index is not None and not len(self.lexical_index) and len(self.vector_store):
+                    self.lexical_index.add_documents(self.vector_store.documents, self.vector_store.ids)
+            else:
+                self.vector_store = PineconeVectorStore(
+                    index_name=self.index_name,
+                    embedding=self.embedding_model
+                )
             return self.vector_store
         except Exception as e:
             raise Exception(f"Failed to load existing index: {str(e)}")
 
+    def is_healthy(self) -> bool:
+        """
+        Checks that the loaded index answers queries.
+        """
+        if self.vector_store is None:
+            return False
+        if self.backend == "local":
+            return True
+        self.vector_store.similarity_search("health check", k=1)
+        return True
+
     def add_documents(self, documents: List[Document]):
         """
-        Adds documents to the Pinecone vector store.
+        Adds documents to the vector store.
 
         Args:
             documents (List[Document]): List of documents to add.
         """
+        ids = [doc.metadata.get("chunk_id") or uuid.uuid4().hex for doc in documents]
+        if self.backend == "local":
+            if self.vector_store is None:
+                self.load_existing_index()
+            self.vector_store.add_documents(documents, ids=ids)
+            self.index_lexical(documents, ids)
+            self._notify_change()
+            return self.vector_store
+
         self.vector_store = PineconeVectorStore.from_documents(
             documents,
             self.embedding_model,
-            index_name=self.index_name
+            index_name=self.index_name,
+            ids=ids
         )
+        self.index_lexical(documents, ids)
+        self._notify_change()
         return self.vector_store
             
+
+    def upsert_documents(self, documents: List[Document], ids: List[str]):
+        """
+        Adds or replaces documents under stable ids.
+
+        Args:
+            documents (List[Document]): Documents to write.
+            ids (List[str]): One id per document.
+        """
+        if self.vector_store is None:
+            self.load_existing_index()
+        self.vector_store.add_documents(documents, ids=ids)
+        self.index_lexical(documents, ids)
+        self._notify_change()
+        return self.vector_store
+
+    def index_lexical(self, documents: List[Document], ids: List[str]):
+        """
+        Adds documents to the lexical index only; called on every write, and
+        directly for chunks that were ingested before it was enabled.
+        """
+        if self.lexical_index is not None:
+            self.lexical_index.add_documents(documents, ids)
+
+    def delete(self, ids: List[str]):
+        """
+        Deletes vectors by id.
+
+        Args:
+            ids (List[str]): Ids of the vectors to delete.
+        """
+        if not ids:
+            return
+        if self.vector_store is None:
+            self.load_existing_index()
+        self.vector_store.delete(ids=ids)
+        if self.lexical_index is not None:
+            self.lexical_index.delete(ids)
+        for listener in self._delete_listeners:
+            listener(ids)
+        self._notify_change()
@@ -0,0 +1,212 @@
+"""Offline performance benchmark of the knowledge Assistant pipeline"""
+
+import argparse
+import hashlib
+import json
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from src.config.config import Config
+from src.document_ingestion.chunker import OffsetChunker
+from src.document_ingestion.pdf_parser import ParallelPDFParser
+from src.graph_builder.graphbuilder import GraphBuilder
+from src.nodes.context_packer import ContextPacker
+
+
+DEFAULT_PDFS = [
+    Path(__file__).resolve().parent / "data" / "budget_speech.pdf",
+    Path(__file__).resolve().parent.parent / "RAG_APP" / "data" / "Attention.pdf",
+]
+
+# QUESTIONS and HashingEmbeddings match RAG_APP/benchmark.py, so the two apps' results are
+# comparable; change both together.
+QUESTIONS = [
+    "What is multi-head attention?",
+    "How are positional encodings computed?",
+    "Why does self-attention scale better than recurrent layers?",
+    "Which optimizer and learning rate schedule were used for training?",
+    "What BLEU score does the big transformer reach on English-German?",
+    "What is the fiscal deficit target for the next year?",
+    "How much is allocated to capital expenditure?",
+    "What changes were announced to personal income tax slabs?",
+    "Which schemes support agriculture and farmers?",
+    "section 80C deduction",
+]
+
+_TOKEN = re.compile(r"\w+")
+
+
+class HashingEmbeddings:
+    """
+    Deterministic bag-of-words feature hashing; stands in for the
+    sentence-transformers model when benchmarking without it.
+    """
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+
+    def embed_documents(self, texts):
+        return [self._embed(text).tolist() for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text).tolist()
+
+    def _embed(self, text):
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for token in _TOKEN.findall(text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dimension
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+
+class PrecomputedEmbeddings:
+    """Serves already computed chunk vectors so index build time excludes embedding."""
+
+    def __init__(self, model, texts, vectors):
+        self.model = model
+        self.vectors = dict(zip(texts, vectors))
+
+    def embed_documents(self, texts):
+        return [self.vectors[text] for text in texts]
+
+    def embed_query(self, text):
+        return self.model.embed_query(text)
+
+
+def _percentiles(seconds) -> dict:
+    milliseconds = 1000 * np.asarray(seconds)
+    return {
+        "count": len(milliseconds),
+        "p50_ms": round(float(np.percentile(milliseconds, 50)), 3),
+        "p95_ms": round(float(np.percentile(milliseconds, 95)), 3),
+        "p99_ms": round(float(np.percentile(milliseconds, 99)), 3),
+        "mean_ms": round(float(milliseconds.mean()), 3),
+    }
+
+
+def _rate(count, seconds) -> float:
+    return round(count / seconds, 2) if seconds > 0 else float("inf")
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=Path(__file__).parent, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(pdf_paths, fake_embeddings: bool, repeat: int, workers: int) -> dict:
+    config = Config()
+    parser = ParallelPDFParser(max_workers=workers, pages_per_task=config.PDF_PAGES_PER_TASK)
+    chunker = OffsetChunker(chunk_size=config.CHUNK_SIZE, chunk_overlap=config.CHUNK_OVERLAP)
+
+    # Ingestion: parse and chunk, timed separately
+    start = time.perf_counter()
+    pages = [page for pdf_path in pdf_paths for page in parser.parse(pdf_path)]
+    parse_seconds = time.perf_counter() - start
+    parser.close()
+    start = time.perf_counter()
+    chunks = chunker.split_documents(pages)
+    chunk_seconds = time.perf_counter() - start
+
+    # Embedding, without the persistent cache so every run does the work
+    if fake_embeddings:
+        model = HashingEmbeddings()
+    else:
+        from src.vectorstore.runtime import load_model
+        from src.vectorstore.vectorstore import SentenceTransformerEmbeddings
+        model = SentenceTransformerEmbeddings(load_model(
+            config.EMBEDDING_MODEL_NAME,
+            config.EMBEDDING_BACKEND,
+            config.EMBEDDING_QUANTIZE,
+            config.EMBEDDING_THREADS or None
+        ))
+    texts = [chunk.page_content for chunk in chunks]
+    start = time.perf_counter()
+    vectors = model.embed_documents(texts)
+    embed_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store = InMemoryVectorStore(PrecomputedEmbeddings(model, texts, vectors))
+    store.add_documents(chunks, ids=[f"chunk-{i}" for i in range(len(chunks))])
+    index_seconds = time.perf_counter() - start
+
+    retriever = store.as_retriever(search_kwargs={"k": 4})
+    graph_builder = GraphBuilder(
+        retriever=retriever,
+        llm=FakeListChatModel(responses=["A fixed answer from the benchmark model."]),
+        packer=ContextPacker(max_tokens=config.CONTEXT_MAX_TOKENS)
+    )
+    questions = QUESTIONS * repeat
+
+    retrieval_seconds = []
+    for question in questions:
+        start = time.perf_counter()
+        retriever.invoke(question)
+        retrieval_seconds.append(time.perf_counter() - start)
+
+    answer_seconds = []
+    for question in questions:
+        start = time.perf_counter()
+        graph_builder.run(question)
+        answer_seconds.append(time.perf_counter() - start)
+
+    return {
+        "ingestion": {
+            "pdfs": [Path(pdf_path).name for pdf_path in pdf_paths],
+            "pages": len(pages),
+            "parse_seconds": round(parse_seconds, 4),
+            "pages_per_second": _rate(len(pages), parse_seconds),
+            "chunks": len(chunks),
+            "chunk_seconds": round(chunk_seconds, 4),
+            "chunks_per_second": _rate(len(chunks), chunk_seconds),
+        },
+        "embedding": {
+            "model": "hashing" if fake_embeddings else config.EMBEDDING_MODEL_NAME,
+            "texts": len(texts),
+            "seconds": round(embed_seconds, 4),
+            "texts_per_second": _rate(len(texts), embed_seconds),
+        },
+        "index": {
+            "type": "in-memory",
+            "build_seconds": round(index_seconds, 4),
+        },
+        "retrieval": _percentiles(retrieval_seconds),
+        "end_to_end": _percentiles(answer_seconds),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of ingestion, retrieval and answering.")
+    parser.add_argument("pdfs", nargs="*", default=DEFAULT_PDFS, help="PDFs to ingest")
+    parser.add_argument("--out", default="benchmark_results.json", help="JSON file the results are written to")
+    parser.add_argument("--fake-embeddings", action="store_true", help="Deterministic hashing embeddings instead of the model")
+    parser.add_argument("--repeat", type=int, default=5, help="Times the question set is asked")
+    parser.add_argument("--workers", type=int, default=Config.PDF_PARSE_WORKERS, help="PDF parse workers")
+    args = parser.parse_args()
+
+    results = {
+        "app": "knowledge Assistant",
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        **run(args.pdfs, args.fake_embeddings, args.repeat, args.workers),
+    }
+    Path(args.out).write_text(json.dumps(results, indent=2))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
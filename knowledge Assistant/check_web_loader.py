@@ -0,0 +1,112 @@
+"""
+Reproducible check of AsyncWebLoader's conditional GETs.
+
+Serves a few pages from a local HTTP server: one validated by ETag, one by
+Last-Modified, one without validators. Loads them twice with a response
+cache, changes a page, and loads again. Revalidated pages must come back
+as 304 (not_modified, same text); the changed page and the page without
+validators must be downloaded again.
+
+    python check_web_loader.py
+
+Exits non-zero when a check fails.
+"""
+
+import hashlib
+import json
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.document_ingestion.web_loader import AsyncWebLoader
+
+
+PAGES = {
+    "/etag": "Budget highlights: capital expenditure rises.",
+    "/last-modified": "Income tax slabs are revised.",
+    "/plain": "A page without cache validators.",
+}
+LAST_MODIFIED = "Wed, 01 Oct 2025 10:00:00 GMT"
+
+
+class Site(BaseHTTPRequestHandler):
+    """Serves PAGES, honouring If-None-Match / If-Modified-Since, and logs each status."""
+
+    log = []
+
+    def do_GET(self):
+        text = PAGES[self.path]
+        html = f"<html lang='en'><head><title>{self.path}</title></head><body><p>{text}</p></body></html>"
+        etag = '"' + hashlib.sha256(html.encode("utf-8")).hexdigest()[:16] + '"'
+        headers = {}
+        not_modified = False
+        if self.path == "/etag":
+            headers["ETag"] = etag
+            not_modified = self.headers.get("If-None-Match") == etag
+        elif self.path == "/last-modified":
+            headers["Last-Modified"] = LAST_MODIFIED
+            not_modified = self.headers.get("If-Modified-Since") == LAST_MODIFIED
+
+        status = 304 if not_modified else 200
+        Site.log.append((self.path, status))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if not_modified:
+            self.end_headers()
+            return
+        body = html.encode("utf-8")
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def fetch(loader: AsyncWebLoader, base_url: str) -> dict:
+    """Load every page once; returns {path: (status seen by the server, not_modified, text)}."""
+    Site.log.clear()
+    pages = loader.load_many([base_url + path for path in PAGES])
+    statuses = dict(Site.log)
+    results = {}
+    for path, page in zip(PAGES, pages):
+        if isinstance(page, Exception):
+            raise page
+        results[path] = (statuses[path], page.not_modified, page.documents[0].page_content.strip())
+    return results
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Site)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    checks = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        loader = AsyncWebLoader(cache_dir=cache_dir)
+        first = fetch(loader, base_url)
+        second = fetch(loader, base_url)
+        PAGES["/etag"] = "Budget highlights: capital expenditure is revised."
+        third = fetch(loader, base_url)
+
+    for path in PAGES:
+        checks.append((f"first load {path}", first[path][:2] == (200, False)))
+    checks.append(("etag revalidated", second["/etag"][:2] == (304, True)))
+    checks.append(("last-modified revalidated", second["/last-modified"][:2] == (304, True)))
+    checks.append(("no validators downloaded", second["/plain"][:2] == (200, False)))
+    checks.append(("cached text served", all(second[path][2] == first[path][2] for path in PAGES)))
+    checks.append(("changed page downloaded", third["/etag"][:2] == (200, False)
+                   and third["/etag"][2].endswith("is revised.")))
+    server.shutdown()
+
+    print(json.dumps({name: ok for name, ok in checks}, indent=2))
+    if not all(ok for _, ok in checks):
+        print("web loader check failed", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,69 @@ class Config:
     DEFAULT_URLS = ["https://lilianweng.github.io/posts/2023-06-23-agent/",
     "https://lilianweng.github.io/posts/2021-07-11-diffusion-models/"]
 
+    # ===== EMBEDDINGS =====
+    EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+    # "torch", or "onnx" (ONNX Runtime, needs sentence-transformers[onnx]); 0 threads = library default
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+    EMBEDDING_QUANTIZE = os.getenv("EMBEDDING_QUANTIZE", "false").lower() == "true"
+    EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0"))
+    # Shared with RAG_APP: same default location and on-disk format
+    EMBEDDING_CACHE_DIR = os.getenv(
+        "EMBEDDING_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "gen_ai_handson", "embeddings")
+    )
+    EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+
+    # ===== VECTOR STORE =====
+    PERSIST_DIRECTORY = os.getenv("PERSIST_DIRECTORY", "vectorstore_data")
+    DATA_DIR = "data"
+    # Web pages are revalidated (conditional GET) at most this often; PDFs are checked by file hash on every start
+    URL_REFRESH_HOURS = float(os.getenv("URL_REFRESH_HOURS", "0"))
+
+    # ===== WEB LOADING =====
+    WEB_CACHE_DIR = os.getenv(
+        "WEB_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "gen_ai_handson", "web")
+    )
+    WEB_MAX_CONNECTIONS = 20
+    WEB_MAX_PER_HOST = 4
+    WEB_TIMEOUT_SECONDS = 20.0
+
+    # ===== STREAMING INGESTION =====
+    EMBED_BATCH_SIZE = 64
+    UPSERT_BATCH_SIZE = 256
+    PIPELINE_QUEUE_SIZE = 4
+
+    # ===== PDF PARSING =====
+    PDF_PARSE_WORKERS = int(os.getenv("PDF_PARSE_WORKERS", str(os.cpu_count() or 1)))
+    PDF_PAGES_PER_TASK = 8
+    PAGE_CACHE_DIR = os.getenv(
+        "PAGE_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "gen_ai_handson", "pages")
+    )
+
+    # ===== ANSWER CACHE =====
+    ANSWER_CACHE_PATH = os.getenv(
+        "ANSWER_CACHE_PATH",
+        os.path.join(os.path.expanduser("~"), ".cache", "gen_ai_handson", "ka_answers.sqlite3")
+    )
+    ANSWER_CACHE_MAX_ENTRIES = 5000
+    ANSWER_CACHE_TTL_SECONDS = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+    # Also reuse answers to similar questions asked over the same chunks
+    ANSWER_CACHE_SEMANTIC = os.getenv("ANSWER_CACHE_SEMANTIC", "true").lower() == "true"
+    ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.97"))
+
+    # ===== CONTEXT PACKING =====
+    # Overlapping chunks are merged and near-duplicates dropped before the budget is applied
+    CONTEXT_MAX_TOKENS = int(os.getenv("CONTEXT_MAX_TOKENS", "3000"))
+    CONTEXT_DUPLICATE_THRESHOLD = 0.9
+
+    # ===== TELEMETRY =====
+    # Per-node spans appended to a JSON trace log; Prometheus text on :METRICS_PORT/metrics (0 disables)
+    TELEMETRY_ENABLED = os.getenv("TELEMETRY_ENABLED", "false").lower() == "true"
+    TELEMETRY_TRACE_PATH = os.getenv("TELEMETRY_TRACE_PATH", os.path.join("traces", "knowledge_assistant.jsonl"))
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "9465"))
+
     def get_llm(self):
         """
         Returns a Groq LLM instance.
@@ -0,0 +1,89 @@
+# Same chunker as RAG_APP/src/document_ingestion_Module/chunker.py; both apps must split
+# documents identically, so change both copies together.
+
+from typing import Iterable, Iterator, List, Sequence, Tuple
+import re
+
+from langchain_core.documents import Document
+
+
+_NON_SPACE = re.compile(r"\S")
+_SPACE = re.compile(r"\s")
+
+
+class OffsetChunker:
+    """
+    Splits text into overlapping chunks by computing (start, end) offsets.
+
+    Boundaries are searched in place with str.rfind, preferring paragraph
+    breaks, then line breaks, then spaces, like RecursiveCharacterTextSplitter.
+    Chunk text is only sliced out when a Document is built, and every chunk
+    records its "start_index" / "end_index" in the source text.
+    """
+
+    def __init__(self, chunk_size: int, chunk_overlap: int,
+                 separators: Sequence[str] = ("\n\n", "\n", " ")):
+        """
+        Args:
+            chunk_size (int): Maximum number of characters per chunk.
+            chunk_overlap (int): Characters shared by consecutive chunks.
+            separators (Sequence[str]): Preferred break points, highest priority first.
+        """
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = tuple(separators)
+
+    def spans(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (start, end) offsets of the chunks of text, whitespace-trimmed."""
+        length = len(text)
+        start = self._skip_space(text, 0, length)
+        while start < length:
+            end = length if start + self.chunk_size >= length else self._break(text, start)
+            trimmed = end
+            while trimmed > start and text[trimmed - 1].isspace():
+                trimmed -= 1
+            if trimmed > start:
+                yield start, trimmed
+            if end >= length:
+                return
+
+            # Step back by the overlap, then forward to the next word boundary
+            next_start = max(end - self.chunk_overlap, start + 1)
+            if not text[next_start - 1].isspace():
+                space = _SPACE.search(text, next_start, end)
+                if space:
+                    next_start = space.start()
+            start = self._skip_space(text, next_start, length)
+
+    def iter_chunks(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """Lazily yield one Document per chunk, each with its own metadata dict."""
+        for document in documents:
+            text = document.page_content
+            for start, end in self.spans(text):
+                yield Document(
+                    page_content=text[start:end],
+                    metadata={**document.metadata, "start_index": start, "end_index": end}
+                )
+
+    def split_documents(self, documents: Iterable[Document]) -> List[Document]:
+        return list(self.iter_chunks(documents))
+
+    def _break(self, text: str, start: int) -> int:
+        """Best break offset in (start, start + chunk_size]."""
+        limit = start + self.chunk_size
+        fallback = -1
+        for separator in self.separators:
+            position = text.rfind(separator, start + 1, limit)
+            if position > start:
+                # Take a high-priority break only if it leaves a reasonably full chunk
+                if position - start >= self.chunk_size // 2:
+                    return position
+                fallback = max(fallback, position)
+        return fallback if fallback > start else limit
+
+    @staticmethod
+    def _skip_space(text: str, position: int, length: int) -> int:
+        match = _NON_SPACE.search(text, position)
+        return match.start() if match else length
@@ -1,8 +1,8 @@
 from langchain_core.documents import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from src.document_ingestion.chunker import OffsetChunker
 
 
-from typing import List , Union
+from typing import Iterator, List , Union
 from pathlib import Path
 from langchain_community.document_loaders import(
     WebBaseLoader ,
@@ -34,14 +34,21 @@ DEFAULT_DATA_DIR = Path(
 class DocumentProcessor:
     """A class to process and split documents from various sources."""
 
-    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
-        self.text_splitter = RecursiveCharacterTextSplitter(
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200, pdf_parser=None):
+        self.pdf_parser = pdf_parser
+        self.text_splitter = OffsetChunker(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap
         )
 
     def load_document(self, source: Union[str, Path], source_type: str) -> List[Document]:
         """Load documents from various sources."""
+        if self.pdf_parser is not None and source_type == "pdf":
+            return self.pdf_parser.parse(source)
+        if self.pdf_parser is not None and source_type == "pdf_directory":
+            pdf_files = sorted(Path(source).glob("**/*.pdf"))
+            return [doc for docs in self.pdf_parser.parse_many(pdf_files) for doc in docs]
+
         if source_type == "web":
             loader = WebBaseLoader(str(source))
         elif source_type == "pdf":
@@ -57,14 +64,16 @@ class DocumentProcessor:
         return documents
     
 
+    def iter_documents(self, source: Union[str, Path], source_type: str) -> Iterator[Document]:
+        """Yield documents one at a time; PDFs are streamed page by page when a parser is set."""
+        if self.pdf_parser is not None and source_type == "pdf":
+            yield from self.pdf_parser.iter_pages(source)
+        else:
+            yield from self.load_document(source, source_type)
+
     def split_documents(self, documents: List[Document]) -> List[Document]:
-        """Split documents into smaller chunks."""
-        split_docs = []
-        for doc in documents:
-            chunks = self.text_splitter.split_text(doc.page_content)
-            for chunk in chunks:
-                split_docs.append(Document(page_content=chunk, metadata=doc.metadata))
-        return split_docs
+        """Split documents into smaller chunks with start/end offsets in their metadata."""
+        return self.text_splitter.split_documents(documents)
     
     def process(self, source: Union[str, Path], source_type: str) -> List[Document]:
         """Load and split documents from the given source."""
@@ -0,0 +1,236 @@
+# RAG_APP/src/document_ingestion_Module/pdfParser.py returns whole files instead of streaming,
+# but shares the page Documents' metadata and the {"pages": [...]} cache file; keep those in step.
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+import json
+import os
+
+from pypdf import PdfReader
+from langchain_core.documents import Document
+
+from src.document_ingestion.source_manifest import file_sha256
+
+
+def _extract_pages(pdf_path: str, start: int, end: int) -> List[str]:
+    """Worker: extract the text of pages [start, end) of a PDF."""
+    reader = PdfReader(pdf_path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def _capture(func, *args):
+    """Call func, returning its exception instead of raising it."""
+    try:
+        return func(*args)
+    except Exception as e:
+        return e
+
+
+class ParallelPDFParser:
+    """
+    Extracts PDF text page by page across a process pool.
+
+    Each file is split into page ranges that are parsed in parallel and
+    merged back in page order, producing the same Documents (one per page,
+    with "source" and "page" metadata) as PyPDFLoader. Extracted page text
+    is cached on disk by file hash, so unchanged PDFs are never re-parsed.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, pages_per_task: int = 8, cache_dir=None):
+        """
+        Args:
+            max_workers (int, optional): Worker processes; defaults to the CPU count.
+            pages_per_task (int): Pages handed to a worker at a time.
+            cache_dir (optional): Directory of the page-text cache; disabled when None.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pages_per_task = pages_per_task
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._pool = None
+
+    def parse(self, pdf_path) -> List[Document]:
+        """Parse a single PDF into one Document per page."""
+        return self.parse_many([pdf_path])[0]
+
+    def iter_pages(self, pdf_path) -> Iterator[Document]:
+        """
+        Yield one Document per page in page order while later ranges are still being parsed.
+
+        At most two page ranges per worker are submitted ahead of the
+        consumer and pages are appended to the cache file as they are
+        yielded, so memory is bounded by that window, not by the document.
+        """
+        pdf_path = str(pdf_path)
+        file_hash = file_sha256(pdf_path)
+        pages = self._read_cache(file_hash)
+        if pages is not None:
+            yield from self._to_documents(pdf_path, pages)
+            return
+
+        total = len(PdfReader(pdf_path).pages)
+        ranges = [(start, min(start + self.pages_per_task, total)) for start in range(0, total, self.pages_per_task)]
+        page = 0
+        with self._cache_writer(file_hash) as write:
+            for part in self._iter_ranges(pdf_path, ranges):
+                for text in part:
+                    write(text)
+                    yield self._document(pdf_path, page, text, total)
+                    page += 1
+
+    def _iter_ranges(self, pdf_path: str, ranges: List[Tuple[int, int]]) -> Iterator[List[str]]:
+        """Page texts of each range in order, keeping at most 2 * max_workers ranges submitted."""
+        if len(ranges) <= 1 or self.max_workers <= 1:
+            for start, end in ranges:
+                yield _extract_pages(pdf_path, start, end)
+            return
+
+        pool = self._get_pool()
+        remaining = iter(ranges)
+        window = deque(
+            pool.submit(_extract_pages, pdf_path, start, end)
+            for start, end in islice(remaining, 2 * self.max_workers)
+        )
+        try:
+            while window:
+                part = window.popleft().result()
+                # Refill before handing the part over, so workers stay busy while it is consumed
+                for start, end in islice(remaining, 1):
+                    window.append(pool.submit(_extract_pages, pdf_path, start, end))
+                yield part
+        finally:
+            for future in window:
+                future.cancel()
+
+    def parse_many(self, pdf_paths, return_exceptions: bool = False) -> list:
+        """
+        Parse several PDFs, sharing one worker pool across all of their pages.
+
+        Args:
+            pdf_paths: Paths of the PDF files.
+            return_exceptions (bool): Put a file's exception in its result slot
+                instead of raising it.
+
+        Returns:
+            list: Per input path, its page Documents (or the exception raised).
+        """
+        pdf_paths = [str(path) for path in pdf_paths]
+        results = [None] * len(pdf_paths)
+        pending = {}
+
+        for i, pdf_path in enumerate(pdf_paths):
+            try:
+                file_hash = file_sha256(pdf_path)
+                pages = self._read_cache(file_hash)
+                if pages is None:
+                    pending[i] = (file_hash, len(PdfReader(pdf_path).pages))
+                else:
+                    results[i] = self._to_documents(pdf_path, pages)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results[i] = e
+
+        tasks = [
+            (i, start, min(start + self.pages_per_task, total))
+            for i, (_, total) in pending.items()
+            for start in range(0, total, self.pages_per_task)
+        ]
+        if len(tasks) > 1 and self.max_workers > 1:
+            pool = self._get_pool()
+            futures = [
+                (i, pool.submit(_extract_pages, pdf_paths[i], start, end))
+                for i, start, end in tasks
+            ]
+            parts = [(i, _capture(future.result)) for i, future in futures]
+        else:
+            parts = [
+                (i, _capture(_extract_pages, pdf_paths[i], start, end))
+                for i, start, end in tasks
+            ]
+
+        # Tasks were created in page order, so concatenating the parts keeps it
+        parts_by_file = {i: [] for i in pending}
+        for i, part in parts:
+            parts_by_file[i].append(part)
+
+        for i, file_parts in parts_by_file.items():
+            error = next((part for part in file_parts if isinstance(part, Exception)), None)
+            if error is not None:
+                if not return_exceptions:
+                    raise error
+                results[i] = error
+                continue
+            pages = [text for part in file_parts for text in part]
+            self._write_cache(pending[i][0], pages)
+            results[i] = self._to_documents(pdf_paths[i], pages)
+        return results
+
+    def close(self):
+        """Shut down the worker pool if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Start the worker pool on first use and reuse it afterwards."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    @staticmethod
+    def _document(pdf_path: str, page: int, text: str, total_pages: int) -> Document:
+        return Document(
+            page_content=text,
+            metadata={"source": pdf_path, "page": page, "total_pages": total_pages}
+        )
+
+    @classmethod
+    def _to_documents(cls, pdf_path: str, pages: List[str]) -> List[Document]:
+        return [cls._document(pdf_path, page, text, len(pages)) for page, text in enumerate(pages)]
+
+    def _read_cache(self, file_hash: str) -> Optional[List[str]]:
+        if self.cache_dir is None:
+            return None
+        path = self.cache_dir / f"{file_hash}.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))["pages"]
+
+    def _write_cache(self, file_hash: str, pages: List[str]):
+        with self._cache_writer(file_hash) as write:
+            for text in pages:
+                write(text)
+
+    @contextmanager
+    def _cache_writer(self, file_hash: str):
+        """
+        Yields a function appending one page text to the cache file. The file
+        is published only once every page was written; an interrupted
+        write leaves no cache entry.
+        """
+        if self.cache_dir is None:
+            yield lambda text: None
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_dir / f"{file_hash}.tmp"
+        written = 0
+
+        def write(text: str):
+            nonlocal written
+            f.write((", " if written else "") + json.dumps(text))
+            written += 1
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write('{"pages": [')
+            try:
+                yield write
+            except BaseException:
+                f.close()
+                tmp_path.unlink(missing_ok=True)
+                raise
+            f.write("]}")
+        os.replace(tmp_path, self.cache_dir / f"{file_hash}.json")
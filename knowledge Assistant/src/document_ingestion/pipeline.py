@@ -0,0 +1,208 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Set
+import hashlib
+import queue
+import threading
+
+from langchain_core.documents import Document
+
+
+def chunk_id(source: str, occurrence: int, text: str) -> str:
+    """Stable chunk id from its source, the occurrence number of its text in that source, and the text."""
+    return hashlib.sha256(f"{source}\0{occurrence}\0{text}".encode("utf-8")).hexdigest()[:32]
+
+
+@dataclass
+class IngestionJob:
+    """A source to (re-)ingest: its documents are produced lazily by `load`."""
+    source: str
+    fingerprint: str
+    load: Callable[[], Iterable[Document]]
+    existing_ids: Set[str] = field(default_factory=set)
+
+
+@dataclass
+class _SourceEnd:
+    source: str
+    chunk_ids: List[str] = field(default_factory=list)
+    error: Exception = None
+
+
+_DONE = object()
+
+
+class StreamingIngestionPipeline:
+    """
+    load -> split -> embed -> upsert, one thread per stage.
+
+    Stages are connected by bounded queues, so at most `queue_size` batches
+    wait between any two stages and memory stays flat however large the
+    corpus is. Chunks are written to the store batch by batch, so the first
+    ones are searchable while later files are still being parsed.
+    """
+
+    def __init__(self, doc_processor, vector_store, embed_batch_size: int = 64,
+                 upsert_batch_size: int = 256, queue_size: int = 4):
+        self.doc_processor = doc_processor
+        self.vector_store = vector_store
+        self.embed_batch_size = embed_batch_size
+        self.upsert_batch_size = upsert_batch_size
+        self.queue_size = queue_size
+
+    def run(self, jobs: Iterable[IngestionJob]) -> List[dict]:
+        """
+        Stream every job through the pipeline.
+
+        Chunks whose id is already in the job's `existing_ids` are not
+        re-embedded; existing ids that no longer occur are deleted once the
+        source has been fully written.
+
+        Returns:
+            List[dict]: Per source, its status, chunk ids and added/deleted counts.
+        """
+        self._stop = threading.Event()
+        self._errors = []
+        self._results = []
+        pages = queue.Queue(self.queue_size)
+        batches = queue.Queue(self.queue_size)
+        embedded = queue.Queue(self.queue_size)
+        jobs = list(jobs)
+
+        stages = [
+            threading.Thread(target=self._stage, args=(self._load, jobs, pages), daemon=True),
+            threading.Thread(target=self._stage, args=(self._split, jobs, pages, batches), daemon=True),
+            threading.Thread(target=self._stage, args=(self._embed, batches, embedded), daemon=True),
+            threading.Thread(target=self._stage, args=(self._upsert, jobs, embedded), daemon=True),
+        ]
+        for stage in stages:
+            stage.start()
+        for stage in stages:
+            stage.join()
+        if self._errors:
+            raise self._errors[0]
+        return self._results
+
+    def _stage(self, func, *args):
+        try:
+            func(*args)
+        except Exception as e:
+            self._errors.append(e)
+            self._stop.set()
+
+    def _put(self, q: queue.Queue, item):
+        """Blocking put that gives up once another stage has failed."""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, q: queue.Queue):
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _load(self, jobs: List[IngestionJob], out: queue.Queue):
+        for job in jobs:
+            try:
+                for document in job.load():
+                    self._put(out, document)
+                self._put(out, _SourceEnd(job.source))
+            except Exception as e:
+                self._put(out, _SourceEnd(job.source, error=e))
+        self._put(out, _DONE)
+
+    def _split(self, jobs: List[IngestionJob], inp: queue.Queue, out: queue.Queue):
+        jobs = iter(jobs)
+        job = next(jobs, None)
+        occurrences = Counter()
+        ids = []
+        batch = []
+        while True:
+            item = self._get(inp)
+            if item is _DONE:
+                break
+            if isinstance(item, _SourceEnd):
+                if batch:
+                    self._put(out, batch)
+                    batch = []
+                item.chunk_ids = ids
+                self._put(out, item)
+                job = next(jobs, None)
+                occurrences = Counter()
+                ids = []
+                continue
+            for chunk in self.doc_processor.split_documents([item]):
+                occurrence = occurrences[chunk.page_content]
+                occurrences[chunk.page_content] += 1
+                chunk_key = chunk_id(job.source, occurrence, chunk.page_content)
+                ids.append(chunk_key)
+                if chunk_key in job.existing_ids:
+                    continue
+                chunk.metadata = {**chunk.metadata, "chunk_id": chunk_key}
+                batch.append(chunk)
+                if len(batch) >= self.embed_batch_size:
+                    self._put(out, batch)
+                    batch = []
+        self._put(out, _DONE)
+
+    def _embed(self, inp: queue.Queue, out: queue.Queue):
+        while True:
+            item = self._get(inp)
+            if item is _DONE:
+                break
+            if isinstance(item, _SourceEnd):
+                self._put(out, item)
+                continue
+            vectors = self.vector_store.embeddings.embed_documents([chunk.page_content for chunk in item])
+            self._put(out, (item, vectors))
+        self._put(out, _DONE)
+
+    def _upsert(self, jobs: List[IngestionJob], inp: queue.Queue):
+        jobs = {job.source: job for job in jobs}
+        chunks, vectors = [], []
+        written = []
+
+        def flush():
+            if chunks:
+                self.vector_store.upsert_embeddings(chunks, vectors)
+                written.extend(chunk.metadata["chunk_id"] for chunk in chunks)
+                chunks.clear()
+                vectors.clear()
+
+        while True:
+            item = self._get(inp)
+            if item is _DONE:
+                break
+            if isinstance(item, _SourceEnd):
+                flush()
+                job = jobs[item.source]
+                if item.error is not None:
+                    # Undo the partial write; the source keeps its previous chunks
+                    self.vector_store.delete(sorted(set(written) - job.existing_ids))
+                    self._results.append({"source": item.source, "status": "error", "error": item.error})
+                else:
+                    stale_ids = sorted(job.existing_ids - set(item.chunk_ids))
+                    self.vector_store.delete(stale_ids)
+                    self._results.append({
+                        "source": item.source,
+                        "status": "updated",
+                        "fingerprint": job.fingerprint,
+                        "chunk_ids": item.chunk_ids,
+                        "chunks": len(item.chunk_ids),
+                        "added": len(written),
+                        "deleted": len(stale_ids)
+                    })
+                written.clear()
+                continue
+            batch_chunks, batch_vectors = item
+            chunks.extend(batch_chunks)
+            vectors.extend(batch_vectors)
+            if len(chunks) >= self.upsert_batch_size:
+                flush()
+        self.vector_store.persist()
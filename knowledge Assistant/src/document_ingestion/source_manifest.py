@@ -0,0 +1,170 @@
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+import hashlib
+import json
+import os
+import time
+
+from langchain_core.documents import Document
+
+from src.document_ingestion.pipeline import IngestionJob
+from src.document_ingestion.web_loader import WebPage
+
+
+def file_sha256(path: Union[str, Path]) -> str:
+    """Content hash of a file, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def documents_sha256(documents: List[Document]) -> str:
+    """Content hash of loaded documents (used for web pages)."""
+    digest = hashlib.sha256()
+    for doc in documents:
+        digest.update(doc.page_content.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class SourceManifest:
+    """Fingerprint, chunk ids and last check time of every source in the vector store."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.sources: Dict[str, dict] = {}
+        if self.path.exists():
+            self.sources = json.loads(self.path.read_text(encoding="utf-8")).get("sources", {})
+
+    def get(self, source: str) -> Optional[dict]:
+        return self.sources.get(source)
+
+    def record(self, source: str, fingerprint: str, chunk_ids: List[str]):
+        self.sources[source] = {
+            "fingerprint": fingerprint,
+            "chunk_ids": list(chunk_ids),
+            "checked_at": time.time()
+        }
+
+    def touch(self, source: str):
+        self.sources[source]["checked_at"] = time.time()
+
+    def remove(self, source: str) -> List[str]:
+        return self.sources.pop(source, {}).get("chunk_ids", [])
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"sources": self.sources}), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+class SourceSync:
+    """Keeps a persistent vector store in step with the configured PDFs and URLs."""
+
+    def __init__(self, doc_processor, pipeline, manifest: SourceManifest,
+                 url_refresh_seconds: float = 0, web_loader=None):
+        self.doc_processor = doc_processor
+        self.pipeline = pipeline
+        self.manifest = manifest
+        self.url_refresh_seconds = url_refresh_seconds
+        self.web_loader = web_loader
+
+    def sync(self, pdf_paths: List[Union[str, Path]], urls: List[str]) -> List[dict]:
+        """
+        Re-ingest the PDFs whose file hash changed and the URLs that are due
+        for a refresh and whose text changed, streaming them through the
+        ingestion pipeline. With a web loader, URLs are fetched concurrently
+        and a 304 Not Modified counts as unchanged.
+
+        Returns:
+            List[dict]: One result per source, in input order.
+        """
+        results = {}
+        jobs = []
+        for path in pdf_paths:
+            source = Path(path).as_posix()
+            try:
+                fingerprint = file_sha256(path)
+            except Exception as e:
+                results[source] = {"source": source, "status": "error", "error": e}
+                continue
+            if not self._is_current(source, fingerprint, results):
+                jobs.append(self._job(source, fingerprint, partial(self.doc_processor.iter_documents, path, "pdf")))
+
+        due = []
+        for url in urls:
+            entry = self.manifest.get(url)
+            if entry is not None and time.time() - entry["checked_at"] < self.url_refresh_seconds:
+                results[url] = self._result(url, entry)
+            else:
+                due.append(url)
+
+        for url, page in zip(due, self._load_urls(due)):
+            if isinstance(page, Exception):
+                results[url] = {"source": url, "status": "error", "error": page}
+                continue
+            entry = self.manifest.get(url)
+            if page.not_modified and entry is not None:
+                self.manifest.touch(url)
+                results[url] = self._result(url, entry)
+                continue
+            fingerprint = documents_sha256(page.documents)
+            if not self._is_current(url, fingerprint, results):
+                jobs.append(self._job(url, fingerprint, partial(iter, page.documents)))
+
+        for result in self.pipeline.run(jobs):
+            if result["status"] == "updated":
+                self.manifest.record(result["source"], result["fingerprint"], result["chunk_ids"])
+            results[result["source"]] = result
+
+        order = [Path(path).as_posix() for path in pdf_paths] + list(urls)
+        return [results[source] for source in order]
+
+    def prune(self, keep: Iterable[str]) -> List[str]:
+        """Delete the chunks of sources that are no longer configured."""
+        keep = set(keep)
+        removed = [source for source in self.manifest.sources if source not in keep]
+        for source in removed:
+            self.pipeline.vector_store.delete(self.manifest.remove(source))
+        return removed
+
+    def save(self):
+        self.manifest.save()
+
+    def _load_urls(self, urls: List[str]) -> List[Union[WebPage, Exception]]:
+        if self.web_loader is not None:
+            return self.web_loader.load_many(urls)
+        pages = []
+        for url in urls:
+            try:
+                pages.append(WebPage(url, False, self.doc_processor.load_document(url, "web")))
+            except Exception as e:
+                pages.append(e)
+        return pages
+
+    def _is_current(self, source: str, fingerprint: str, results: dict) -> bool:
+        entry = self.manifest.get(source)
+        if entry is not None and entry["fingerprint"] == fingerprint:
+            self.manifest.touch(source)
+            results[source] = self._result(source, entry)
+            return True
+        return False
+
+    def _job(self, source: str, fingerprint: str, load) -> IngestionJob:
+        entry = self.manifest.get(source)
+        existing_ids = set(entry["chunk_ids"]) if entry else set()
+        return IngestionJob(source, fingerprint, load, existing_ids)
+
+    @staticmethod
+    def _result(source: str, entry: dict) -> dict:
+        return {
+            "source": source,
+            "status": "unchanged",
+            "chunks": len(entry["chunk_ids"]),
+            "added": 0,
+            "deleted": 0
+        }
@@ -0,0 +1,134 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlsplit
+import asyncio
+import hashlib
+import json
+import os
+
+import httpx
+from bs4 import BeautifulSoup
+from langchain_core.documents import Document
+
+
+@dataclass
+class WebPage:
+    """Result of loading one URL."""
+    url: str
+    not_modified: bool
+    documents: List[Document] = field(default_factory=list)
+
+
+class AsyncWebLoader:
+    """
+    Fetches many URLs concurrently over one pooled HTTP client.
+
+    Raw responses are cached on disk together with their ETag and
+    Last-Modified headers; the next fetch of a URL is a conditional GET, and
+    a 304 answer is served from the cache without re-downloading. Documents
+    carry the same metadata (source, title, description, language) as
+    WebBaseLoader.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, max_connections: int = 20,
+                 max_per_host: int = 4, timeout: float = 20.0, headers: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            cache_dir: Directory of the response cache; conditional GETs are disabled when None.
+            max_connections (int): Size of the client connection pool.
+            max_per_host (int): Maximum concurrent requests per host.
+            timeout (float): Per-request timeout in seconds.
+            headers (dict, optional): Extra request headers.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.headers = {"User-Agent": "knowledge-assistant/0.1", **(headers or {})}
+
+    def load_many(self, urls: List[str]) -> List[Union[WebPage, Exception]]:
+        """Synchronous wrapper around `aload_many`."""
+        return asyncio.run(self.aload_many(urls))
+
+    async def aload_many(self, urls: List[str]) -> List[Union[WebPage, Exception]]:
+        """Fetch all URLs concurrently; a failing URL yields its exception."""
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections
+        )
+        async with httpx.AsyncClient(
+            limits=limits,
+            timeout=httpx.Timeout(self.timeout),
+            headers=self.headers,
+            follow_redirects=True
+        ) as client:
+            return await asyncio.gather(
+                *(self._load(client, url, host_limits) for url in urls),
+                return_exceptions=True
+            )
+
+    async def _load(self, client: httpx.AsyncClient, url: str,
+                    host_limits: Dict[str, asyncio.Semaphore]) -> WebPage:
+        cached = self._read_cache(url)
+        headers = {}
+        if cached is not None:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        host = urlsplit(url).netloc
+        limit = host_limits.setdefault(host, asyncio.Semaphore(self.max_per_host))
+        async with limit:
+            response = await client.get(url, headers=headers)
+
+        if response.status_code == 304 and cached is not None:
+            return WebPage(url, True, [self._to_document(url, cached["body"], cached["encoding"])])
+        response.raise_for_status()
+        self._write_cache(url, response)
+        return WebPage(url, False, [self._to_document(url, response.content, response.encoding)])
+
+    @staticmethod
+    def _to_document(url: str, body: bytes, encoding: Optional[str]) -> Document:
+        soup = BeautifulSoup(body, "html.parser", from_encoding=encoding)
+        metadata = {"source": url}
+        if soup.title is not None:
+            metadata["title"] = soup.title.get_text()
+        description = soup.find("meta", attrs={"name": "description"})
+        if description is not None:
+            metadata["description"] = description.get("content", "No description found.")
+        html = soup.find("html")
+        if html is not None:
+            metadata["language"] = html.get("lang", "No language found.")
+        return Document(page_content=soup.get_text(), metadata=metadata)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def _read_cache(self, url: str) -> Optional[dict]:
+        if self.cache_dir is None:
+            return None
+        meta_path, body_path = self._paths(url)
+        if not (meta_path.exists() and body_path.exists()):
+            return None
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        meta["body"] = body_path.read_bytes()
+        return meta
+
+    def _write_cache(self, url: str, response: httpx.Response):
+        if self.cache_dir is None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        meta_path, body_path = self._paths(url)
+        tmp_path = body_path.with_suffix(".tmp")
+        tmp_path.write_bytes(response.content)
+        os.replace(tmp_path, body_path)
+        meta_path.write_text(json.dumps({
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "encoding": response.encoding
+        }), encoding="utf-8")
@@ -1,21 +1,26 @@
+from typing import AsyncIterator, Iterator, List, Tuple
+import time
+
+from langchain_core.documents import Document
 from langgraph.graph import StateGraph , END
 from src.state.rag_state import RAGState
 from src.nodes.nodes import RAGNodes
+from src.telemetry.tracing import telemetry
 
 
 class GraphBuilder:
 
-    def __init__(self , retriever , llm):
+    def __init__(self , retriever , llm , answer_cache = None , packer = None):
 
         self.retriever = retriever
         self.llm = llm
-        self.nodes = RAGNodes(retriever=retriever, llm=llm)
+        self.nodes = RAGNodes(retriever=retriever, llm=llm, answer_cache=answer_cache, packer=packer)
         self.graph = None
 
         builder  = StateGraph(RAGState)
 
-        builder.add_node("retriever", self.nodes.retriever_docs)
-        builder.add_node("responser", self.nodes.generate_answer)
+        builder.add_node("retriever", self._traced("retriever", self.nodes.retriever_docs))
+        builder.add_node("responser", self._traced("responser", self.nodes.generate_answer))
 
         builder.set_entry_point("retriever")
 
@@ -25,8 +30,102 @@ class GraphBuilder:
         self.graph = builder.compile()
     
 
+    @staticmethod
+    def _traced(name : str , node):
+        """Run a graph node inside a span named after it."""
+
+        def traced_node(state : RAGState) -> dict :
+            with telemetry.span(f"graph.{name}"):
+                return node(state)
+
+        return traced_node
+
+
     def run(self , question : str) -> RAGState :
 
-        initial_state = RAGState(question=question)
-        final_state = self.graph.invoke(initial_state)
+        with telemetry.span("graph.run"):
+            initial_state = RAGState(question=question)
+            final_state = self.graph.invoke(initial_state)
         return final_state
+
+
+    def stream(self , question : str) -> Tuple[List[Document], Iterator[str]] :
+        """
+        Runs the compiled graph, returning once the retriever node has
+        finished; the responser node's answer is then streamed token by token.
+
+        Returns:
+            The retrieved documents and an iterator over the answer tokens.
+        """
+        events = self.graph.stream(RAGState(question=question), stream_mode=["updates", "messages"])
+        documents = []
+        for mode, data in events:
+            if mode == "updates" and "retriever" in data:
+                documents = data["retriever"]["retrieved_documents"]
+                break
+        return documents, self._answer_tokens(events)
+
+
+    async def astream(self , question : str) -> Tuple[List[Document], AsyncIterator[str]] :
+        """Async counterpart of `stream`."""
+
+        events = self.graph.astream(RAGState(question=question), stream_mode=["updates", "messages"])
+        documents = []
+        async for mode, data in events:
+            if mode == "updates" and "retriever" in data:
+                documents = data["retriever"]["retrieved_documents"]
+                break
+        return documents, self._aanswer_tokens(events)
+
+
+    def _answer_tokens(self , events) -> Iterator[str] :
+        """Tokens the responser node's LLM call emits; a cached answer is yielded whole."""
+
+        timer = _StreamTimer(self.nodes.model_name)
+        for mode, data in events:
+            token = timer.token(mode, data)
+            if token:
+                yield token
+        timer.finish()
+
+
+    async def _aanswer_tokens(self , events) -> AsyncIterator[str] :
+
+        timer = _StreamTimer(self.nodes.model_name)
+        async for mode, data in events:
+            token = timer.token(mode, data)
+            if token:
+                yield token
+        timer.finish()
+
+
+class _StreamTimer:
+    """Picks answer tokens out of the graph's stream events and times them."""
+
+    def __init__(self , model_name : str):
+
+        self.model_name = model_name
+        self.streamed = False
+        self.start = time.perf_counter()
+
+
+    def token(self , mode : str , data) -> str :
+
+        if mode == "messages":
+            chunk, metadata = data
+            if metadata.get("langgraph_node") != "responser" or not chunk.content:
+                return ""
+            if not self.streamed:
+                self.streamed = True
+                telemetry.observe("llm_first_token_seconds", time.perf_counter() - self.start, model=self.model_name)
+            return chunk.content
+        # Nothing was streamed for a cached answer
+        if "responser" in data and not self.streamed:
+            return data["responser"]["answer"]
+        return ""
+
+
+    def finish(self):
+
+        if self.streamed:
+            telemetry.observe("llm_stream_seconds", time.perf_counter() - self.start, model=self.model_name)
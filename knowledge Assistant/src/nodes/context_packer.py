@@ -0,0 +1,167 @@
+# Identical to RAG_APP/src/llm_call/contextPacker.py; change both copies together.
+
+from typing import Callable, Dict, List, Optional, Tuple
+import re
+
+from langchain_core.documents import Document
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+_WORD = re.compile(r"\w+")
+
+
+def _shingles(text: str, size: int = 3) -> set:
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {tuple(words)}
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _token_counter(encoding: str) -> Callable[[str], int]:
+    """tiktoken when it is installed, otherwise roughly four characters per token."""
+    if tiktoken is not None:
+        try:
+            encoder = tiktoken.get_encoding(encoding)
+            return lambda text: len(encoder.encode(text, disallowed_special=()))
+        except Exception:
+            pass
+    return lambda text: (len(text) + 3) // 4
+
+
+class ContextPacker:
+    """
+    Turns retrieved chunks into the smallest context that carries the same text.
+
+    In order: drops hits whose score falls off sharply below the previous
+    one, merges chunks of the same page that overlap or touch (so the
+    chunk overlap is sent once), drops passages that are near-duplicates
+    of a better-ranked one, and fills a token budget in rank order,
+    cutting the last passage at a word boundary.
+    """
+
+    def __init__(self, max_tokens: int = 3000, score_gap: float = 0.25, min_docs: int = 2,
+                 duplicate_threshold: float = 0.9, encoding: str = "cl100k_base"):
+        """ Initialize the context packer
+
+        Args:
+            max_tokens (int): Token budget of the packed context.
+            score_gap (float): Relative score drop that ends the list of hits; 0 disables trimming.
+            min_docs (int): Hits always kept, whatever their scores.
+            duplicate_threshold (float): Word 3-gram Jaccard similarity above which a passage is dropped.
+            encoding (str): tiktoken encoding used to count tokens.
+        """
+        self.max_tokens = max_tokens
+        self.score_gap = score_gap
+        self.min_docs = min_docs
+        self.duplicate_threshold = duplicate_threshold
+        self.count_tokens = _token_counter(encoding)
+
+    def pack(self, documents: List[Document]) -> List[Document]:
+        """
+        Args:
+            documents (List[Document]): Retrieved chunks, best first. A
+                "score" in their metadata enables score-gap trimming.
+
+        Returns:
+            List[Document]: The passages to put in the prompt, best first.
+        """
+        documents = self._trim_by_score(documents)
+        documents = self._merge_adjacent(documents)
+        documents = self._drop_duplicates(documents)
+        return self._fit_budget(documents)
+
+    def _trim_by_score(self, documents: List[Document]) -> List[Document]:
+        if self.score_gap <= 0:
+            return documents
+        scores = [doc.metadata.get("score") for doc in documents]
+        if any(score is None for score in scores):
+            return documents
+        for i in range(max(self.min_docs, 1), len(documents)):
+            if scores[i - 1] > 0 and scores[i] < scores[i - 1] * (1 - self.score_gap):
+                return documents[:i]
+        return documents
+
+    @staticmethod
+    def _merge_adjacent(documents: List[Document]) -> List[Document]:
+        # (source, page) -> [(start, end, text, best rank, metadata)], merged in offset order
+        groups: Dict[Tuple, List[list]] = {}
+        passages: List[Tuple[int, Document]] = []
+        for rank, doc in enumerate(documents):
+            start = doc.metadata.get("start_index")
+            end = doc.metadata.get("end_index")
+            if start is None or end is None:
+                passages.append((rank, doc))
+                continue
+            key = (doc.metadata.get("source"), doc.metadata.get("page"))
+            groups.setdefault(key, []).append([start, end, doc.page_content, rank, doc.metadata])
+
+        for spans in groups.values():
+            spans.sort(key=lambda span: span[0])
+            merged = [spans[0]]
+            for start, end, text, rank, metadata in spans[1:]:
+                current = merged[-1]
+                # Separated only by the whitespace the chunker trimmed
+                if start <= current[1] + 1:
+                    if end > current[1]:
+                        current[2] += text[current[1] - start:] if start <= current[1] else " " + text
+                        current[1] = end
+                    current[3] = min(current[3], rank)
+                else:
+                    merged.append([start, end, text, rank, metadata])
+            for start, end, text, rank, metadata in merged:
+                passages.append((rank, Document(
+                    page_content=text,
+                    metadata={**metadata, "start_index": start, "end_index": end}
+                )))
+
+        passages.sort(key=lambda passage: passage[0])
+        return [doc for _, doc in passages]
+
+    def _drop_duplicates(self, documents: List[Document]) -> List[Document]:
+        kept: List[Document] = []
+        kept_shingles: List[set] = []
+        for doc in documents:
+            shingles = _shingles(doc.page_content)
+            if any(
+                len(shingles & other) / max(len(shingles | other), 1) >= self.duplicate_threshold
+                for other in kept_shingles
+            ):
+                continue
+            kept.append(doc)
+            kept_shingles.append(shingles)
+        return kept
+
+    def _fit_budget(self, documents: List[Document]) -> List[Document]:
+        packed = []
+        remaining = self.max_tokens
+        for doc in documents:
+            tokens = self.count_tokens(doc.page_content)
+            if tokens <= remaining:
+                packed.append(doc)
+                remaining -= tokens
+                continue
+            text = self._truncate(doc.page_content, remaining)
+            if text:
+                packed.append(Document(page_content=text, metadata=dict(doc.metadata)))
+            break
+        return packed
+
+    def _truncate(self, text: str, max_tokens: int) -> Optional[str]:
+        """Longest prefix ending at a word boundary that fits max_tokens."""
+        if max_tokens <= 0:
+            return None
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.count_tokens(text[:middle]) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        cut = text.rfind(" ", 0, low) if low < len(text) else low
+        if cut <= 0:
+            return None
+        return text[:cut].rstrip() or None
@@ -1,18 +1,31 @@
+from typing import List
+
+from langchain_core.documents import Document
+
 from src.state.rag_state import RAGState
+from src.telemetry.tracing import telemetry
+
+
+# Part of the answer cache key; bump whenever the prompt in generate_answer changes
+PROMPT_TEMPLATE_VERSION = "2"
 
 
 class RAGNodes :
 
-    def __init__(self , retriever , llm):
+    def __init__(self , retriever , llm , answer_cache = None , packer = None):
 
 
         self.retriever = retriever
         self.llm = llm
+        self.answer_cache = answer_cache
+        self.packer = packer
+        self.model_name = getattr(llm, "model_name", None) or type(llm).__name__
 
 
     def retriever_docs(self , state : RAGState) -> dict :
 
         docs = self.retriever.invoke(state.question)
+        telemetry.observe("documents_retrieved", len(docs))
         return {
             "retrieved_documents": docs
         }
@@ -20,11 +33,47 @@ class RAGNodes :
 
     def generate_answer(self , state : RAGState) -> dict :
 
-        context = "\n".join([doc.page_content for doc in state.retrieved_documents])
-        prompt = f"Answer the question based on the context below:\n\nContext: {context}\n\nQuestion: {state.question}\n\nAnswer:"
-        response = self.llm.invoke(prompt)
+        answer = self._cached_answer(state.question, state.retrieved_documents)
+        if answer is not None:
+            return {
+                "answer": answer
+            }
+
+        prompt = self._build_prompt(state.question, state.retrieved_documents)
+        with telemetry.span("llm.invoke", model=self.model_name):
+            response = self.llm.invoke(prompt)
+        usage = getattr(response, "usage_metadata", None) or {}
+        if "input_tokens" in usage:
+            telemetry.observe("llm_prompt_tokens", usage["input_tokens"], model=self.model_name)
+        if "output_tokens" in usage:
+            telemetry.observe("llm_completion_tokens", usage["output_tokens"], model=self.model_name)
+        if self.answer_cache is not None:
+            with telemetry.span("llm.answer_cache_put"):
+                self.answer_cache.put(
+                    self.model_name, PROMPT_TEMPLATE_VERSION, state.question, state.retrieved_documents, response.content
+                )
        
         return {
             "answer": response.content
         }
-    
\ No newline at end of file
+
+
+    def _cached_answer(self , question : str , documents : List[Document]) :
+
+        if self.answer_cache is None:
+            return None
+        with telemetry.span("llm.answer_cache_get"):
+            answer = self.answer_cache.get(self.model_name, PROMPT_TEMPLATE_VERSION, question, documents)
+        telemetry.count("cache_requests", cache="answer", result="miss" if answer is None else "hit")
+        return answer
+
+
+    def _build_prompt(self , question : str , documents : List[Document]) -> str :
+
+        with telemetry.span("llm.build_prompt", documents=len(documents)) as span:
+            if self.packer is not None:
+                documents = self.packer.pack(documents)
+                span.set("packed_documents", len(documents))
+            context = "\n".join([doc.page_content for doc in documents])
+            telemetry.observe("context_characters", len(context))
+        return f"Answer the question based on the context below:\n\nContext: {context}\n\nQuestion: {question}\n\nAnswer:"
@@ -1,28 +1,116 @@
-from typing import List
+from typing import List, Optional
+from pathlib import Path
+import re
+import shutil
 from langchain_community.vectorstores import Chroma
 from langchain_core.documents import Document
-from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_core.embeddings import Embeddings
+
+from src.vectorstore.embedding_cache import CachedEmbeddings, EmbeddingCache
+from src.vectorstore.runtime import load_model, model_id
+
+
+class SentenceTransformerEmbeddings(Embeddings):
+    """
+    LangChain embeddings over an already loaded SentenceTransformer, encoding
+    the way HuggingFaceEmbeddings does, so runtime.load_model (with its
+    quantized-export fallback) picks the model.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        texts = [text.replace("\n", " ") for text in texts]
+        return self.client.encode(texts, show_progress_bar=False).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
 
 
 
 
 class VectorStore:   
 
-    def __init__(self, persist_directory: str = "vectorstore_data"):
+    def __init__(self, persist_directory: str = "vectorstore_data",
+                 model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+                 cache_dir: Optional[str] = None,
+                 cache_max_entries: int = 200_000,
+                 backend: str = "torch",
+                 quantize: bool = False,
+                 num_threads: Optional[int] = None):
+        """
+        Args:
+            persist_directory (str): Chroma persistence directory.
+            model_name (str): Sentence-transformers embedding model.
+            cache_dir (str, optional): Persistent embedding cache directory; disabled when None.
+            cache_max_entries (int): Maximum number of cached vectors.
+            backend (str): "torch", or "onnx" to run the exported ONNX model with ONNX Runtime.
+            quantize (bool): Use the int8 dynamically quantized ONNX model (onnx backend only).
+            num_threads (int, optional): Intra-op CPU threads; library default when None.
+        """
         self.persist_directory = persist_directory
-        self.embeddings = HuggingFaceEmbeddings(
-    model_name="sentence-transformers/all-MiniLM-L6-v2"
-)
+        self._delete_listeners = []
+        self.embeddings = SentenceTransformerEmbeddings(load_model(model_name, backend, quantize, num_threads))
+        if cache_dir is not None:
+            cache = EmbeddingCache(
+                cache_dir,
+                # Quantized vectors are cached apart from the float32 ones
+                model_name=model_id(model_name, backend, quantize),
+                dimension=self.embeddings.client.get_sentence_embedding_dimension(),
+                max_entries=cache_max_entries
+            )
+            self.embeddings = CachedEmbeddings(self.embeddings, cache)
         self.vectorstore = Chroma(
             persist_directory=self.persist_directory,
             embedding_function=self.embeddings
         )
 
-    def add_documents(self, documents: List[Document]):
-        """Add documents to the vector store."""
-        self.vectorstore.add_documents(documents)
+    def add_documents(self, documents: List[Document], ids: Optional[List[str]] = None):
+        """Add documents to the vector store; existing ids are overwritten."""
+        self.vectorstore.add_documents(documents, ids=ids)
+        self.vectorstore.persist()
+
+    def upsert_embeddings(self, documents: List[Document], embeddings: List[List[float]]):
+        """Write already-embedded documents, keyed by their metadata["chunk_id"]."""
+        self.vectorstore._collection.upsert(
+            ids=[doc.metadata["chunk_id"] for doc in documents],
+            embeddings=[list(map(float, vector)) for vector in embeddings],
+            documents=[doc.page_content for doc in documents],
+            metadatas=[doc.metadata for doc in documents]
+        )
+
+    def persist(self):
         self.vectorstore.persist()
 
+    def add_delete_listener(self, listener):
+        """Register a callable invoked with the ids of deleted documents."""
+        self._delete_listeners.append(listener)
+
+    def delete(self, ids: List[str]):
+        """Delete documents by id."""
+        if ids:
+            self.vectorstore.delete(ids=ids)
+            self.vectorstore.persist()
+            for listener in self._delete_listeners:
+                listener(ids)
+
+    def count(self) -> int:
+        """Number of chunks in the store."""
+        return self.vectorstore._collection.count()
+
+    @staticmethod
+    def remove_stale_directories(persist_directory: str) -> List[Path]:
+        """Delete leftover `<persist_directory>_<hex>` stores created by earlier per-boot runs."""
+        current = Path(persist_directory)
+        pattern = re.compile(rf"^{re.escape(current.name)}_[0-9a-f]{{8}}$")
+        removed = []
+        for path in current.parent.iterdir():
+            if path.is_dir() and pattern.match(path.name):
+                shutil.rmtree(path, ignore_errors=True)
+                removed.append(path)
+        return removed
+
     def similarity_search(self, query: str, k: int = 4) -> List[Document]:
         """Perform a similarity search in the vector store."""
         return self.vectorstore.similarity_search(query, k=k)
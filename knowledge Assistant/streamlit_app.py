@@ -11,7 +11,14 @@ sys.path.append(str(Path(__file__).parent))
 from src.config.config import Config
 from src.document_ingestion.document_processor import DocumentProcessor
 from src.vectorstore.vectorstore import VectorStore
+from src.document_ingestion.source_manifest import SourceManifest, SourceSync
+from src.document_ingestion.pipeline import StreamingIngestionPipeline
+from src.document_ingestion.web_loader import AsyncWebLoader
+from src.document_ingestion.pdf_parser import ParallelPDFParser
 from src.graph_builder.graphbuilder import GraphBuilder
+from src.nodes.answer_cache import AnswerCache
+from src.nodes.context_packer import ContextPacker
+from src.telemetry.tracing import telemetry
 
 # Page configuration
 st.set_page_config(
@@ -41,6 +48,12 @@ def init_session_state():
     if 'history' not in st.session_state:
         st.session_state.history = []
 
+def _describe(result: dict) -> str:
+    """One-line summary of a source sync result"""
+    if result["status"] == "unchanged":
+        return f"unchanged ({result['chunks']} chunks)"
+    return f"{result['added']} chunks added, {result['deleted']} removed"
+
 @st.cache_resource
 def initialize_rag():
     """Initialize the RAG system (cached)"""
@@ -50,54 +63,96 @@ def initialize_rag():
         llm = config.get_llm()
         doc_processor = DocumentProcessor(
             chunk_size=config.CHUNK_SIZE,
-            chunk_overlap=config.CHUNK_OVERLAP
+            chunk_overlap=config.CHUNK_OVERLAP,
+            pdf_parser=ParallelPDFParser(
+                max_workers=config.PDF_PARSE_WORKERS,
+                pages_per_task=config.PDF_PAGES_PER_TASK,
+                cache_dir=config.PAGE_CACHE_DIR
+            )
+        )
+        vector_store = VectorStore(
+            persist_directory=config.PERSIST_DIRECTORY,
+            model_name=config.EMBEDDING_MODEL_NAME,
+            cache_dir=config.EMBEDDING_CACHE_DIR,
+            cache_max_entries=config.EMBEDDING_CACHE_MAX_ENTRIES,
+            backend=config.EMBEDDING_BACKEND,
+            quantize=config.EMBEDDING_QUANTIZE,
+            num_threads=config.EMBEDDING_THREADS or None
         )
-        # Use a fresh vector store with a unique name to avoid caching issues
-        import uuid
-        vector_store = VectorStore(persist_directory=f"vectorstore_data_{uuid.uuid4().hex[:8]}")
+        answer_cache = AnswerCache(
+            config.ANSWER_CACHE_PATH,
+            max_entries=config.ANSWER_CACHE_MAX_ENTRIES,
+            ttl_seconds=config.ANSWER_CACHE_TTL_SECONDS,
+            embed_fn=vector_store.embeddings.embed_query if config.ANSWER_CACHE_SEMANTIC else None,
+            similarity_threshold=config.ANSWER_CACHE_SIMILARITY
+        )
+        # Answers built on chunks that get deleted are dropped with them
+        vector_store.add_delete_listener(answer_cache.invalidate_chunks)
+        removed = VectorStore.remove_stale_directories(config.PERSIST_DIRECTORY)
+        if removed:
+            st.write(f"Removed {len(removed)} stale vector store directories")
         
-        all_documents = []
+        pipeline = StreamingIngestionPipeline(
+            doc_processor,
+            vector_store,
+            embed_batch_size=config.EMBED_BATCH_SIZE,
+            upsert_batch_size=config.UPSERT_BATCH_SIZE,
+            queue_size=config.PIPELINE_QUEUE_SIZE
+        )
+        sync = SourceSync(
+            doc_processor,
+            pipeline,
+            SourceManifest(Path(config.PERSIST_DIRECTORY) / "source_manifest.json"),
+            url_refresh_seconds=config.URL_REFRESH_HOURS * 3600,
+            web_loader=AsyncWebLoader(
+                cache_dir=config.WEB_CACHE_DIR,
+                max_connections=config.WEB_MAX_CONNECTIONS,
+                max_per_host=config.WEB_MAX_PER_HOST,
+                timeout=config.WEB_TIMEOUT_SECONDS
+            )
+        )
+        # PDFs from the data folder and the default URLs
+        data_dir = Path(config.DATA_DIR)
+        pdf_files = list(data_dir.glob("*.pdf")) if data_dir.exists() else []
+        urls = config.DEFAULT_URLS
+        st.write(f"Found {len(pdf_files)} PDF files in data folder")
         
-        # Load documents from data folder (PDFs)
-        data_dir = Path("data")
-        if data_dir.exists():
-            pdf_files = list(data_dir.glob("*.pdf"))
-            st.write(f"Found {len(pdf_files)} PDF files in data folder")
-            for pdf_file in pdf_files:
-                try:
-                    st.write(f"Loading {pdf_file.name}...")
-                    documents = doc_processor.process(str(pdf_file), "pdf")
-                    st.write(f"  - Loaded {len(documents)} chunks from {pdf_file.name}")
-                    all_documents.extend(documents)
-                except Exception as e:
-                    st.warning(f"Error loading {pdf_file}: {e}")
+        # Changed sources are streamed load -> split -> embed -> upsert
+        try:
+            for result in sync.sync(pdf_files, urls):
+                if result["status"] == "error":
+                    st.warning(f"Error loading {result['source']}: {result['error']}")
+                else:
+                    st.write(f"  - {result['source']}: {_describe(result)}")
+        finally:
+            # PDF worker processes are only needed while ingesting
+            doc_processor.pdf_parser.close()
         
-        # Load documents from URLs
-        urls = config.DEFAULT_URLS
-        for url in urls:
-            try:
-                st.write(f"Loading from {url}...")
-                documents = doc_processor.process(url, "web")
-                st.write(f"  - Loaded {len(documents)} chunks")
-                all_documents.extend(documents)
-            except Exception as e:
-                st.warning(f"Error loading {url}: {e}")
+        # Sources that failed to load keep their previously ingested chunks
+        sources = [pdf_file.as_posix() for pdf_file in pdf_files] + list(urls)
+        removed_sources = sync.prune(keep=sources)
+        if removed_sources:
+            st.write(f"Removed {len(removed_sources)} sources that no longer exist")
+        sync.save()
         
-        # Add documents to vector store
-        if all_documents:
-            st.write(f"Adding {len(all_documents)} total chunks to vector store...")
-            vector_store.add_documents(all_documents)
-            st.write("✅ Vector store created successfully!")
+        num_chunks = vector_store.count()
+        if num_chunks:
+            st.write(f"✅ Vector store ready with {num_chunks} chunks")
         else:
             st.warning("No documents were loaded!")
         
         # Build graph
         graph_builder = GraphBuilder(
             retriever=vector_store.get_retriever(),
-            llm=llm
+            llm=llm,
+            answer_cache=answer_cache,
+            packer=ContextPacker(
+                max_tokens=config.CONTEXT_MAX_TOKENS,
+                duplicate_threshold=config.CONTEXT_DUPLICATE_THRESHOLD
+            )
         )
         
-        return graph_builder, len(all_documents)
+        return graph_builder, num_chunks
     except Exception as e:
         st.error(f"Failed to initialize: {str(e)}")
         import traceback
@@ -105,9 +160,18 @@ def initialize_rag():
         return None, 0
         return None, 0
 
+@st.cache_resource
+def start_telemetry():
+    """Enable tracing and serve /metrics once per process"""
+    telemetry.configure(Config.TELEMETRY_ENABLED, Config.TELEMETRY_TRACE_PATH)
+    if Config.TELEMETRY_ENABLED and Config.METRICS_PORT:
+        telemetry.serve(Config.METRICS_PORT)
+    return telemetry
+
 def main():
     """Main application"""
     init_session_state()
+    start_telemetry()
     
     # Title
     st.title("🔍 RAG Document Search")
@@ -170,26 +234,32 @@ def main():
             with st.spinner("Searching..."):
                 start_time = time.time()
                 
-                # Get answer
-                result = st.session_state.rag_system.run(question)
+                with telemetry.span("query"):
+                    # Retrieve, then stream the answer as it is generated
+                    retrieved_docs, tokens = st.session_state.rag_system.stream(question)
                 
-                elapsed_time = time.time() - start_time
+                    st.markdown("### 💡 Answer")
+                    answer_box = st.empty()
+                    answer = ""
+                    first_token_time = None
+                    for token in tokens:
+                        if first_token_time is None:
+                            first_token_time = time.time() - start_time
+                        answer += token
+                        answer_box.success(answer)
                 
-                # Extract answer and docs from result
-                answer = result.get('answer', '')
-                retrieved_docs = result.get('retrieved_documents', [])
+                elapsed_time = time.time() - start_time
+                if first_token_time is None:
+                    first_token_time = elapsed_time
                 
                 # Add to history
                 st.session_state.history.append({
                     'question': question,
                     'answer': answer,
+                    'first_token_time': first_token_time,
                     'time': elapsed_time
                 })
                 
-                # Display answer
-                st.markdown("### 💡 Answer")
-                st.success(answer)
-                
                 # Show retrieved docs in expander
                 with st.expander("📄 Source Documents"):
                     for i, doc in enumerate(retrieved_docs, 1):
@@ -200,7 +270,10 @@ def main():
                             disabled=True
                         )
                 
-                st.caption(f"⏱️ Response time: {elapsed_time:.2f} seconds")
+                st.caption(
+                    f"⏱️ First token: {first_token_time:.2f} seconds · "
+                    f"Total: {elapsed_time:.2f} seconds"
+                )
     
     # Show history
     if st.session_state.history:
@@ -211,7 +284,7 @@ def main():
             with st.container():
                 st.markdown(f"**Q:** {item['question']}")
                 st.markdown(f"**A:** {item['answer'][:200]}...")
-                st.caption(f"Time: {item['time']:.2f}s")
+                st.caption(f"First token: {item['first_token_time']:.2f}s · Total: {item['time']:.2f}s")
                 st.markdown("")
 
 if __name__ == "__main__":